@@ -0,0 +1,61 @@
+"""
+    Benchmark of EzPDF.add_rows against a loop of add_five_cell_row calls
+
+    Run from the repository root:
+        python -m benchmarks.bench_add_rows [rows]
+"""
+import sys
+import time
+import warnings
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+def make_rows(count: int):
+    """Yields five column rows of short repeating text."""
+    for i in range(count):
+        yield (f"Row {i}", "Active", "2023-01-01", "Finance", f"{i * 1.5:.2f}")
+
+
+def bench_add_five_cell_row() -> float:
+    """Renders ROWS rows with add_five_cell_row and returns elapsed seconds."""
+    pdf = EzPDF()
+    pdf.add_page()
+    start = time.perf_counter()
+    for row in make_rows(ROWS):
+        pdf.add_five_cell_row(
+            cell1_text=row[0],
+            cell2_text=row[1],
+            cell3_text=row[2],
+            cell4_text=row[3],
+            cell5_text=row[4],
+            cell1_align="L",
+            cell5_align="R",
+            cell_height=0.25
+        )
+    return time.perf_counter() - start
+
+
+def bench_add_rows() -> float:
+    """Renders ROWS rows with add_rows and returns elapsed seconds."""
+    pdf = EzPDF()
+    pdf.add_page()
+    start = time.perf_counter()
+    column_spec = ColumnSpec(
+        widths=(0.2, 0.2, 0.2, 0.2, 0.2),
+        aligns=("L", "C", "C", "C", "R")
+    )
+    pdf.add_rows(make_rows(ROWS), column_spec, cell_height=0.25)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    print(f"Rendering {ROWS} five cell rows")
+    for name, bench in (
+        ("add_five_cell_row loop", bench_add_five_cell_row),
+        ("add_rows", bench_add_rows),
+    ):
+        elapsed = bench()
+        print(f"{name:<24} {elapsed:8.3f}s {ROWS / elapsed:12.0f} rows/sec")
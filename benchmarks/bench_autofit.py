@@ -0,0 +1,59 @@
+"""
+    Cost of fitting column widths to table texts, and of streaming a table
+    with a fitted layout against a hand-tuned one
+
+    Run from the repository root:
+        python -m benchmarks.bench_autofit [rows]
+"""
+import sys
+import time
+import warnings
+from ez_pdf.ez_pdf import AutoColumns, ColumnSpec, EzPDF
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+HEADER = ("Client", "Status", "Description", "Amount")
+ALIGNS = ("L", "C", "L", "R")
+FIXED = ColumnSpec(widths=(0.2, 0.1, 0.55, 0.15), aligns=ALIGNS)
+
+
+def cursor(count: int):
+    """Yields rows the way a database cursor would."""
+    for i in range(count):
+        yield (
+            f"Client {i:07d}",
+            ("Open", "Paid", "Late")[i % 3],
+            f"Service plan {i % 40} renewal",
+            f"{i * 1.25:.2f}",
+        )
+
+
+def timed(function) -> float:
+    """Wall time of one call, in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def fit(sample) -> float:
+    """Time to fit a layout to the first rows, or to every row."""
+    pdf = EzPDF()
+    pdf.add_page()
+    auto = AutoColumns(max_widths=0.6, sample=sample, aligns=ALIGNS)
+    rows = list(cursor(ROWS if sample is None else sample))
+    return timed(lambda: pdf.fit_columns(rows, auto, header=HEADER))
+
+
+def stream(columns) -> float:
+    """Time to stream the table with a layout."""
+    pdf = EzPDF()
+    pdf.add_page()
+    return timed(lambda: pdf.stream_table(cursor(ROWS), columns, cell_height=0.25, header=HEADER))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    print(f"fit to first 1000 rows     {fit(1000) * 1000:9.1f} ms")
+    print(f"fit to all {ROWS:>7} rows     {fit(None) * 1000:9.1f} ms")
+    print(f"stream, hand-tuned widths  {stream(FIXED) * 1000:9.1f} ms")
+    fitted = AutoColumns(max_widths=0.6, aligns=ALIGNS)
+    print(f"stream, fitted widths      {stream(fitted) * 1000:9.1f} ms")
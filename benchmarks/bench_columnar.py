@@ -0,0 +1,100 @@
+"""
+    Memory of a large report held as a ColumnarTable against rows of dicts
+
+    Run from the repository root:
+        python -m benchmarks.bench_columnar [rows] [render rows]
+
+    Memory is what tracemalloc sees allocated by the loaded table, after the
+    source rows are gone. The render columns time the first render rows of
+    each model through the same table layout.
+"""
+import gc
+import sys
+import time
+import tracemalloc
+import warnings
+from ez_pdf.columnar import ColumnarTable
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+RENDER_ROWS = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+NAMES = ("Client", "Date", "Category", "Status", "Amount")
+COLUMNS = ColumnSpec(widths=(0.3, 0.2, 0.2, 0.15, 0.15), aligns=("L", "C", "C", "C", "R"))
+
+
+def cursor(count: int):
+    """Yields rows the way a database cursor would: unique ids, dates of a
+    year, a few categories and statuses, and amounts."""
+    for i in range(count):
+        yield (
+            f"Client {i:07d}",
+            f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            f"Category {i % 20}",
+            ("Open", "Paid", "Late")[i % 3],
+            i * 1.25,
+        )
+
+
+def dict_rows(count: int) -> list:
+    """Rows as keyword dictionaries with preformatted texts."""
+    return [
+        dict(zip(NAMES, (client, date, category, status, f"{amount:.2f}")))
+        for client, date, category, status, amount in cursor(count)
+    ]
+
+
+def columnar(count: int) -> ColumnarTable:
+    """Rows loaded into a ColumnarTable."""
+    table = ColumnarTable(COLUMNS, names=NAMES, formats=(None, None, None, None, "%.2f"))
+    table.extend(cursor(count))
+    return table
+
+
+def loaded(build, count: int):
+    """Builds a model, returning it with its traced size and build time."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    model = build(count)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return model, size, elapsed
+
+
+def render_dicts(rows: list) -> float:
+    """Renders the first rows of a list of dicts, in seconds."""
+    pdf = EzPDF()
+    pdf.add_page()
+    start = time.perf_counter()
+    pdf.add_table(
+        (tuple(row.values()) for row in rows[:RENDER_ROWS]), COLUMNS,
+        cell_height=0.25, header=NAMES
+    )
+    return time.perf_counter() - start
+
+
+def render_columnar(table: ColumnarTable) -> float:
+    """Renders a ColumnarTable of the first rows, in seconds."""
+    head = columnar(min(RENDER_ROWS, len(table)))
+    pdf = EzPDF()
+    pdf.add_page()
+    start = time.perf_counter()
+    pdf.add_columnar_table(head, cell_height=0.25)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    print(f"{'model':<15}{'rows':>9}{'MiB':>9}{'bytes/row':>11}{'load s':>8}"
+          f"{'render s':>10}")
+    for name, build, render in (
+        ("list of dicts", dict_rows, render_dicts),
+        ("columnar", columnar, render_columnar),
+    ):
+        model, size, elapsed = loaded(build, ROWS)
+        print(
+            f"{name:<15}{ROWS:>9}{size / 2**20:>9.1f}{size / ROWS:>11.0f}{elapsed:>8.2f}"
+            f"{render(model):>10.2f}"
+        )
+        del model
@@ -0,0 +1,50 @@
+"""
+    Output size against export time for the compression settings of EzPDF
+
+    Run from the repository root:
+        python -m benchmarks.bench_compression [pages] [repeats]
+"""
+import sys
+import time
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+COLUMNS = ColumnSpec(widths=(0.3, 0.2, 0.2, 0.3), aligns=("L", "C", "C", "R"))
+SETTINGS = (
+    ("uncompressed", dict(compress=False)),
+    ("level 1", dict(level=1)),
+    ("default level", dict()),
+    ("level 9", dict(level=9)),
+    ("level 1 + objstm", dict(level=1, object_streams=True)),
+    ("level 9 + objstm", dict(level=9, object_streams=True)),
+)
+
+
+def build() -> EzPDF:
+    """Builds a table document of PAGES legal pages."""
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_table(
+        (
+            (f"Client {i:06d}", "Active", "2023-01-01", f"{i * 1.5:.2f}")
+            for i in range(PAGES * 49)
+        ),
+        COLUMNS,
+        cell_height=0.25,
+        header=("Client", "Status", "Opened", "Balance")
+    )
+    return pdf
+
+
+if __name__ == "__main__":
+    print(f"Exporting a {PAGES} page table, best of {REPEATS}")
+    for name, settings in SETTINGS:
+        best = float("inf")
+        for _ in range(REPEATS):
+            pdf = build()
+            pdf.set_compression(**settings)
+            start = time.perf_counter()
+            size = len(pdf.export_bytes())
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<18} {size:>10} bytes  {best * 1000:8.1f} ms")
@@ -0,0 +1,83 @@
+"""
+    Cost of equal height rows against per-cell rows corrected in user code
+
+    Run from the repository root:
+        python -m benchmarks.bench_equal_height [rows]
+
+    The user-side correction is what a caller has to do without add_table:
+    dry-run every cell through multi_cell to count its lines, then render
+    each cell again stretched to the tallest one.
+"""
+import sys
+import time
+from fpdf.enums import MethodReturnValue, XPos, YPos
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+WIDTHS = (0.2, 0.2, 0.2, 0.2, 0.2)
+CELL_HEIGHT = 0.2
+NOTES = ("", "Follow up", "Client requested a callback about the renewal paperwork")
+
+
+def make_rows(count: int):
+    """Yields rows where some cells wrap to several lines."""
+    for i in range(count):
+        yield (f"Row {i}", "Active", NOTES[i % 3], "Finance", f"{i * 1.5:.2f}")
+
+
+def ragged() -> float:
+    """Current per-cell rows, ragged when a cell wraps."""
+    pdf = EzPDF()
+    pdf.add_page()
+    start = time.perf_counter()
+    for row in make_rows(ROWS):
+        pdf.add_five_cell_row(*row, cell_height=CELL_HEIGHT)
+    return time.perf_counter() - start
+
+
+def user_corrected() -> float:
+    """Per-cell rows measured with a dry run and rendered again at equal height."""
+    pdf = EzPDF()
+    pdf.add_page()
+    fpdf = pdf.pdf
+    widths = [(8.5 - 1) * width for width in WIDTHS]
+    start = time.perf_counter()
+    for row in make_rows(ROWS):
+        lines = [
+            len(fpdf.multi_cell(w=width, h=CELL_HEIGHT, txt=text, dry_run=True,
+                output=MethodReturnValue.LINES))
+            for text, width in zip(row, widths)
+        ]
+        row_height = max(lines) * CELL_HEIGHT
+        if fpdf.will_page_break(row_height):
+            fpdf.add_page(same=True)
+        y_position = fpdf.y
+        x_position = fpdf.l_margin
+        for text, width in zip(row, widths):
+            fpdf.set_xy(x_position, y_position)
+            fpdf.multi_cell(w=width, h=row_height, txt=text, border=1, align="C",
+                max_line_height=CELL_HEIGHT, new_x=XPos.RIGHT, new_y=YPos.NEXT)
+            x_position += width
+        fpdf.set_xy(fpdf.l_margin, y_position + row_height)
+    return time.perf_counter() - start
+
+
+def equal_height() -> float:
+    """add_table measuring each row once and stretching its cells."""
+    pdf = EzPDF()
+    pdf.add_page()
+    start = time.perf_counter()
+    pdf.add_table(make_rows(ROWS), ColumnSpec(WIDTHS), cell_height=CELL_HEIGHT,
+        equal_height=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"Rendering {ROWS} five cell rows")
+    for name, bench in (
+        ("add_five_cell_row (ragged)", ragged),
+        ("dry run + re-render", user_corrected),
+        ("add_table(equal_height)", equal_height),
+    ):
+        elapsed = bench()
+        print(f"{name:<28} {elapsed:7.3f}s {ROWS / elapsed:9.0f} rows/sec")
@@ -0,0 +1,67 @@
+"""
+    Latency of in-memory export against a disk round-trip
+
+    Run from the repository root:
+        python -m benchmarks.bench_export [pages] [repeats]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+COLUMNS = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+
+
+def build() -> EzPDF:
+    """Builds a table document of roughly PAGES legal pages."""
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_rows(
+        ((f"Client {i}", "Active", f"{i * 1.5:.2f}") for i in range(PAGES * 52)),
+        COLUMNS,
+        cell_height=0.25
+    )
+    return pdf
+
+
+def disk_round_trip(pdf: EzPDF, directory: str) -> int:
+    """Exports to a file and reads it back, as a web handler would."""
+    filename = os.path.join(directory, "report.pdf")
+    pdf.export(filename)
+    with open(filename, "rb") as file:
+        data = file.read()
+    os.remove(filename)
+    return len(data)
+
+
+def in_memory_bytes(pdf: EzPDF, _directory: str) -> int:
+    """Exports to a memoryview."""
+    return len(pdf.export_bytes())
+
+
+def in_memory_stream(pdf: EzPDF, _directory: str) -> int:
+    """Exports into a caller supplied stream."""
+    stream = io.BytesIO()
+    pdf.export_to(stream)
+    return stream.tell()
+
+
+if __name__ == "__main__":
+    print(f"Exporting {PAGES} page documents, best of {REPEATS}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, export in (
+            ("export + read back", disk_round_trip),
+            ("export_bytes", in_memory_bytes),
+            ("export_to(BytesIO)", in_memory_stream),
+        ):
+            best = float("inf")
+            for _ in range(REPEATS):
+                pdf = build()
+                start = time.perf_counter()
+                size = export(pdf, directory)
+                best = min(best, time.perf_counter() - start)
+            print(f"{name:<20} {best * 1000:8.2f} ms  {size} bytes")
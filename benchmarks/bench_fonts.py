@@ -0,0 +1,52 @@
+"""
+    Startup and per-document cost of a TrueType font, parsed per document by
+    FPDF.add_font against parsed once by the process-wide font registry
+
+    Run from the repository root with any .ttf file:
+        python -m benchmarks.bench_fonts path/to/font.ttf [documents]
+"""
+import sys
+import time
+import warnings
+from ez_pdf.ez_pdf import EzPDF
+from ez_pdf.fonts import FONT_REGISTRY, register_font
+
+NAMES = ("Zoë Müller", "Ñandú Peña", "Chloé Dubois", "Søren Ødegård", "Łukasz Żak")
+
+
+def build(font_file: str, index: int, registry: bool) -> None:
+    """Renders and exports a one page document in the TrueType font."""
+    pdf = EzPDF()
+    if registry:
+        pdf.add_font("bench", font_file)
+    else:
+        pdf.pdf.add_font("bench", "", font_file)
+    pdf.set_font("bench", 10)
+    pdf.add_page()
+    for row in range(20):
+        pdf.add_two_cell_row(
+            cell1_text=NAMES[(index + row) % len(NAMES)],
+            cell2_text=f"Client {index:06d}",
+            cell1_align="L"
+        )
+    pdf.export_bytes()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    warnings.simplefilter("ignore", DeprecationWarning)
+    FONT_FILE = sys.argv[1]
+    DOCUMENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    start = time.perf_counter()
+    register_font("bench", FONT_FILE)
+    print(f"registry startup (parse once)  {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    for name, registry in (("FPDF.add_font per document", False), ("font registry", True)):
+        start = time.perf_counter()
+        for index in range(DOCUMENTS):
+            build(FONT_FILE, index, registry)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<30} {elapsed / DOCUMENTS * 1000:8.2f} ms/document")
+    print(f"subset cache hits {FONT_REGISTRY.hits}, misses {FONT_REGISTRY.misses}")
@@ -0,0 +1,52 @@
+"""
+    Benchmark of a letterhead recorded once as a form against re-rendering it per page
+
+    Run from the repository root:
+        python -m benchmarks.bench_forms [pages]
+"""
+import sys
+import time
+from ez_pdf.ez_pdf import EzPDF
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+
+def letterhead(pdf: EzPDF) -> None:
+    """Adds the letterhead rows."""
+    pdf.add_one_cell_row("Center for Human Services", fill=True, r=195, g=223, b=236)
+    pdf.add_three_cell_row("123 Main Street", "Springfield", "(555) 010-0100", border=0)
+    pdf.add_three_cell_row("Case Number", "Caseworker", "Date", cell_height=0.25)
+    pdf.add_one_cell_row("Confidential - for the named client only", align="L", border=0)
+
+
+def rerendered() -> EzPDF:
+    """Renders the letterhead rows again on every page."""
+    pdf = EzPDF()
+    for page in range(PAGES):
+        pdf.add_page()
+        letterhead(pdf)
+        pdf.add_one_cell_row(f"Page {page + 1}")
+    return pdf
+
+
+def recorded() -> EzPDF:
+    """Records the letterhead once and stamps it on every page."""
+    pdf = EzPDF()
+    pdf.add_page()
+    with pdf.record_form("letterhead"):
+        letterhead(pdf)
+    pdf.repeat_form("letterhead")
+    pdf.add_one_cell_row("Page 1")
+    for page in range(1, PAGES):
+        pdf.add_page()
+        pdf.add_one_cell_row(f"Page {page + 1}")
+    return pdf
+
+
+if __name__ == "__main__":
+    print(f"Rendering {PAGES} pages with a letterhead")
+    for name, render in (("re-rendered", rerendered), ("recorded form", recorded)):
+        start = time.perf_counter()
+        size = len(render().export_bytes())
+        elapsed = time.perf_counter() - start
+        print(f"{name:<14} {elapsed:7.3f}s  {size:>9} bytes")
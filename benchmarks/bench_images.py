@@ -0,0 +1,82 @@
+"""
+    Throughput of a document batch with a logo on every page, drawing it
+    through FPDF.image against EzPDF.add_logo and the process-wide image cache
+
+    Run from the repository root:
+        python -m benchmarks.bench_images [documents] [workers]
+
+    FPDF.image decodes and compresses the PNG again in every document;
+    add_logo decodes it once per process. The cache is warmed before the
+    batch starts, so forked workers inherit it.
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+from PIL import Image, ImageDraw
+from ez_pdf.batch import RenderJob, render_many
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+from ez_pdf.images import IMAGE_CACHE
+
+DOCUMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+PAGES = 2
+COLUMNS = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+LOGO = os.path.join(tempfile.gettempdir(), "ez_pdf_bench_logo.png")
+
+
+def make_logo() -> None:
+    """Writes a 600x200 RGBA gradient PNG, decoded with its alpha soft mask."""
+    image = Image.new("RGBA", (600, 200))
+    draw = ImageDraw.Draw(image)
+    for x in range(600):
+        draw.line([(x, 0), (x, 199)], fill=(x % 256, 90, 255 - x % 256, 160 + x % 96))
+    image.save(LOGO)
+
+
+def statement(pdf: EzPDF, client_id: int, draw_logo) -> EzPDF:
+    """Fills a statement of PAGES pages with a logo at the top of each."""
+    for page in range(PAGES):
+        pdf.add_page()
+        draw_logo(pdf)
+        pdf.add_one_cell_row(f"Statement for client {client_id}, page {page + 1}")
+        pdf.add_rows(
+            ((f"Service {i}", "2023-01-01", f"{i * 12.5:.2f}") for i in range(20)),
+            COLUMNS,
+            cell_height=0.25
+        )
+    return pdf
+
+
+def fpdf_image(client_id: int) -> EzPDF:
+    """Logo drawn through the FPDF object, decoded in every document."""
+    def draw_logo(pdf: EzPDF) -> None:
+        pdf.pdf.image(LOGO, x=0.5, y=pdf.pdf.y, w=1.5)
+        pdf.pdf.set_y(pdf.pdf.y + 0.5)
+    return statement(EzPDF(), client_id, draw_logo)
+
+
+def cached_logo(client_id: int) -> EzPDF:
+    """Logo drawn with add_logo, decoded once per process."""
+    return statement(EzPDF(), client_id, lambda pdf: pdf.add_logo(LOGO, width=1.5))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    make_logo()
+    IMAGE_CACHE.install(EzPDF().pdf, LOGO)
+    print(f"Rendering {DOCUMENTS} documents of {PAGES} pages with {WORKERS} worker(s)")
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = [RenderJob(os.path.join(directory, f"{i}.pdf"), i) for i in range(DOCUMENTS)]
+        for name, builder in (("FPDF.image", fpdf_image), ("add_logo", cached_logo)):
+            start = time.perf_counter()
+            results = render_many(jobs, builder, workers=WORKERS, chunksize=16)
+            elapsed = time.perf_counter() - start
+            errors = sum(1 for result in results if result.error)
+            size = os.path.getsize(jobs[0].output)
+            print(
+                f"{name:<11} {elapsed:7.2f}s  {DOCUMENTS / elapsed:7.1f} docs/sec"
+                f"  {size / 1024:5.1f} KiB/doc  errors={errors}"
+            )
+    print(IMAGE_CACHE.cache_info())
@@ -0,0 +1,68 @@
+"""
+    Import time of ez_pdf against its budget, measured with python -X importtime
+
+    FPDF (with fontTools and Pillow) dominates and is needed by every render,
+    so the budget is on what ez_pdf adds on top of it. Exits with status 1
+    when a budget is exceeded.
+
+    Run from the repository root:
+        python -m benchmarks.bench_import [runs]
+"""
+import subprocess
+import sys
+from typing import Dict, Set
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+# Budgets in milliseconds
+BUDGETS: Dict[str, float] = {
+    "import ez_pdf": 5.0,
+    "from ez_pdf.ez_pdf import EzPDF": 15.0,
+}
+BASELINE = "import fpdf"
+
+
+def top_level_imports(statement: str) -> Dict[str, int]:
+    """Cumulative microseconds of each top level import made by statement."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imports: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name[1:].startswith(" "):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def import_ms(statement: str, startup: Set[str]) -> float:
+    """Best of RUNS import times of statement in milliseconds, interpreter startup excluded."""
+    return min(
+        sum(
+            cumulative for name, cumulative in top_level_imports(statement).items()
+            if name not in startup
+        )
+        for _ in range(RUNS)
+    ) / 1000
+
+
+if __name__ == "__main__":
+    STARTUP = set(top_level_imports("pass"))
+    fpdf_ms = import_ms(BASELINE, STARTUP)
+    print(f"{BASELINE:<36} {fpdf_ms:8.1f} ms")
+    failed = False
+    for statement, budget in BUDGETS.items():
+        total_ms = import_ms(statement, STARTUP)
+        # Both statements import FPDF only when ez_pdf.ez_pdf is loaded
+        added_ms = total_ms - fpdf_ms if "ez_pdf.ez_pdf" in statement else total_ms
+        verdict = "ok" if added_ms <= budget else "OVER BUDGET"
+        failed |= added_ms > budget
+        print(
+            f"{statement:<36} {total_ms:8.1f} ms, {added_ms:6.1f} ms own"
+            f" (budget {budget:.0f} ms) {verdict}"
+        )
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+"""
+    Merge of many exported one page statements into one mailing file,
+    and split of the mailing file back into per-client files
+
+    Run from the repository root:
+        python -m benchmarks.bench_merge [documents]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+from ez_pdf.merge import PDFMerger, PDFReader, split_pdf
+
+DOCUMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+COLUMNS = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+
+
+def build_statement(client_id: int) -> EzPDF:
+    """Builds a one page statement for a client."""
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_one_cell_row(f"Statement for client {client_id}")
+    pdf.add_rows(
+        ((f"Service {i}", "2023-01-01", f"{i * 12.5:.2f}") for i in range(20)),
+        COLUMNS,
+        cell_height=0.25
+    )
+    return pdf
+
+
+def max_rss_mib() -> float:
+    """Peak resident memory of the process so far."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        template = build_statement(0).export_bytes()
+        paths = []
+        for client in range(DOCUMENTS):
+            path = os.path.join(directory, f"{client:06d}.pdf")
+            # Rendering every statement would dominate the run; copies of one
+            # render share their content streams once merged
+            with open(path, "wb") as file:
+                file.write(template if client % 100 else build_statement(client).export_bytes())
+            paths.append(path)
+        inputs = sum(os.path.getsize(path) for path in paths)
+        print(f"{DOCUMENTS} statements, {inputs / 1024 / 1024:.1f} MiB, peak RSS {max_rss_mib():.0f} MiB")
+
+        mailing = os.path.join(directory, "mailing.pdf")
+        start = time.perf_counter()
+        with PDFMerger(mailing) as merger:
+            for path in paths:
+                merger.append(path)
+        elapsed = time.perf_counter() - start
+        print(
+            f"merge  {elapsed:6.2f} s, {DOCUMENTS / elapsed:7.0f} documents/s, "
+            f"{os.path.getsize(mailing) / 1024 / 1024:.1f} MiB, "
+            f"{merger.objects} objects written, {merger.deduplicated} deduplicated, "
+            f"peak RSS {max_rss_mib():.0f} MiB"
+        )
+
+        start = time.perf_counter()
+        with PDFReader(mailing) as reader:
+            pages = len(reader)
+        split_pdf(
+            mailing,
+            {
+                os.path.join(directory, f"split-{page:06d}.pdf"): [page]
+                for page in range(1, pages + 1)
+            }
+        )
+        elapsed = time.perf_counter() - start
+        print(f"split  {elapsed:6.2f} s, {pages / elapsed:7.0f} files/s")
@@ -0,0 +1,86 @@
+"""
+    Cost of recording a statement into an operation log, of its serialized
+    size and of replaying it, against rendering it directly
+
+    A saved log replays the same document on every run, so it doubles as a
+    fixed input for regression timings:
+        python -m benchmarks.bench_oplog [rows] [--save statement.oplog]
+        python -m benchmarks.bench_oplog --replay statement.oplog
+"""
+import argparse
+import time
+import warnings
+from datetime import datetime, timezone
+from ez_pdf.ez_pdf import EzPDF
+from ez_pdf.oplog import OpLog
+
+CREATION_DATE = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def build_statement(pdf, rows: int) -> None:
+    """Fills a statement of rows three cell rows."""
+    pdf.add_page()
+    pdf.set_cell_fill_color(230, 230, 230)
+    pdf.add_one_cell_row("Statement for client 000042", cell_height=0.5)
+    for i in range(rows):
+        pdf.add_three_cell_row(
+            cell1_text=f"Service {i:06d}",
+            cell2_text="2023-01-01",
+            cell3_text=f"{i * 12.5:.2f}",
+            cell1_align="L",
+            cell3_align="R",
+            cell3_fill=bool(i % 2),
+            cell_height=0.25
+        )
+
+
+def best_of(function, repeats: int = 3) -> float:
+    """Best wall time of repeated calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("rows", type=int, nargs="?", default=2000)
+    parser.add_argument("--save", help="write the recorded log to a file")
+    parser.add_argument("--replay", help="time the replay of a saved log instead")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    if args.replay:
+        with open(args.replay, "rb") as file:
+            data = file.read()
+        log = OpLog.from_bytes(data)
+        print(f"{len(log)} operations, {len(data) / 1024:.1f} KiB")
+        print(f"replay and export     {best_of(log.replay) * 1000:8.1f} ms")
+        raise SystemExit
+
+    def direct() -> None:
+        pdf = EzPDF()
+        build_statement(pdf, args.rows)
+        pdf.export_bytes()
+
+    def record() -> OpLog:
+        log = OpLog(creation_date=CREATION_DATE)
+        build_statement(log, args.rows)
+        return log
+
+    log = record()
+    compressed = log.to_bytes()
+    print(f"{len(log)} operations, {len(log.to_bytes(compress=False)) / 1024:.1f} KiB JSON, "
+          f"{len(compressed) / 1024:.1f} KiB deflated")
+    print(f"render directly       {best_of(direct) * 1000:8.1f} ms")
+    print(f"record                {best_of(record) * 1000:8.1f} ms")
+    print(f"serialize             {best_of(log.to_bytes) * 1000:8.1f} ms")
+    print(f"deserialize           {best_of(lambda: OpLog.from_bytes(compressed)) * 1000:8.1f} ms")
+    print(f"replay and export     {best_of(log.replay) * 1000:8.1f} ms")
+    identical = OpLog.from_bytes(compressed).replay() == log.replay()
+    print(f"replays identical     {identical}")
+    if args.save:
+        with open(args.save, "wb") as file:
+            file.write(compressed)
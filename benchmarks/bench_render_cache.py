@@ -0,0 +1,53 @@
+"""
+    Nightly rebuild of statements with the render cache, where only a share
+    of the clients' records changed since the previous night
+
+    Run from the repository root:
+        python -m benchmarks.bench_render_cache [documents] [changed share]
+"""
+import sys
+import tempfile
+import time
+from ez_pdf.cache import CachedEzPDF, RenderCache
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+DOCUMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+CHANGED = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+COLUMNS = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+
+
+def build_statement(pdf, client_id: int, night: int) -> None:
+    """Fills a statement, whose last row changes on some nights."""
+    pdf.add_page()
+    pdf.add_one_cell_row(f"Statement for client {client_id}")
+    rows = [(f"Service {i}", "2023-01-01", f"{i * 12.5:.2f}") for i in range(120)]
+    changed = (client_id * 7919 + night) % 1000 < CHANGED * 1000
+    rows.append(("Balance", f"night {night}" if changed else "", f"{client_id:.2f}"))
+    pdf.add_rows(rows, COLUMNS, cell_height=0.25)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        for client in range(DOCUMENTS):
+            pdf = EzPDF()
+            build_statement(pdf, client, 0)
+            pdf.export_bytes()
+        uncached = time.perf_counter() - start
+        print(f"without cache       {uncached / DOCUMENTS * 1000:8.2f} ms/document")
+
+        cache = RenderCache(directory)
+        for night in range(3):
+            start = time.perf_counter()
+            for client in range(DOCUMENTS):
+                pdf = CachedEzPDF(cache=cache)
+                build_statement(pdf, client, night)
+                pdf.export_bytes()
+            elapsed = time.perf_counter() - start
+            print(
+                f"night {night} with cache {elapsed / DOCUMENTS * 1000:8.2f} ms/document, "
+                f"hit rate {cache.hit_rate:.0%}"
+            )
+            cache.hits = cache.misses = 0
+        info = cache.info()
+        print(f"{info.entries} entries, {info.size / 1024:.0f} KiB on disk")
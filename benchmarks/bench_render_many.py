@@ -0,0 +1,47 @@
+"""
+    Scaling benchmark of ez_pdf.render_many across worker counts
+
+    Run from the repository root:
+        python -m benchmarks.bench_render_many [documents]
+"""
+import os
+import sys
+import tempfile
+import time
+from ez_pdf import ColumnSpec, EzPDF, RenderJob, render_many
+
+DOCUMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+WORKERS = (1, 2, 4, 8)
+
+
+def build_statement(client_id: int) -> EzPDF:
+    """Builds a one page statement for a client."""
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_one_cell_row(f"Statement for client {client_id}")
+    columns = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+    pdf.add_rows(
+        ((f"Service {i}", "2023-01-01", f"{i * 12.5:.2f}") for i in range(60)),
+        columns,
+        cell_height=0.25
+    )
+    return pdf
+
+
+if __name__ == "__main__":
+    print(f"Rendering {DOCUMENTS} documents on {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = [
+            RenderJob(os.path.join(directory, f"{i}.pdf"), i) for i in range(DOCUMENTS)
+        ]
+        baseline = None
+        for workers in WORKERS:
+            start = time.perf_counter()
+            results = render_many(jobs, build_statement, workers=workers, chunksize=4)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            errors = sum(1 for result in results if result.error)
+            print(
+                f"workers={workers}  {elapsed:7.2f}s  {DOCUMENTS / elapsed:7.1f} docs/sec"
+                f"  speedup={baseline / elapsed:4.2f}x  errors={errors}"
+            )
@@ -0,0 +1,57 @@
+"""
+    Peak memory of long documents kept in memory against pages spilled to disk
+
+    Run from the repository root:
+        python -m benchmarks.bench_spill [pages ...]
+
+    tracemalloc slows rendering down roughly tenfold, keep page counts modest.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+PAGES = [int(arg) for arg in sys.argv[1:]] or [50, 100, 200]
+COLUMNS = ColumnSpec(widths=(0.3, 0.2, 0.2, 0.3), aligns=("L", "C", "C", "R"))
+
+
+def bench(pages: int, spill: bool) -> tuple:
+    """Renders and exports a table of pages legal pages to a file.
+
+    Returns:
+        tuple: Elapsed seconds, peak traced bytes and file size.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "bench.pdf")
+        tracemalloc.start()
+        start = time.perf_counter()
+        pdf = EzPDF()
+        if spill:
+            pdf.spill_pages(directory)
+        pdf.add_page()
+        pdf.add_table(
+            (
+                (f"Client {i:06d}", "Active", "2023-01-01", f"{i * 1.5:.2f}")
+                for i in range(pages * 49)
+            ),
+            COLUMNS,
+            cell_height=0.25,
+            header=("Client", "Status", "Opened", "Balance")
+        )
+        pdf.export(filename)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak, os.path.getsize(filename)
+
+
+if __name__ == "__main__":
+    for pages in PAGES:
+        for spill in (False, True):
+            elapsed, peak, size = bench(pages, spill)
+            print(
+                f"{pages:>6} pages {'spilled' if spill else 'in memory':<10}"
+                f" {peak / 2**20:8.1f} MiB peak {elapsed:8.2f}s {size:>11} bytes"
+            )
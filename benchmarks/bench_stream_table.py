@@ -0,0 +1,63 @@
+"""
+    Memory benchmark of EzPDF.stream_table against materializing rows first
+
+    Run from the repository root:
+        python -m benchmarks.bench_stream_table [rows ...]
+
+    Peak is the tracemalloc peak while rendering. The document buffer (the
+    page content streams fpdf keeps until export) necessarily grows with the
+    row count, so overhead (peak minus document buffer) is what stays flat.
+"""
+import sys
+import time
+import tracemalloc
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+SIZES = [int(size) for size in sys.argv[1:]] or [5000, 10000, 20000]
+COLUMNS = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+
+
+def cursor(count: int):
+    """Yields rows the way a database cursor would."""
+    for i in range(count):
+        yield (f"Client {i:07d}", "Active", f"{i * 1.5:.2f}")
+
+
+def document_bytes(pdf: EzPDF) -> int:
+    """Returns the size of the page content held by the document."""
+    return sum(len(page.contents) for page in pdf.pdf.pages.values())
+
+
+def materialized(count: int) -> EzPDF:
+    """Loads every row into a list before rendering."""
+    pdf = EzPDF()
+    pdf.add_page()
+    rows = list(cursor(count))
+    pdf.add_rows(rows, COLUMNS, cell_height=0.25)
+    return pdf
+
+
+def streamed(count: int) -> EzPDF:
+    """Renders rows as they are pulled from the cursor."""
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.stream_table(cursor(count), COLUMNS, cell_height=0.25)
+    return pdf
+
+
+if __name__ == "__main__":
+    print(f"{'mode':<13}{'rows':>9}{'seconds':>9}{'peak MiB':>10}{'doc MiB':>9}{'overhead MiB':>14}")
+    for size in SIZES:
+        for name, render in (("materialized", materialized), ("streamed", streamed)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            pdf = render(size)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            document = document_bytes(pdf)
+            print(
+                f"{name:<13}{size:>9}{elapsed:>9.1f}{peak / 2**20:>10.1f}"
+                f"{document / 2**20:>9.1f}{(peak - document) / 2**20:>14.2f}"
+            )
+            del pdf
@@ -0,0 +1,93 @@
+"""
+    Content stream size and render time of filled and styled rows
+
+    Run from the repository root:
+        python -m benchmarks.bench_styles [rows]
+"""
+import sys
+import time
+import warnings
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+from ez_pdf.styles import Style
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+COLUMNS = ColumnSpec(widths=(0.4, 0.3, 0.3), aligns=("L", "C", "R"))
+HEADER = Style(font="helvetica", font_size=9, fill=(200, 200, 200))
+STRIPE = Style(fill=(235, 235, 235))
+
+
+def zebra_cell_rows(pdf: EzPDF) -> None:
+    """Three cell rows, every other one filled, the fill color passed on each."""
+    for i in range(ROWS):
+        pdf.add_three_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text="2023-01-01",
+            cell3_text=f"{i * 12.5:.2f}",
+            cell1_fill=bool(i % 2),
+            cell2_fill=bool(i % 2),
+            cell3_fill=bool(i % 2),
+            cell_height=0.25,
+            r=235,
+            g=235,
+            b=235
+        )
+
+
+def filled_title_then_rows(pdf: EzPDF) -> None:
+    """A filled title row followed by unfilled rows."""
+    pdf.add_one_cell_row("Statement", fill=True, r=200, g=200, b=200)
+    pdf.add_rows(
+        ((f"Client {i:06d}", "2023-01-01", f"{i * 12.5:.2f}") for i in range(ROWS)),
+        COLUMNS,
+        cell_height=0.25
+    )
+
+
+def font_around_rows(pdf: EzPDF) -> None:
+    """set_font called before every row, as report code often does."""
+    for i in range(ROWS):
+        pdf.set_font("times", 8)
+        pdf.add_three_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text="2023-01-01",
+            cell3_text=f"{i * 12.5:.2f}",
+            cell_height=0.25
+        )
+
+
+def styled_zebra_table(pdf: EzPDF) -> None:
+    """Table with a styled header, stripes referencing one shared style."""
+    pdf.add_table(
+        (("Client", "Since", "Balance"),),
+        COLUMNS,
+        cell_height=0.25,
+        style=HEADER
+    )
+    for i in range(ROWS):
+        pdf.add_rows(
+            ((f"Client {i:06d}", "2023-01-01", f"{i * 12.5:.2f}"),),
+            COLUMNS,
+            cell_height=0.25,
+            style=STRIPE if i % 2 else None
+        )
+
+
+CASES = {
+    "zebra_cell_rows": zebra_cell_rows,
+    "filled_title_then_rows": filled_title_then_rows,
+    "font_around_rows": font_around_rows,
+    "styled_zebra_table": styled_zebra_table,
+}
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    print(f"{'case':<24} {'content KiB':>12} {'render s':>9}")
+    for name, case in CASES.items():
+        pdf = EzPDF()
+        pdf.add_page()
+        start = time.perf_counter()
+        case(pdf)
+        elapsed = time.perf_counter() - start
+        size = sum(len(page.contents) for page in pdf.pdf.pages.values())
+        print(f"{name:<24} {size / 1024:12.0f} {elapsed:9.2f}")
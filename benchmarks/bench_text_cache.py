@@ -0,0 +1,54 @@
+"""
+    Benchmark of the text measurement cache on repetitive tabular data
+
+    Run from the repository root:
+        python -m benchmarks.bench_text_cache [rows]
+"""
+import random
+import sys
+import time
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+COLUMNS = ColumnSpec(widths=(0.2, 0.2, 0.2, 0.2, 0.2), aligns=("L", "C", "C", "C", "R"))
+STATUSES = ("Active", "Inactive", "Pending", "N/A")
+DEPARTMENTS = ("Finance", "Human Services", "Operations", "Legal")
+
+
+def make_rows(count: int):
+    """Yields rows whose labels repeat the way report columns do."""
+    rng = random.Random(0)
+    for i in range(count):
+        yield (
+            rng.choice(DEPARTMENTS),
+            rng.choice(STATUSES),
+            f"2023-01-{rng.randint(1, 28):02d}",
+            rng.choice(STATUSES),
+            f"{rng.randint(0, 50) * 10}.00",
+        )
+
+
+def render(text_cache_size: int, line_breaking_only: bool = False) -> EzPDF:
+    """Renders ROWS rows and prints throughput and cache counters."""
+    pdf = EzPDF(text_cache_size=text_cache_size)
+    if line_breaking_only:
+        # Send every cell through fpdf's multi_cell line breaking.
+        pdf.text_cache.fits_one_line = lambda *args: False
+    pdf.add_page()
+    start = time.perf_counter()
+    pdf.add_rows(make_rows(ROWS), COLUMNS, cell_height=0.25)
+    elapsed = time.perf_counter() - start
+    info = pdf.text_cache.cache_info()
+    name = "multi_cell only" if line_breaking_only else f"cache size {text_cache_size}"
+    print(
+        f"{name:<16} {elapsed:7.3f}s {ROWS / elapsed:9.0f} rows/sec"
+        f"  hits={info.hits} misses={info.misses} size={info.size}"
+    )
+    return pdf
+
+
+if __name__ == "__main__":
+    print(f"Rendering {ROWS} five cell rows")
+    render(4096, line_breaking_only=True)
+    render(0)
+    render(4096)
@@ -0,0 +1,284 @@
+"""
+    Benchmark suite of the EzPDF row and export paths
+
+    Every case runs at several document sizes and records rows/sec (best of
+    the repeats), peak traced memory and output size. Results can be saved as
+    a baseline and later runs compared against it; a comparison exits with
+    status 1 when a case regressed by more than the threshold.
+
+    Run from the repository root:
+        python -m benchmarks.suite
+        python -m benchmarks.suite --sizes 1000 10000 --save baseline.json
+        python -m benchmarks.suite --compare baseline.json --threshold 0.1
+        python -m benchmarks.suite --cases add_five_cell_row export
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from ez_pdf.ez_pdf import EzPDF
+
+SIZES: Tuple[int, ...] = (1000, 5000, 20000)
+REPEATS: int = 3
+
+
+class Result(NamedTuple):
+    """Measurements of one case at one document size."""
+    case: str
+    rows: int
+    rows_per_sec: float
+    peak_bytes: int
+    output_bytes: int
+
+
+def new_pdf() -> EzPDF:
+    """Returns a document with one page added."""
+    pdf = EzPDF()
+    pdf.add_page()
+    return pdf
+
+
+def add_one_cell_row(pdf: EzPDF, rows: int) -> None:
+    """One cell rows, left aligned."""
+    for i in range(rows):
+        pdf.add_one_cell_row(f"Client {i:06d} - Active since 2023-01-01", align="L", cell_height=0.25)
+
+
+def add_two_cell_row(pdf: EzPDF, rows: int) -> None:
+    """Two cell rows, the second filled."""
+    pdf.set_cell_fill_color(230, 230, 230)
+    for i in range(rows):
+        pdf.add_two_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text="Active",
+            cell1_align="L",
+            cell2_fill=True,
+            cell_height=0.25
+        )
+
+
+def add_three_cell_row(pdf: EzPDF, rows: int) -> None:
+    """Three cell rows."""
+    for i in range(rows):
+        pdf.add_three_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text="Active",
+            cell3_text=f"{i * 1.5:.2f}",
+            cell1_align="L",
+            cell3_align="R",
+            cell_height=0.25
+        )
+
+
+def add_four_cell_row(pdf: EzPDF, rows: int) -> None:
+    """Four cell rows."""
+    for i in range(rows):
+        pdf.add_four_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text="Active",
+            cell3_text="2023-01-01",
+            cell4_text=f"{i * 1.5:.2f}",
+            cell1_align="L",
+            cell4_align="R",
+            cell_height=0.25
+        )
+
+
+def add_five_cell_row(pdf: EzPDF, rows: int) -> None:
+    """Five cell rows."""
+    for i in range(rows):
+        pdf.add_five_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text="Active",
+            cell3_text="2023-01-01",
+            cell4_text="Finance",
+            cell5_text=f"{i * 1.5:.2f}",
+            cell1_align="L",
+            cell5_align="R",
+            cell_height=0.25
+        )
+
+
+def add_empty_row(pdf: EzPDF, rows: int) -> None:
+    """Empty rows."""
+    for _ in range(rows):
+        pdf.add_empty_row(0.25)
+
+
+def set_font(pdf: EzPDF, rows: int) -> None:
+    """One cell rows alternating between two fonts."""
+    for i in range(rows):
+        if i % 2:
+            pdf.set_font("helvetica", 8)
+        else:
+            pdf.set_font("times", 10)
+        pdf.add_one_cell_row(f"Client {i:06d}", align="L", cell_height=0.25)
+
+
+def page_breaks(pdf: EzPDF, rows: int) -> None:
+    """Tall wrapped rows, breaking the page every few rows."""
+    text = "Notes " * 150
+    for i in range(rows):
+        pdf.add_two_cell_row(
+            cell1_text=f"Client {i:06d}",
+            cell2_text=text,
+            cell1_width=0.2,
+            cell2_width=0.8,
+            cell_height=0.25
+        )
+
+
+CASES: Dict[str, Callable[[EzPDF, int], None]] = {
+    "add_one_cell_row": add_one_cell_row,
+    "add_two_cell_row": add_two_cell_row,
+    "add_three_cell_row": add_three_cell_row,
+    "add_four_cell_row": add_four_cell_row,
+    "add_five_cell_row": add_five_cell_row,
+    "add_empty_row": add_empty_row,
+    "set_font": set_font,
+    "page_breaks": page_breaks,
+}
+
+
+def run_case(case: str, rows: int, repeats: int) -> Result:
+    """Measures one case at one size.
+
+    Timing and memory are measured in separate runs so tracemalloc does not
+    slow down the timed ones. The export case builds its document with five
+    cell rows and only times export_bytes.
+    """
+    build = CASES.get(case, add_five_cell_row)
+
+    best = float("inf")
+    output_bytes = 0
+    for _ in range(repeats):
+        pdf = new_pdf()
+        start = time.perf_counter()
+        build(pdf, rows)
+        if case == "export":
+            start = time.perf_counter()
+            output_bytes = len(pdf.export_bytes())
+        best = min(best, time.perf_counter() - start)
+    if case != "export":
+        output_bytes = len(pdf.export_bytes())
+
+    pdf = None
+    tracemalloc.start()
+    pdf = new_pdf()
+    build(pdf, rows)
+    if case == "export":
+        tracemalloc.reset_peak()
+        pdf.export_bytes()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return Result(case, rows, rows / best, peak_bytes, output_bytes)
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, dict],
+    threshold: float
+) -> List[str]:
+    """Lists regressions of results against a saved baseline.
+
+    Args:
+        results (List[Result]): Current measurements.
+        baseline (Dict[str, dict]): Saved measurements keyed on "case/rows".
+        threshold (float): Allowed relative change, e.g. 0.1 for 10%.
+
+    Returns:
+        List[str]: One line per regressed measurement.
+    """
+    regressions: List[str] = []
+    for result in results:
+        saved = baseline.get(f"{result.case}/{result.rows}")
+        if saved is None:
+            continue
+        if result.rows_per_sec < saved["rows_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{result.case}/{result.rows}: rows/sec {saved['rows_per_sec']:.0f}"
+                f" -> {result.rows_per_sec:.0f}"
+            )
+        for field in ("peak_bytes", "output_bytes"):
+            if getattr(result, field) > saved[field] * (1 + threshold):
+                regressions.append(
+                    f"{result.case}/{result.rows}: {field} {saved[field]}"
+                    f" -> {getattr(result, field)}"
+                )
+    return regressions
+
+
+def print_result(result: Result, saved: Optional[dict]) -> None:
+    """Prints one measurement, with its change against the baseline if any."""
+    line = (
+        f"{result.case:<20} {result.rows:>7} {result.rows_per_sec:12.0f} rows/sec"
+        f" {result.peak_bytes / 2**20:9.1f} MiB peak {result.output_bytes:>11} bytes"
+    )
+    if saved is not None:
+        line += f"  ({result.rows_per_sec / saved['rows_per_sec'] - 1:+.1%} rows/sec)"
+    print(line, flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the suite and returns the process exit status."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="document sizes in rows")
+    parser.add_argument("--repeats", type=int, default=REPEATS,
+                        help="timed runs per case, the best is kept")
+    parser.add_argument("--cases", nargs="+", choices=[*CASES, "export"],
+                        default=[*CASES, "export"], help="cases to run")
+    parser.add_argument("--save", metavar="PATH", help="save results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed relative regression (default 0.1)")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    baseline: Dict[str, dict] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    results: List[Result] = []
+    for case in args.cases:
+        for rows in args.sizes:
+            # Page breaks are slow per row, keep them to a comparable page count
+            result = run_case(case, rows // 10 if case == "page_breaks" else rows, args.repeats)
+            print_result(result, baseline.get(f"{result.case}/{result.rows}"))
+            results.append(result)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": {
+                        f"{result.case}/{result.rows}": result._asdict()
+                        for result in results
+                    },
+                },
+                file,
+                indent=2
+            )
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
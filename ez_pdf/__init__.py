@@ -0,0 +1,84 @@
+"""
+    Easy PDF creation on top of FPDF
+
+    Names are imported from their submodule on first access, so importing the
+    package, or only ez_pdf.ez_pdf, does not load the async, batch, cache,
+    columnar table, merge, operation log, template, font registry, image
+    cache or instrumentation machinery.
+"""
+from importlib import import_module
+
+# typing itself costs milliseconds to import; type checkers treat this
+# constant as True
+TYPE_CHECKING = False
+
+_SUBMODULES = {
+    "AutoColumns": "ez_pdf",
+    "ColumnSpec": "ez_pdf",
+    "EzPDF": "ez_pdf",
+    "AsyncEzPDF": "aio",
+    "AsyncRenderer": "aio",
+    "CachedEzPDF": "cache",
+    "RenderCache": "cache",
+    "ColumnarTable": "columnar",
+    "TableRow": "columnar",
+    "FONT_REGISTRY": "fonts",
+    "FontRegistry": "fonts",
+    "register_font": "fonts",
+    "IMAGE_CACHE": "images",
+    "ImageCache": "images",
+    "CallEvent": "instrumentation",
+    "CallStats": "instrumentation",
+    "Instrumentation": "instrumentation",
+    "PDFMerger": "merge",
+    "PDFReader": "merge",
+    "merge_pdfs": "merge",
+    "split_pdf": "merge",
+    "OpLog": "oplog",
+    "render_log": "oplog",
+    "Style": "styles",
+    "RenderJob": "batch",
+    "RenderResult": "batch",
+    "render_many": "batch",
+    "iter_render": "batch",
+    "CompiledTemplate": "template",
+    "DocumentTemplate": "template",
+    "EmptyRowTemplate": "template",
+    "RowTemplate": "template",
+    "TableTemplate": "template",
+}
+
+__all__ = list(_SUBMODULES)
+
+if TYPE_CHECKING:
+    from .ez_pdf import AutoColumns, ColumnSpec, EzPDF
+    from .aio import AsyncEzPDF, AsyncRenderer
+    from .cache import CachedEzPDF, RenderCache
+    from .columnar import ColumnarTable, TableRow
+    from .fonts import FONT_REGISTRY, FontRegistry, register_font
+    from .images import IMAGE_CACHE, ImageCache
+    from .instrumentation import CallEvent, CallStats, Instrumentation
+    from .merge import PDFMerger, PDFReader, merge_pdfs, split_pdf
+    from .oplog import OpLog, render_log
+    from .styles import Style
+    from .batch import RenderJob, RenderResult, iter_render, render_many
+    from .template import (
+        CompiledTemplate,
+        DocumentTemplate,
+        EmptyRowTemplate,
+        RowTemplate,
+        TableTemplate,
+    )
+
+
+def __getattr__(name):
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,7 @@
+"""
+    Entry point of python -m ez_pdf, see ez_pdf.cli
+"""
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+    Rendering of EzPDF documents off the asyncio event loop
+"""
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional
+from .ez_pdf import EzPDF
+from .oplog import OpLog, ReplayCancelled
+
+CHUNK_SIZE: int = 64 * 1024
+# Raised in the worker when the awaiting task of a render was cancelled
+RenderCancelled = ReplayCancelled
+
+
+class AsyncRenderer:
+    """Runs document layout and serialization in a bounded executor.
+
+    Pure Python layout holds the GIL, so a thread pool keeps the event loop
+    responsive but does not render faster with more threads. Pass a
+    ProcessPoolExecutor to render documents in parallel, in which case
+    builders and their arguments must be picklable.
+    """
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ):
+        """Creates a renderer.
+
+        Args:
+            max_workers (int, optional): Threads of the executor created when
+                none is given. Defaults to 1.
+            max_concurrency (int, optional): Maximum number of renders submitted
+                to the executor at once by each event loop, others wait on their
+                loop. Defaults to max_workers.
+            executor (Executor, optional): Executor to render in. It is not shut
+                down by close. Defaults to a new ThreadPoolExecutor.
+
+        Raises:
+            ValueError: Max workers and max concurrency must be at least 1.
+        """
+        if max_workers < 1:
+            raise ValueError(f"Max workers must be at least 1. Currently {max_workers}")
+        max_concurrency = max_workers if max_concurrency is None else max_concurrency
+        if max_concurrency < 1:
+            raise ValueError(f"Max concurrency must be at least 1. Currently {max_concurrency}")
+        self.max_concurrency: int = max_concurrency
+        self._owns_executor: bool = executor is None
+        self.executor: Executor = executor or ThreadPoolExecutor(
+            max_workers, thread_name_prefix="ez_pdf"
+        )
+        # One semaphore per event loop, as a semaphore binds to the loop it is
+        # first awaited on and the renderer can outlive it, e.g. across asyncio.run
+        self._semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+
+    async def run(
+        self,
+        function: Callable[..., Any],
+        *args: Any
+    ) -> Any:
+        """Calls function(*args) in the executor once a concurrency slot is free.
+
+        Cancelling the awaiting task cancels the call if it has not started yet.
+        A call that already started runs to completion in the background but
+        its result is dropped.
+
+        Args:
+            function (Callable[..., Any]): Function to call.
+            *args (Any): Arguments of the call.
+
+        Returns:
+            Any: Return value of the call.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self.max_concurrency))
+        async with semaphore:
+            return await asyncio.wrap_future(self.executor.submit(function, *args))
+
+
+    async def render_bytes(
+        self,
+        builder: Callable[..., EzPDF],
+        *args: Any
+    ) -> bytes:
+        """Builds a document with builder(*args) and exports it, both in the executor.
+
+        Args:
+            builder (Callable[..., EzPDF]): Function returning a filled document.
+            *args (Any): Arguments of builder.
+
+        Returns:
+            bytes: Contents of the PDF file.
+        """
+        return await self.run(_build_bytes, builder, args)
+
+
+    async def stream(
+        self,
+        builder: Callable[..., EzPDF],
+        *args: Any,
+        chunk_size: int = CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Builds and exports a document in the executor and yields it in chunks.
+
+        Args:
+            builder (Callable[..., EzPDF]): Function returning a filled document.
+            *args (Any): Arguments of builder.
+            chunk_size (int, optional): Bytes per chunk. Defaults to 64 KiB.
+
+        Yields:
+            bytes: Consecutive chunks of the PDF file.
+        """
+        async for chunk in _chunks(await self.render_bytes(builder, *args), chunk_size):
+            yield chunk
+
+
+    def close(self) -> None:
+        """Shuts down the executor created by the renderer."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+
+    async def __aenter__(self) -> "AsyncRenderer":
+        return self
+
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default_renderer: Optional[AsyncRenderer] = None
+
+
+def default_renderer() -> AsyncRenderer:
+    """Returns the process-wide renderer used by AsyncEzPDF, a single worker thread."""
+    global _default_renderer  # pylint: disable=global-statement
+    if _default_renderer is None:
+        _default_renderer = AsyncRenderer()
+    return _default_renderer
+
+
+class AsyncEzPDF(OpLog):
+    """EzPDF facade whose layout and export run off the event loop.
+
+    Calls to EzPDF methods such as add_page, add_five_cell_row or add_table
+    are recorded in an operation log and return None; the log is replayed in
+    the renderer's executor when the document is exported with one of the
+    async export methods. Cancelling the awaiting task stops the replay
+    before the next recorded call.
+
+    Example:
+        pdf = AsyncEzPDF()
+        pdf.add_page()
+        pdf.add_rows(rows, column_spec)
+        return await pdf.export_bytes_async()
+    """
+    def __init__(
+        self,
+        *args: Any,
+        renderer: Optional[AsyncRenderer] = None,
+        **kwargs: Any
+    ):
+        """Creates an empty document.
+
+        Args:
+            *args (Any): Positional arguments of EzPDF.
+            renderer (AsyncRenderer, optional): Renderer to export with.
+                Defaults to default_renderer().
+            **kwargs (Any): Keyword arguments of EzPDF, and creation_date of OpLog.
+        """
+        super().__init__(*args, **kwargs)
+        self.renderer: AsyncRenderer = renderer or default_renderer()
+
+
+    async def _render(self, output: Optional[str] = None) -> Optional[bytes]:
+        """Replays the recorded calls and exports, in the renderer's executor."""
+        renderer = self.renderer
+        # A threading.Event can neither be pickled nor be set across processes
+        cancelled = (
+            None if isinstance(renderer.executor, ProcessPoolExecutor)
+            else threading.Event()
+        )
+        try:
+            return await renderer.run(_replay, self.copy(), output, cancelled)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.set()
+            raise
+
+
+    async def export_async(
+        self,
+        filename: str
+    ) -> None:
+        """Renders the document and exports it to a file without blocking the loop.
+
+        Args:
+            filename (str): Name of file to export to.
+        """
+        await self._render(filename)
+
+
+    async def export_bytes_async(self) -> bytes:
+        """Renders the document and exports it to memory without blocking the loop.
+
+        Returns:
+            bytes: Contents of the PDF file.
+        """
+        return await self._render()
+
+
+    async def stream(
+        self,
+        chunk_size: int = CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Renders the document without blocking the loop and yields it in chunks,
+        e.g. for a chunked HTTP response.
+
+        The first chunk is available once the whole document is serialized;
+        FPDF writes the cross-reference table last and keeps every page in
+        memory until then.
+
+        Args:
+            chunk_size (int, optional): Bytes per chunk. Defaults to 64 KiB.
+
+        Yields:
+            bytes: Consecutive chunks of the PDF file.
+        """
+        async for chunk in _chunks(await self._render(), chunk_size):
+            yield chunk
+
+
+def _build_bytes(builder: Callable[..., EzPDF], args: tuple) -> bytes:
+    """Builds and exports a document, in a worker."""
+    return bytes(builder(*args).export_bytes())
+
+
+def _replay(
+    log: OpLog,
+    output: Optional[str],
+    cancelled: Optional[threading.Event]
+) -> Optional[bytes]:
+    """Renders an operation log and exports it, in a worker.
+
+    Raises:
+        RenderCancelled: The awaiting task was cancelled.
+    """
+    pdf = log.build(None if cancelled is None else cancelled.is_set)
+    if output is not None:
+        pdf.export(output)
+        return None
+    return bytes(pdf.export_bytes())
+
+
+async def _chunks(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yields data in chunks, letting other tasks run between chunks."""
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1. Currently {chunk_size}")
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+        await asyncio.sleep(0)
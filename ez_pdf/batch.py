@@ -0,0 +1,138 @@
+"""
+    Parallel generation of many PDFs with a process pool
+"""
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, NamedTuple, Optional
+from .ez_pdf import EzPDF
+
+
+class RenderJob(NamedTuple):
+    """Picklable description of one document to render.
+
+    Attributes:
+        output (str): Name of file to export to.
+        data (Any): Picklable payload handed to the builder.
+    """
+    output: str
+    data: Any
+
+
+class RenderResult(NamedTuple):
+    """Outcome of one RenderJob.
+
+    Attributes:
+        output (str): Name of file the job exported to.
+        seconds (float): Wall time spent building and exporting the document.
+        error (Optional[str]): Formatted traceback if the job failed, otherwise None.
+    """
+    output: str
+    seconds: float
+    error: Optional[str]
+
+
+def _render_job(
+    builder: Callable[[Any], EzPDF],
+    job: RenderJob
+) -> RenderResult:
+    """Builds and exports a single job, capturing any error."""
+    start: float = time.perf_counter()
+    error: Optional[str] = None
+    try:
+        builder(job.data).export(job.output)
+    except Exception:  # pylint: disable=broad-except
+        error = traceback.format_exc()
+    return RenderResult(job.output, time.perf_counter() - start, error)
+
+
+def render_many(
+    jobs: Iterable[RenderJob],
+    builder: Callable[[Any], EzPDF],
+    workers: int = 1,
+    chunksize: int = 1
+) -> List[RenderResult]:
+    """Builds and exports many documents, fanning out over worker processes.
+
+    A failing job does not stop the batch, its traceback is returned in its result.
+
+    Args:
+        jobs (Iterable[RenderJob]): Documents to render.
+        builder (Callable[[Any], EzPDF]): Module level function that takes a job's
+            data and returns the filled EzPDF. Must be picklable.
+        workers (int, optional): Number of worker processes. 1 renders in the
+            calling process. Defaults to 1.
+        chunksize (int, optional): Number of jobs sent to a worker at a time.
+            Raising it lowers the overhead for many small documents. Defaults to 1.
+
+    Raises:
+        ValueError: Workers and chunksize must be at least 1.
+
+    Returns:
+        List[RenderResult]: One result per job, in job order.
+    """
+    if workers < 1:
+        raise ValueError(f"Workers must be at least 1. Currently {workers}")
+    if chunksize < 1:
+        raise ValueError(f"Chunksize must be at least 1. Currently {chunksize}")
+
+    if workers == 1:
+        return [_render_job(builder, job) for job in jobs]
+
+    jobs = list(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            _render_job,
+            [builder] * len(jobs),
+            jobs,
+            chunksize=chunksize
+        ))
+
+
+def iter_render(
+    jobs: Iterable[RenderJob],
+    builder: Callable[[Any], EzPDF],
+    workers: int = 1,
+    max_pending: Optional[int] = None
+) -> Iterator[RenderResult]:
+    """Builds and exports documents like render_many, yielding each result as
+    soon as it and every job before it are done, e.g. to report progress.
+
+    Jobs are pulled from the iterable only as workers free up, so a lazy
+    iterable of jobs is never materialized.
+
+    Args:
+        jobs (Iterable[RenderJob]): Documents to render.
+        builder (Callable[[Any], EzPDF]): Module level function that takes a job's
+            data and returns the filled EzPDF. Must be picklable.
+        workers (int, optional): Number of worker processes. 1 renders in the
+            calling process. Defaults to 1.
+        max_pending (int, optional): Maximum number of jobs submitted and not yet
+            yielded. Defaults to 4 per worker.
+
+    Raises:
+        ValueError: Workers and max pending must be at least 1.
+
+    Yields:
+        RenderResult: One result per job, in job order.
+    """
+    if workers < 1:
+        raise ValueError(f"Workers must be at least 1. Currently {workers}")
+    max_pending = 4 * workers if max_pending is None else max_pending
+    if max_pending < 1:
+        raise ValueError(f"Max pending must be at least 1. Currently {max_pending}")
+
+    if workers == 1:
+        for job in jobs:
+            yield _render_job(builder, job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for job in jobs:
+            pending.append(executor.submit(_render_job, builder, job))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,325 @@
+"""
+    Content-addressed cache of exported documents, skipping the layout and
+    serialization of documents whose content did not change
+"""
+import hashlib
+import inspect
+import os
+import struct
+import tempfile
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+import fpdf
+from .ez_pdf import EzPDF
+from .oplog import OpLog, _encode
+
+# Bumped whenever the encoding of operations changes, invalidating older entries
+CACHE_FORMAT: int = 1
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+# Arguments naming files whose contents are part of the document
+_FILE_ARGUMENTS: Dict[str, Tuple[str, ...]] = {
+    "add_font": ("fname",),
+    "add_logo": ("path",),
+    "add_image_row": ("images",),
+}
+
+
+class RenderCacheInfo(NamedTuple):
+    """Counters of a RenderCache."""
+    hits: int
+    misses: int
+    entries: int
+    size: int
+    max_bytes: int
+
+
+class RenderCache:
+    """Directory of exported PDF files named by the hash of the operations
+    that built them, evicting the least recently used files beyond a size limit.
+
+    Several processes can share a directory: entries are written atomically
+    and eviction tolerates files removed by another process.
+    """
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Opens a cache directory, creating it if needed.
+
+        Args:
+            directory (str): Directory holding the cached files.
+            max_bytes (int, optional): Total size of the cached files kept.
+                Defaults to 256 MiB.
+
+        Raises:
+            ValueError: Max bytes must be at least 1.
+        """
+        if max_bytes < 1:
+            raise ValueError(f"Render cache max bytes must be at least 1. Currently {max_bytes}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.size: int = sum(size for _, _, size in self._entries())
+
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache, 0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+    def info(self) -> RenderCacheInfo:
+        """Returns the hit and miss counters and the current size of the cache."""
+        entries = self._entries()
+        return RenderCacheInfo(
+            self.hits,
+            self.misses,
+            len(entries),
+            sum(size for _, _, size in entries),
+            self.max_bytes
+        )
+
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """Last use time, path and size of every cached file."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached document of key and marks it as recently used.
+
+        Args:
+            key (str): Hash of the operations building the document.
+
+        Returns:
+            Optional[bytes]: Contents of the PDF file, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+
+    def put(self, key: str, data: bytes) -> None:
+        """Stores a document, evicting the least recently used ones when full.
+
+        Documents larger than max_bytes are not stored.
+
+        Args:
+            key (str): Hash of the operations building the document.
+            data (bytes): Contents of the PDF file.
+        """
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        # A unique name per writer, as threads and processes may store the same key
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self.directory, prefix=f"{key}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self._evict()
+
+
+    def _evict(self) -> None:
+        """Deletes the least recently used files until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        self.size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+
+
+    def clear(self) -> None:
+        """Deletes every cached file and resets the counters."""
+        for _, path, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+def _feed(digest: Any, value: Any) -> None:
+    """Adds an unambiguous encoding of value to digest."""
+    if value is None or isinstance(value, (bool, int, float)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8", "surrogatepass")
+        digest.update(b"s" + struct.pack("<Q", len(encoded)) + encoded)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        digest.update(b"b" + struct.pack("<Q", len(value)) + bytes(value))
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"l" + struct.pack("<Q", len(value)))
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, dict):
+        digest.update(b"d" + struct.pack("<Q", len(value)))
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    else:
+        # Layouts, styles and tables in the form operation logs serialize them
+        # to, which raises TypeError for anything else
+        digest.update(b"o" + type(value).__name__.encode() + b";")
+        _feed(digest, _encode(value))
+
+
+@lru_cache(maxsize=None)
+def _code_digest() -> str:
+    """SHA-256 of the source of the ez_pdf package, so a change to how
+    documents are laid out never serves files rendered by older code."""
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            digest.update(name.encode() + b"\0")
+            digest.update(bytes.fromhex(_file_digest(os.path.join(directory, name))))
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 of the contents of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CachedEzPDF(OpLog):
+    """EzPDF facade that returns the previously exported file when the same
+    operations are repeated.
+
+    Calls to EzPDF methods are recorded in an operation log and return None.
+    On export the constructor arguments, every recorded call with its
+    arguments, the contents of font and image files, the source of ez_pdf
+    and the fpdf version are hashed; on a hit the cached file is returned
+    without laying the document out, on a miss the log is replayed and the
+    result is stored. Arguments must be serializable by OpLog.to_bytes.
+
+    Rows passed as iterators, e.g. to stream_table, are read into a list when
+    the call is recorded. Unless a creation date is given, a cached file keeps
+    the creation date of the export that stored it.
+
+    Example:
+        cache = RenderCache("/var/cache/statements")
+        pdf = CachedEzPDF(cache=cache)
+        pdf.add_page()
+        pdf.add_rows(rows, column_spec)
+        pdf.export("statement.pdf")
+    """
+    def __init__(
+        self,
+        *args: Any,
+        cache: RenderCache,
+        **kwargs: Any
+    ):
+        """Creates an empty document.
+
+        Args:
+            *args (Any): Positional arguments of EzPDF.
+            cache (RenderCache): Cache to look exports up in and store them to.
+            **kwargs (Any): Keyword arguments of EzPDF, and creation_date of OpLog.
+        """
+        super().__init__(*args, **kwargs)
+        self.cache: RenderCache = cache
+        self.hit: Optional[bool] = None
+
+
+    @property
+    def key(self) -> str:
+        """Hash of the document built by the operations recorded so far,
+        naming its cache entry."""
+        digest = hashlib.sha256()
+        _feed(digest, (CACHE_FORMAT, _code_digest(), fpdf.FPDF_VERSION, self.args, self.kwargs))
+        if self.creation_date is not None:
+            _feed(digest, self.creation_date.isoformat())
+        for name, args, kwargs in self.operations:
+            files = []
+            if name in _FILE_ARGUMENTS:
+                bound = inspect.signature(getattr(EzPDF, name)).bind(None, *args, **kwargs)
+                for argument in _FILE_ARGUMENTS[name]:
+                    paths = bound.arguments.get(argument)
+                    if not isinstance(paths, (list, tuple)):
+                        paths = [paths]
+                    files.extend(_file_digest(path) for path in paths if path is not None)
+            _feed(digest, (name, args, kwargs, files))
+        return digest.hexdigest()
+
+
+    def export_bytes(self) -> bytes:
+        """Returns the cached PDF file, or renders and caches it.
+
+        Returns:
+            bytes: Contents of the PDF file.
+        """
+        key = self.key
+        data = self.cache.get(key)
+        self.hit = data is not None
+        if data is None:
+            data = self.replay()
+            self.cache.put(key, data)
+        return data
+
+
+    def export(
+        self,
+        filename: str
+    ) -> None:
+        """Exports the cached or rendered PDF file to a file.
+
+        Args:
+            filename (str): Name of file to export to.
+        """
+        with open(filename, "wb") as file:
+            file.write(self.export_bytes())
+
+
+    def export_to(
+        self,
+        stream: BinaryIO
+    ) -> None:
+        """Exports the cached or rendered PDF file to a binary stream.
+
+        Args:
+            stream (BinaryIO): Writable binary stream to export to.
+        """
+        stream.write(self.export_bytes())
@@ -0,0 +1,320 @@
+"""
+    Command-line batch renderer of CSV and JSON Lines data
+
+    Usage:
+        python -m ez_pdf LAYOUT DATA -o OUTPUT [--split-by COLUMN] [--jobs N]
+
+    LAYOUT is a JSON file describing the table, e.g.
+        {
+            "columns": [
+                {"field": "name", "title": "Client", "width": 0.5, "align": "L"},
+                {"field": "status", "width": 0.2},
+                {"field": "balance", "width": 0.3, "align": "R", "fill": true}
+            ],
+            "title": "Clients of {key}",
+            "cell_height": 0.25,
+            "fill_color": [230, 230, 230]
+        }
+    Column entries take the add_*_cell_row options width, align, fill and
+    border. Top level options are title, header (repeat column titles on every
+    page, default true), cell_height, equal_height, fill_color, page_format,
+    font, font_size, page_width and margin.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
+from .batch import RenderJob, iter_render
+from .ez_pdf import ColumnSpec, EzPDF
+
+Row = Mapping[str, Any]
+# Seconds between progress lines
+PROGRESS_INTERVAL: float = 1.0
+
+
+def read_rows(
+    file: TextIO,
+    data_format: str
+) -> Iterator[Row]:
+    """Reads records lazily from a CSV file with a header line or a JSON Lines file.
+
+    Args:
+        file (TextIO): Open data file.
+        data_format (str): "csv" or "jsonl".
+
+    Raises:
+        ValueError: Unknown data format or a JSON line that is not an object.
+
+    Yields:
+        Row: One record per data line.
+    """
+    if data_format == "csv":
+        yield from csv.DictReader(file)
+    elif data_format == "jsonl":
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {number} is not a JSON object.")
+            yield record
+    else:
+        raise ValueError(f"Unknown data format {data_format}. Use csv or jsonl")
+
+
+def load_layout(path: str) -> Dict[str, Any]:
+    """Loads and validates a layout file.
+
+    Args:
+        path (str): Path of the JSON layout.
+
+    Raises:
+        ValueError: Layout has no columns or its widths do not add up to 1.
+
+    Returns:
+        Dict[str, Any]: Layout options.
+    """
+    with open(path, encoding="utf-8") as file:
+        layout: Dict[str, Any] = json.load(file)
+    columns = layout.get("columns")
+    if not columns:
+        raise ValueError("Layout must list at least one column.")
+    for index, column in enumerate(columns):
+        if "field" not in column or "width" not in column:
+            raise ValueError(f"Column {index + 1} of the layout needs a field and a width.")
+    # Fail before any rendering starts
+    _column_spec(layout)
+    return layout
+
+
+def _column_spec(layout: Mapping[str, Any]) -> ColumnSpec:
+    """Column layout described by a layout file."""
+    columns = layout["columns"]
+    r, g, b = layout.get("fill_color", (0, 0, 0))
+    return ColumnSpec(
+        [column["width"] for column in columns],
+        aligns=[column.get("align", "C") for column in columns],
+        fills=[column.get("fill", False) for column in columns],
+        borders=[column.get("border", 1) for column in columns],
+        page_width=layout.get("page_width", 8.5),
+        margin=layout.get("margin", 0.5),
+        r=r,
+        g=g,
+        b=b
+    )
+
+
+def build_document(
+    layout: Mapping[str, Any],
+    rows: Iterable[Row],
+    key: str = ""
+) -> EzPDF:
+    """Lays records out as one table.
+
+    Args:
+        layout (Mapping[str, Any]): Layout options, see load_layout.
+        rows (Iterable[Row]): Records, pulled lazily.
+        key (str, optional): Group of the document, substituted for {key} in
+            the title. Defaults to "".
+
+    Returns:
+        EzPDF: Filled document.
+    """
+    fields: List[str] = [column["field"] for column in layout["columns"]]
+    pdf = EzPDF(font=layout.get("font", "times"), font_size=layout.get("font_size", 8))
+    pdf.add_page(page_format=layout.get("page_format", "legal"))
+    cell_height: float = layout.get("cell_height", 0.25)
+    if layout.get("title"):
+        pdf.add_one_cell_row(
+            layout["title"].format(key=key),
+            page_width=layout.get("page_width", 8.5),
+            margin=layout.get("margin", 0.5),
+            border=0,
+            cell_height=cell_height * 2
+        )
+    header: Optional[List[str]] = None
+    if layout.get("header", True):
+        header = [column.get("title", column["field"]) for column in layout["columns"]]
+    pdf.stream_table(
+        (
+            ["" if row.get(field) is None else str(row.get(field)) for field in fields]
+            for row in rows
+        ),
+        _column_spec(layout),
+        cell_height=cell_height,
+        header=header,
+        equal_height=layout.get("equal_height", False)
+    )
+    return pdf
+
+
+def _build_job(data: Tuple[Mapping[str, Any], Sequence[Row], str]) -> EzPDF:
+    """Builder of render jobs, one document per group."""
+    layout, rows, key = data
+    return build_document(layout, rows, key)
+
+
+def _file_name(key: str) -> str:
+    """Turns a group value into a safe file name."""
+    return re.sub(r"[^\w.-]+", "_", key).strip("._") or "_"
+
+
+def split_jobs(
+    layout: Mapping[str, Any],
+    rows: Iterable[Row],
+    split_by: str,
+    output: str,
+    counter: List[int]
+) -> Iterator[RenderJob]:
+    """Groups consecutive records sharing a split_by value into one job each.
+
+    Args:
+        layout (Mapping[str, Any]): Layout options.
+        rows (Iterable[Row]): Records, sorted or grouped by split_by.
+        split_by (str): Field to group on.
+        output (str): Directory, or file pattern containing {key}.
+        counter (List[int]): One element list incremented by the records read.
+
+    Raises:
+        ValueError: A record has no split_by field, or records of a group are
+            not consecutive.
+
+    Yields:
+        RenderJob: One job per group.
+    """
+    seen = set()
+    for key, group in groupby(_with_field(rows, split_by), key=lambda row: str(row[split_by])):
+        if key in seen:
+            raise ValueError(
+                f"Records with {split_by} {key} are not consecutive. Sort the data by {split_by}."
+                )
+        seen.add(key)
+        group_rows = list(group)
+        counter[0] += len(group_rows)
+        if "{key}" in output:
+            filename = output.replace("{key}", _file_name(key))
+        else:
+            filename = os.path.join(output, f"{_file_name(key)}.pdf")
+        yield RenderJob(filename, (layout, group_rows, key))
+
+
+def _with_field(rows: Iterable[Row], field: str) -> Iterator[Row]:
+    """Passes records through, checking that each one has field, so a
+    misspelled column fails instead of putting every record in one group."""
+    for number, row in enumerate(rows, 1):
+        if field not in row:
+            raise ValueError(
+                f"Record {number} has no field {field}. "
+                f"Its fields are {', '.join(str(name) for name in row)}"
+                )
+        yield row
+
+
+class Progress:
+    """Prints throughput lines to stderr at most once per interval."""
+    def __init__(self, stream: Optional[TextIO] = sys.stderr, interval: float = PROGRESS_INTERVAL):
+        self.stream = stream
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last = self.start
+
+
+    def report(self, documents: int, rows: int, final: bool = False) -> None:
+        """Prints the counts so far if the interval has passed, or if final."""
+        now = time.perf_counter()
+        if self.stream is None or (not final and now - self._last < self.interval):
+            return
+        self._last = now
+        elapsed = max(now - self.start, 1e-9)
+        print(
+            f"{'done' if final else 'rendering'}: {documents} document(s), {rows} rows "
+            f"in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s, {documents / elapsed:.1f} docs/s)",
+            file=self.stream,
+            flush=True
+        )
+
+
+def _counted(rows: Iterable[Row], counter: List[int], progress: Progress) -> Iterator[Row]:
+    """Passes records through, counting them and reporting progress."""
+    for row in rows:
+        counter[0] += 1
+        if not counter[0] % 1000:
+            progress.report(0, counter[0])
+        yield row
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the command line and returns the process exit status."""
+    parser = argparse.ArgumentParser(
+        prog="ezpdf",
+        description="Render CSV or JSON Lines records into PDF tables.",
+        epilog=__doc__[__doc__.index("LAYOUT is"):],
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("layout", help="JSON layout file")
+    parser.add_argument("data", help="CSV or JSON Lines file, - for stdin")
+    parser.add_argument("-o", "--output", required=True,
+                        help="PDF file, or with --split-by a directory or a pattern with {key}")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="data format, guessed from the data file extension by default")
+    parser.add_argument("--split-by", metavar="COLUMN",
+                        help="write one document per group of consecutive records sharing COLUMN")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="worker processes rendering groups in parallel (with --split-by)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+
+    if args.jobs is not None and args.split_by is None:
+        parser.error("--jobs only applies with --split-by")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1. Currently {args.jobs}")
+    data_format = args.format or ("jsonl" if args.data.endswith((".jsonl", ".ndjson")) else "csv")
+    try:
+        layout = load_layout(args.layout)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    progress = Progress(None if args.quiet else sys.stderr)
+    counter = [0]
+    failures = 0
+    documents = 0
+    try:
+        data_file = sys.stdin if args.data == "-" else open(
+            args.data, newline="", encoding="utf-8"
+        )
+    except OSError as error:
+        parser.error(str(error))
+    try:
+        rows = read_rows(data_file, data_format)
+        if args.split_by is None:
+            build_document(layout, _counted(rows, counter, progress)).export(args.output)
+            documents = 1
+        else:
+            if "{key}" not in args.output:
+                os.makedirs(args.output, exist_ok=True)
+            results = iter_render(
+                split_jobs(layout, rows, args.split_by, args.output, counter),
+                _build_job,
+                workers=args.jobs or 1
+            )
+            for result in results:
+                documents += 1
+                if result.error is not None:
+                    failures += 1
+                    print(f"ezpdf: {result.output} failed\n{result.error}", file=sys.stderr)
+                progress.report(documents, counter[0])
+    except (OSError, ValueError, csv.Error) as error:
+        print(f"ezpdf: error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if data_file is not sys.stdin:
+            data_file.close()
+
+    progress.report(documents, counter[0], final=True)
+    return 1 if failures else 0
+
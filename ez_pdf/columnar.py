@@ -0,0 +1,423 @@
+"""
+    Column oriented table model for reports too large for rows of dicts
+"""
+import math
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
+from numbers import Integral
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from .ez_pdf import ColumnSpec
+from .styles import Style
+
+
+class _TextColumn:
+    """Texts of a column, dictionary encoded while values repeat.
+
+    Repeating columns keep each distinct string once, interned, and a 4 byte
+    code per row. Once most rows hold a distinct value, as in id or name
+    columns, the column switches to UTF-8 bytes packed in one buffer with an
+    end offset per row.
+    """
+    __slots__ = ("values", "codes", "_lookup", "_data", "_ends")
+
+    def __init__(
+        self,
+        values: Iterable[str] = (),
+        codes: Iterable[int] = (),
+        texts: Iterable[str] = (),
+        packed: Optional[bytes] = None,
+        ends: Iterable[int] = ()
+    ):
+        self.values: List[str] = [sys.intern(value) for value in values]
+        self.codes: array = array("I", codes)
+        self._lookup: Optional[Dict[str, int]] = {
+            value: code for code, value in enumerate(self.values)
+        }
+        self._data: Optional[bytearray] = None
+        self._ends: Optional[array] = None
+        if packed is not None:
+            self._lookup, self._data, self._ends = None, bytearray(packed), array("Q", ends)
+        for text in texts:
+            self.append(text)
+
+
+    def append(self, text: str) -> None:
+        """Adds the text of one row."""
+        if self._lookup is None:
+            self._data += text.encode("utf-8")
+            self._ends.append(len(self._data))
+            return
+        code = self._lookup.get(text)
+        if code is None:
+            code = len(self.values)
+            if code >= 4096 and code * 2 > len(self.codes):
+                self._pack()
+                self.append(text)
+                return
+            text = sys.intern(text)
+            self._lookup[text] = code
+            self.values.append(text)
+        self.codes.append(code)
+
+
+    def _pack(self) -> None:
+        """Switches to packed UTF-8 storage."""
+        data = bytearray()
+        ends = array("Q")
+        for text in self.texts():
+            data += text.encode("utf-8")
+            ends.append(len(data))
+        self.values, self.codes, self._lookup = [], array("I"), None
+        self._data, self._ends = data, ends
+
+
+    def text(self, index: int) -> str:
+        """Text of one row."""
+        if self._lookup is None:
+            start: int = self._ends[index - 1] if index > 0 else 0
+            return self._data[start:self._ends[index]].decode("utf-8")
+        return self.values[self.codes[index]]
+
+
+    def texts(self) -> Iterator[str]:
+        """Texts of every row, decoded lazily."""
+        if self._lookup is None:
+            return self._unpacked()
+        return map(self.values.__getitem__, self.codes)
+
+
+    def _unpacked(self) -> Iterator[str]:
+        """Texts of every row of packed storage."""
+        data = memoryview(self._data)
+        start: int = 0
+        for end in self._ends:
+            yield str(data[start:end], "utf-8")
+            start = end
+
+
+    def state(self) -> Dict[str, Any]:
+        """Distinct values and row codes, or the packed bytes and row end
+        offsets, the column's pickled form."""
+        if self._lookup is None:
+            return {"packed": bytes(self._data), "ends": self._ends}
+        return {"values": self.values, "codes": self.codes}
+
+
+class _NumberColumn:
+    """Numbers stored in an 8 byte array and formatted when rendered.
+
+    Integer columns keep exact 8 byte integers and, once a row is missing, a
+    byte per row marking the missing rows. The first value that is not an
+    integer switches the column to 8 byte floats holding NaN for missing rows.
+    """
+    __slots__ = ("numbers", "missing", "format", "na_rep")
+
+    def __init__(
+        self,
+        format_: str,
+        na_rep: str,
+        numbers: Iterable[float] = (),
+        typecode: str = "q",
+        missing: Optional[bytes] = None
+    ):
+        self.numbers: array = array(typecode, numbers)
+        self.missing: Optional[bytearray] = None if missing is None else bytearray(missing)
+        self.format: str = format_
+        self.na_rep: str = na_rep
+
+
+    def append(self, number: Optional[float]) -> None:
+        """Adds the number of one row, None for a missing value.
+
+        Raises:
+            ValueError: Integer does not fit in 8 bytes, or can not be stored
+                exactly in a column holding floats.
+        """
+        numbers: array = self.numbers
+        # Exact type checks first, Integral checks are slow on every row
+        if type(number) is float and numbers.typecode == "d":
+            numbers.append(number)
+        elif number is None:
+            if numbers.typecode == "d":
+                numbers.append(math.nan)
+                return
+            if self.missing is None:
+                self.missing = bytearray(len(numbers))
+            self.missing.append(1)
+            numbers.append(0)
+        elif type(number) is int or isinstance(number, Integral):
+            if numbers.typecode == "d":
+                _check_float(int(number))
+                numbers.append(number)
+                return
+            try:
+                numbers.append(number)
+            except OverflowError:
+                raise ValueError(
+                    f"Integers of a number column must fit in 8 bytes. Currently {number}"
+                    ) from None
+            if self.missing is not None:
+                self.missing.append(0)
+        else:
+            if numbers.typecode == "q":
+                self._to_floats()
+            self.numbers.append(number)
+
+
+    def _to_floats(self) -> None:
+        """Switches to 8 byte floats, NaN for missing rows."""
+        for number in self.numbers:
+            _check_float(number)
+        numbers = array("d", self.numbers)
+        if self.missing is not None:
+            for index, missing in enumerate(self.missing):
+                if missing:
+                    numbers[index] = math.nan
+        self.numbers, self.missing = numbers, None
+
+
+    def text(self, index: int) -> str:
+        """Formatted number of one row."""
+        number: float = self.numbers[index]
+        if self.missing is not None and self.missing[index]:
+            return self.na_rep
+        # NaN is the only value not equal to itself
+        return self.format % number if number == number else self.na_rep
+
+
+    def texts(self) -> Iterator[str]:
+        """Formatted numbers of every row, built lazily."""
+        format_, na_rep = self.format, self.na_rep
+        if self.missing is not None:
+            return (
+                na_rep if missing else format_ % number
+                for number, missing in zip(self.numbers, self.missing)
+            )
+        return (
+            format_ % number if number == number else na_rep
+            for number in self.numbers
+        )
+
+
+    def state(self) -> Dict[str, Any]:
+        """Numbers of the rows, their type and the missing rows of integer
+        columns, the column's pickled form."""
+        return {
+            "numbers": self.numbers,
+            "typecode": self.numbers.typecode,
+            "missing": None if self.missing is None else bytes(self.missing),
+        }
+
+
+def _check_float(number: int) -> None:
+    """Checks that an integer is stored exactly as an 8 byte float.
+
+    Raises:
+        ValueError: Integer would lose precision as a float.
+    """
+    if int(float(number)) != number:
+        raise ValueError(
+            "Integers of a number column holding floats must be exact as floats "
+            f"(up to 2**53). Currently {number}"
+            )
+
+
+class TableRow(SequenceABC):
+    """Read-only view of one row of a ColumnarTable.
+
+    Views hold no texts of their own: cells are decoded from the table's
+    columns when read, by position or by column name.
+    """
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ColumnarTable", index: int):
+        self._table: ColumnarTable = table
+        self._index: int = index
+
+
+    def __getitem__(self, key: Union[int, slice, str]) -> Any:
+        data = self._table._data  # pylint: disable=protected-access
+        if isinstance(key, slice):
+            return tuple(column.text(self._index) for column in data[key])
+        if isinstance(key, str):
+            key = self._table.position(key)
+        return data[key].text(self._index)
+
+
+    def __len__(self) -> int:
+        return self._table.columns.columns
+
+
+    def __repr__(self) -> str:
+        return f"TableRow({tuple(self)!r})"
+
+
+class ColumnarTable:
+    """Rows of a large table stored column by column.
+
+    Text columns keep each distinct string once, interned, and a 4 byte code
+    per row, or pack their UTF-8 bytes in one buffer when most values are
+    distinct. Number columns keep 8 byte integers or floats in an array and
+    are formatted only when rendered. Layout and style are resolved once for the whole
+    table, so rows carry no per row settings. Rows are appended as plain
+    sequences and read back through TableRow views; EzPDF.add_columnar_table
+    renders the table straight from its columns.
+    """
+    __slots__ = (
+        "columns", "names", "formats", "na_rep", "style", "header_style", "_data", "_rows"
+    )
+
+    def __init__(
+        self,
+        columns: ColumnSpec,
+        names: Optional[Sequence[str]] = None,
+        formats: Optional[Sequence[Optional[str]]] = None,
+        na_rep: str = "",
+        style: Optional[Style] = None,
+        header_style: Optional[Style] = None
+    ):
+        """Creates an empty table.
+
+        Args:
+            columns (ColumnSpec): Layout of the columns.
+            names (Sequence[str], optional): Column names, rendered as the header
+                row and usable to read cells of a TableRow. Defaults to None.
+            formats (Sequence[Optional[str]], optional): printf style pattern
+                (e.g. "%.2f") of each number column, None for text columns.
+                Defaults to every column holding text.
+            na_rep (str, optional): Text of missing values. Defaults to "".
+            style (Style, optional): Style of the rows. Defaults to None.
+            header_style (Style, optional): Style of the header row. Defaults to None.
+
+        Raises:
+            ValueError: Names and formats must have one entry per column.
+        """
+        count: int = columns.columns
+        formats = (None,) * count if formats is None else tuple(formats)
+        for name, values in (("names", names), ("formats", formats)):
+            if values is not None and len(values) != count:
+                raise ValueError(
+                    f"Column spec has {count} columns but {len(values)} {name}."
+                    )
+
+        self.columns: ColumnSpec = columns
+        self.names: Optional[Tuple[str, ...]] = None if names is None else tuple(names)
+        self.formats: Tuple[Optional[str], ...] = formats
+        self.na_rep: str = na_rep
+        self.style: Optional[Style] = style
+        self.header_style: Optional[Style] = header_style
+        self._data: Tuple[Union[_TextColumn, _NumberColumn], ...] = tuple(
+            _TextColumn() if format_ is None else _NumberColumn(format_, na_rep)
+            for format_ in formats
+        )
+        self._rows: int = 0
+
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Adds one row.
+
+        Args:
+            row (Sequence[Any]): One value per column: numbers (or None) for
+                number columns, anything else is stored as its str, None as na_rep.
+
+        Raises:
+            ValueError: Row does not have one value per column.
+        """
+        if len(row) != len(self._data):
+            raise ValueError(
+                f"Row has {len(row)} cells but column spec has {len(self._data)} columns."
+                )
+        na_rep: str = self.na_rep
+        for column, value in zip(self._data, row):
+            if isinstance(column, _TextColumn):
+                value = na_rep if value is None else str(value)
+            column.append(value)
+        self._rows += 1
+
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Adds many rows, pulled one at a time so the source can be a cursor
+        or generator.
+
+        Args:
+            rows (Iterable[Sequence[Any]]): Rows to add, each with one value per column.
+
+        Raises:
+            ValueError: Row does not have one value per column.
+
+        Returns:
+            int: Number of rows added.
+        """
+        start: int = self._rows
+        append = self.append
+        for row in rows:
+            append(row)
+        return self._rows - start
+
+
+    def position(self, name: str) -> int:
+        """Position of a named column.
+
+        Raises:
+            KeyError: Table has no column of that name.
+        """
+        if self.names is None or name not in self.names:
+            raise KeyError(f"Table has no column named {name!r}.")
+        return self.names.index(name)
+
+
+    def texts(self) -> Iterator[Tuple[str, ...]]:
+        """Cell texts of every row, decoded lazily one row at a time.
+
+        Yields:
+            Tuple[str, ...]: Texts of one row.
+        """
+        return zip(*(column.texts() for column in self._data))
+
+
+    def __len__(self) -> int:
+        return self._rows
+
+
+    def __getitem__(self, index: int) -> TableRow:
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("Table row index out of range.")
+        return TableRow(self, index)
+
+
+    def __iter__(self) -> Iterator[TableRow]:
+        return (TableRow(self, index) for index in range(self._rows))
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "columns": self.columns,
+            "names": self.names,
+            "formats": self.formats,
+            "na_rep": self.na_rep,
+            "style": self.style,
+            "header_style": self.header_style,
+            "data": [column.state() for column in self._data],
+            "rows": self._rows,
+        }
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.columns = state["columns"]
+        self.names = None if state["names"] is None else tuple(state["names"])
+        self.formats = tuple(state["formats"])
+        self.na_rep = state["na_rep"]
+        self.style = state["style"]
+        self.header_style = state["header_style"]
+        self._data = tuple(
+            _TextColumn(**data) if format_ is None else _NumberColumn(format_, self.na_rep, **data)
+            for format_, data in zip(self.formats, state["data"])
+        )
+        self._rows = state["rows"]
+
+
+    def __repr__(self) -> str:
+        return f"ColumnarTable(rows={self._rows}, columns={self.columns.columns})"
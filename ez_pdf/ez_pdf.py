@@ -1,26 +1,297 @@
 """
     FPDF helper functions for creating PDFs
 """
-from typing import Union
+from __future__ import annotations
+
+import math
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from .forms import StaticForm
+from .frames import Format, table_columns
+from .output import EzOutputProducer
+from .spill import PageSpill
+from .styles import Style, styled_cells
+from .text_cache import TextCache
+
+# Loaded on first use, to keep imports fast for short-lived scripts
+if TYPE_CHECKING:
+    from .columnar import ColumnarTable
+    from .instrumentation import Hook, Instrumentation
+
+
+class ColumnSpec:
+    """Precomputed column layout for rendering rows with EzPDF.add_rows.
+
+    Widths are validated and resolved into absolute cell widths and x offsets
+    once, so the same layout can be reused for any number of rows.
+    """
+    def __init__(
+        self,
+        widths: Sequence[float],
+        aligns: Optional[Sequence[str]] = None,
+        fills: Optional[Sequence[bool]] = None,
+        borders: Optional[Sequence[Union[int, str]]] = None,
+        page_width: float = 8.5,
+        margin: float = 0.5,
+        r: int = 0,
+        g: int = 0,
+        b: int = 0
+    ):
+        """Creates a column layout.
+
+        Args:
+            widths (Sequence[float]): Width of each cell as a percentage of
+                available space.
+            aligns (Sequence[str], optional): Text alignment of each cell
+                (L, C, X or R). Defaults to "C" for every cell.
+            fills (Sequence[bool], optional): Option to fill each cell with
+                set color. Defaults to False for every cell.
+            borders (Sequence[Union[int, str]], optional): Border of each cell.
+                Can be 0, 1, or string containing LRTB (Left, Right, Top, Bottom)
+                in any order. Defaults to 1 for every cell.
+            page_width (float, optional): Width of page in given format
+                (default inches). Defaults to 8.5.
+            margin (float, optional): Margin of page in given format
+                (default inches). Defaults to 0.5.
+            r (int, optional): Color code for red (0-255). Defaults to 0.
+            g (int, optional): Color code for green (0-255). Defaults to 0.
+            b (int, optional): Color code for blue (0-255). Defaults to 0.
+
+        Raises:
+            ValueError: Given width percentages must add up to 1 and every
+                per-cell sequence must have one entry per column.
+        """
+        columns: int = len(widths)
+        if columns == 0:
+            raise ValueError("Column spec needs at least one column.")
+        aligns = ["C"] * columns if aligns is None else list(aligns)
+        fills = [False] * columns if fills is None else list(fills)
+        borders = [1] * columns if borders is None else list(borders)
+        for name, values in (("aligns", aligns), ("fills", fills), ("borders", borders)):
+            if len(values) != columns:
+                raise ValueError(
+                    f"Column spec has {columns} widths but {len(values)} {name}."
+                    )
+
+        if not math.isclose(sum(widths), 1):
+            raise ValueError(
+                f"Cell widths must add up to 1. "
+                f"Currently widths {', '.join(str(width) for width in widths)} "
+                f"add up to {sum(widths)}"
+                )
+
+        self.columns: int = columns
+        self.fill_color: Optional[Tuple[int, int, int]] = (r, g, b) if any(fills) else None
+
+        page_width: float = page_width - (margin * 2)
+        cells: List[Tuple[float, float, str, Union[int, str], bool]] = []
+        x_offset: float = 0
+        for width, align, fill, border in zip(widths, aligns, fills, borders):
+            cell_width: float = page_width * width
+            cells.append((x_offset, cell_width, align, border, bool(fill)))
+            x_offset += cell_width
+        self.cells: Tuple[Tuple[float, float, str, Union[int, str], bool], ...] = tuple(cells)
+
+
+class AutoColumns:
+    """Column layout fitted to the texts of a table.
+
+    Passed instead of a ColumnSpec to EzPDF.add_table or EzPDF.stream_table,
+    the header and the first rows are measured once and the fitted ColumnSpec
+    is kept for the rest of the table, so later rows cost nothing extra.
+    """
+    def __init__(
+        self,
+        min_widths: Union[float, Sequence[float]] = 0.05,
+        max_widths: Union[float, Sequence[float]] = 1.0,
+        sample: Optional[int] = 1000,
+        aligns: Optional[Sequence[str]] = None,
+        fills: Optional[Sequence[bool]] = None,
+        borders: Optional[Sequence[Union[int, str]]] = None,
+        page_width: float = 8.5,
+        margin: float = 0.5,
+        r: int = 0,
+        g: int = 0,
+        b: int = 0
+    ):
+        """Creates a fitted layout.
+
+        Args:
+            min_widths (Union[float, Sequence[float]], optional): Smallest width of
+                every cell, or of each cell, as a percentage of available space.
+                Defaults to 0.05.
+            max_widths (Union[float, Sequence[float]], optional): Largest width of
+                every cell, or of each cell, as a percentage of available space.
+                Defaults to 1.0.
+            sample (int, optional): Number of leading rows measured. None measures
+                every row, reading the whole table up front. Defaults to 1000.
+            aligns (Sequence[str], optional): Text alignment of each cell
+                (L, C, X or R). Defaults to "C" for every cell.
+            fills (Sequence[bool], optional): Option to fill each cell with
+                set color. Defaults to False for every cell.
+            borders (Sequence[Union[int, str]], optional): Border of each cell.
+                Defaults to 1 for every cell.
+            page_width (float, optional): Width of page in given format
+                (default inches). Defaults to 8.5.
+            margin (float, optional): Margin of page in given format
+                (default inches). Defaults to 0.5.
+            r (int, optional): Color code for red (0-255). Defaults to 0.
+            g (int, optional): Color code for green (0-255). Defaults to 0.
+            b (int, optional): Color code for blue (0-255). Defaults to 0.
+
+        Raises:
+            ValueError: Sample must be at least 1.
+        """
+        if sample is not None and sample < 1:
+            raise ValueError(f"Auto column sample must be at least 1. Currently {sample}")
+        self.min_widths: Union[float, Tuple[float, ...]] = (
+            min_widths if isinstance(min_widths, (int, float)) else tuple(min_widths)
+        )
+        self.max_widths: Union[float, Tuple[float, ...]] = (
+            max_widths if isinstance(max_widths, (int, float)) else tuple(max_widths)
+        )
+        self.sample: Optional[int] = sample
+        self.aligns: Optional[Tuple[str, ...]] = None if aligns is None else tuple(aligns)
+        self.fills: Optional[Tuple[bool, ...]] = None if fills is None else tuple(fills)
+        self.borders: Optional[Tuple[Union[int, str], ...]] = (
+            None if borders is None else tuple(borders)
+        )
+        self.page_width: float = page_width
+        self.margin: float = margin
+        self.color: Tuple[int, int, int] = (r, g, b)
+
+
+    def fit(self, natural_widths: Sequence[float]) -> ColumnSpec:
+        """Column spec whose widths are proportional to the natural width of each
+        column, kept within the width bounds.
+
+        Args:
+            natural_widths (Sequence[float]): Width each column needs to show its
+                widest text on one line, in user units.
+
+        Raises:
+            ValueError: Width bounds can not be met with widths adding up to 1.
+
+        Returns:
+            ColumnSpec: Fitted layout.
+        """
+        count: int = len(natural_widths)
+        minimums = self._bounds(self.min_widths, count, "min widths")
+        maximums = self._bounds(self.max_widths, count, "max widths")
+        if (
+            sum(minimums) > 1 + 1e-9
+            or sum(maximums) < 1 - 1e-9
+            or any(low > high for low, high in zip(minimums, maximums))
+        ):
+            raise ValueError(
+                f"Auto column width bounds can not add up to 1. "
+                f"Currently min widths add up to {sum(minimums)} "
+                f"and max widths to {sum(maximums)}"
+                )
+
+        # Widths are scale * natural width clamped to the bounds; their sum grows
+        # with scale, so the scale making them add up to 1 is found by bisection
+        weights = [max(width, 1e-9) for width in natural_widths]
+
+        def clamped(scale: float) -> List[float]:
+            return [
+                min(max(scale * weight, low), high)
+                for weight, low, high in zip(weights, minimums, maximums)
+            ]
+
+        low_scale: float = 0.0
+        high_scale: float = max(high / weight for weight, high in zip(weights, maximums))
+        for _ in range(100):
+            scale: float = (low_scale + high_scale) / 2
+            if sum(clamped(scale)) < 1:
+                low_scale = scale
+            else:
+                high_scale = scale
+        widths = clamped(high_scale)
+        total: float = sum(widths)
+        return ColumnSpec(
+            [width / total for width in widths],
+            aligns=self.aligns,
+            fills=self.fills,
+            borders=self.borders,
+            page_width=self.page_width,
+            margin=self.margin,
+            r=self.color[0],
+            g=self.color[1],
+            b=self.color[2]
+        )
+
+
+    @staticmethod
+    def _bounds(
+        bounds: Union[float, Tuple[float, ...]],
+        count: int,
+        name: str
+    ) -> Tuple[float, ...]:
+        """Per column bounds from a shared or per column value."""
+        if isinstance(bounds, (int, float)):
+            return (bounds,) * count
+        if len(bounds) != count:
+            raise ValueError(f"Table has {count} columns but {len(bounds)} {name}.")
+        return bounds
+
+
+class _HeaderRow(NamedTuple):
+    """Table header, styled and measured once, repeated on every page."""
+    texts: Sequence[str]
+    cells: Tuple[Tuple[float, float, str, Union[int, str], bool], ...]
+    fill_color: Optional[Tuple[int, int, int]]
+    style: Optional[Style]
+    height: float
+
 
 class EzPDF:
     """Abstraction layer for FPDF library."""
-    def __init__(self, font: str = "times", font_size: int = 8):
+    def __init__(self, font: str = "times", font_size: int = 8, text_cache_size: int = 4096):
         self.pdf = FPDF(unit="in", format="legal")
         self.pdf.set_font(font, size=font_size)
+        self.text_cache = TextCache(max_size=text_cache_size)
+        # Document font, and whether a row style replaced it on the FPDF object
+        self._font: Tuple[str, float] = (font, font_size)
+        self._font_override: bool = False
+        # Last fill color set and the FPDF color object it produced
+        self._fill: Tuple[Optional[Tuple[int, int, int]], Any] = (None, None)
+        self._forms: Dict[str, StaticForm] = {}
+        self._repeated_form: Optional[str] = None
+        self._compression_level: int = -1
+        self._object_streams: bool = False
+        self._spill: Optional[PageSpill] = None
 
     def add_page(
         self,
-        page_format : str ="legal"
+        page_format : str ="legal",
+        orientation: str = "portrait"
     ) -> None:
         """Adds a page to the PDF object.
 
         Args:
             page_format (str, optional): 2-tuple or one of 'a3', 'a4', 'a5', 
                 'letter', or 'legal'. Defaults to "legal".
+            orientation (str, optional): "portrait" or "landscape". Defaults to "portrait".
         """
-        self.pdf.add_page(format=page_format)
+        self.pdf.add_page(orientation=orientation, format=page_format)
 
 
     def set_font(
@@ -36,6 +307,28 @@ class EzPDF:
             font_size (int, optional): Font size. Defaults to 8.
         """
         self.pdf.set_font(font, size=font_size)
+        self._font = (font, font_size)
+        self._font_override = False
+
+
+    def add_font(
+        self,
+        family: str,
+        fname: str,
+        style: str = ""
+    ) -> None:
+        """Adds a TrueType or OpenType font, e.g. for non-Latin text, to use with set_font.
+
+        The font file is parsed once per process and its subsets are cached,
+        so documents using the same font share the work.
+
+        Args:
+            family (str): Name to set the font by.
+            fname (str): Path of the font file.
+            style (str, optional): "", "B" (bold), "I" (italic) or "BI". Defaults to "".
+        """
+        from .fonts import FONT_REGISTRY  # pylint: disable=import-outside-toplevel
+        FONT_REGISTRY.install(self.pdf, FONT_REGISTRY.register(family, fname, style))
 
 
     def add_empty_row(
@@ -57,14 +350,53 @@ class EzPDF:
         g: int,
         b: int
     ) -> None:
-        """Sets fill color for PDF object.
+        """Sets fill color for PDF object. Nothing is emitted if it is already set.
 
         Args:
             r (int): Red value (0-255)
             g (int): Green value (0-255)
             b (int): Blue value (0-255)
         """
-        self.pdf.set_fill_color(r, g, b)
+        self._use_fill((r, g, b))
+
+
+    def _use_fill(
+        self,
+        color: Optional[Tuple[int, int, int]]
+    ) -> None:
+        """Sets the fill color of the page for the next cells, only emitting an
+        operator when it changes. Rows without filled cells leave it as it is.
+
+        Args:
+            color (Optional[Tuple[int, int, int]]): Fill color of the filled cells,
+                or None when no cell is filled.
+        """
+        if color is None:
+            return
+        pdf = self.pdf
+        # FPDF keeps the color object of the page state, so identity shows
+        # whether anything else changed it since
+        if color != self._fill[0] or pdf.fill_color is not self._fill[1]:
+            pdf.set_fill_color(*color)
+            self._fill = (color, pdf.fill_color)
+
+
+    def _apply_style(
+        self,
+        style: Optional[Style]
+    ) -> None:
+        """Selects the font of a row style, or the document font when the row
+        has none. FPDF only emits a font change when the font differs."""
+        if style is not None and (style.font is not None or style.font_size is not None):
+            font, font_size = self._font
+            self.pdf.set_font(
+                font if style.font is None else style.font,
+                size=font_size if style.font_size is None else style.font_size
+            )
+            self._font_override = True
+        elif self._font_override:
+            self.pdf.set_font(self._font[0], size=self._font[1])
+            self._font_override = False
 
 
     def add_one_cell_row(
@@ -108,8 +440,9 @@ class EzPDF:
             g (int, optional): Color code for green (0-255). Defaults to 0.
             b (int, optional): Color code for blue (0-255). Defaults to 0.
         """
-        if fill:
-            self.set_cell_fill_color(r, g, b)
+        if self._font_override:
+            self._apply_style(None)
+        self._use_fill((r, g, b) if fill else None)
         page_width: float = page_width - (margin * 2)
 
         self.pdf.set_xy(self.pdf.l_margin, self.pdf.y)
@@ -186,41 +519,31 @@ class EzPDF:
         Raises:
             ValueError: Given width percentages must add up to 1.
         """
-        if cell1_fill or cell2_fill:
-            self.set_cell_fill_color(r, g, b)
+        if self._font_override:
+            self._apply_style(None)
+        filled: bool = cell1_fill or cell2_fill
+        self._use_fill((r, g, b) if filled else None)
 
-        if cell1_width + cell2_width != 1:
+        if not math.isclose(cell1_width + cell2_width, 1):
             raise ValueError(
                 f"Cell widths must add up to 1. "
-                f"Currently widths {cell1_width} and {cell2_width}"
-                f"add up to ", cell1_width + cell2_width
+                f"Currently widths {cell1_width} and {cell2_width} "
+                f"add up to {cell1_width + cell2_width}"
                 )
 
         page_width: float = page_width - (margin * 2)
         cell1_width: float = page_width * cell1_width
         cell2_width: float = page_width * cell2_width
-        y_position: float = self.pdf.y
 
-        self.pdf.set_xy(self.pdf.l_margin, y_position)
-        self.pdf.multi_cell(
-            w=cell1_width,
-            h=cell_height,
-            txt=cell1_text,
-            align=cell1_align,
-            border=border,
-            fill=cell1_fill
-        )
-
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width, y_position)
-        self.pdf.multi_cell(
-            w=cell2_width,
-            h=cell_height,
-            txt=cell2_text,
-            align=cell2_align,
-            border=border,
-            ln=new_line,
-            fill=cell2_fill
-        )
+        self._render_row(
+            (cell1_text, cell2_text),
+            (
+                (0, cell1_width, cell1_align, border, cell1_fill),
+                (cell1_width, cell2_width, cell2_align, border, cell2_fill),
+            ),
+            cell_height,
+            new_line
+            )
 
 
     def add_three_cell_row(
@@ -300,54 +623,33 @@ class EzPDF:
         Raises:
             ValueError: Given width percentages must add up to 1.
         """
-        if cell1_fill or cell2_fill or cell3_fill:
-            self.set_cell_fill_color(r, g, b)
+        if self._font_override:
+            self._apply_style(None)
+        filled: bool = cell1_fill or cell2_fill or cell3_fill
+        self._use_fill((r, g, b) if filled else None)
 
-        if cell1_width + cell2_width + cell3_width != 1:
+        if not math.isclose(cell1_width + cell2_width + cell3_width, 1):
             raise ValueError(
                 f"Cell widths must add up to 1. "
-                f"Currently widths {cell1_width}, {cell2_width}, and {cell3_width} add up to ", 
-                cell1_width + cell2_width + cell3_width
+                f"Currently widths {cell1_width}, {cell2_width}, and {cell3_width} "
+                f"add up to {cell1_width + cell2_width + cell3_width}"
                 )
 
         page_width: float = page_width - (margin * 2)
         cell1_width: float = page_width * cell1_width
         cell2_width: float = page_width * cell2_width
         cell3_width: float = page_width * cell3_width
-        y_position: float = self.pdf.y
-
-        self.pdf.set_xy(self.pdf.l_margin, y_position)
-        self.pdf.multi_cell(
-            w=cell1_width,
-            h=cell_height,
-            txt=cell1_text,
-            align=cell1_align,
-            border=border,
-            ln=0,
-            fill=cell1_fill
-        )
-
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width, y_position)
-        self.pdf.multi_cell(
-            w=cell2_width,
-            h=cell_height,
-            txt=cell2_text,
-            align=cell2_align,
-            border=border,
-            ln=0,
-            fill=cell2_fill
-        )
 
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width + cell2_width, y_position)
-        self.pdf.multi_cell(
-            w=cell3_width,
-            h=cell_height,
-            txt=cell3_text,
-            align=cell3_align,
-            border=border,
-            ln=new_line,
-            fill=cell3_fill
-        )
+        self._render_row(
+            (cell1_text, cell2_text, cell3_text),
+            (
+                (0, cell1_width, cell1_align, border, cell1_fill),
+                (cell1_width, cell2_width, cell2_align, border, cell2_fill),
+                (cell1_width + cell2_width, cell3_width, cell3_align, border, cell3_fill),
+            ),
+            cell_height,
+            new_line
+            )
 
 
     def add_four_cell_row(
@@ -442,14 +744,16 @@ class EzPDF:
         Raises:
             ValueError: Given width percentages must add up to 1.
         """
-        if cell1_fill or cell2_fill or cell3_fill or cell4_fill:
-            self.set_cell_fill_color(r, g, b)
+        if self._font_override:
+            self._apply_style(None)
+        filled: bool = cell1_fill or cell2_fill or cell3_fill or cell4_fill
+        self._use_fill((r, g, b) if filled else None)
 
-        if cell1_width + cell2_width + cell3_width + cell4_width != 1:
+        if not math.isclose(cell1_width + cell2_width + cell3_width + cell4_width, 1):
             raise ValueError(
                 f"Cell widths must add up to 1. "
                 f"Currently widths {cell1_width}, {cell2_width}, {cell3_width}, and {cell4_width} "
-                f"add up to ", cell1_width + cell2_width + cell3_width + cell4_width
+                f"add up to {cell1_width + cell2_width + cell3_width + cell4_width}"
                 )
 
         page_width: float = page_width - (margin * 2)
@@ -457,52 +761,19 @@ class EzPDF:
         cell2_width: float = page_width * cell2_width
         cell3_width: float = page_width * cell3_width
         cell4_width: float = page_width * cell4_width
-        y_position: float = self.pdf.y
-
-        self.pdf.set_xy(self.pdf.l_margin, y_position)
-        self.pdf.multi_cell(
-            w=cell1_width,
-            h=cell_height,
-            txt=cell1_text,
-            align=cell1_align,
-            border=border,
-            ln=0,
-            fill=cell1_fill
-        )
-
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width, y_position)
-        self.pdf.multi_cell(
-            w=cell2_width,
-            h=cell_height,
-            txt=cell2_text,
-            align=cell2_align,
-            border=border,
-            ln=0,
-            fill=cell2_fill
-        )
 
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width + cell2_width, y_position)
-        self.pdf.multi_cell(
-            w=cell3_width,
-            h=cell_height,
-            txt=cell3_text,
-            align=cell3_align,
-            border=border,
-            ln=0,
-            fill=cell3_fill
-        )
-
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width +
-                cell2_width + cell3_width, y_position)
-        self.pdf.multi_cell(
-            w=cell4_width,
-            h=cell_height,
-            txt=cell4_text,
-            align=cell4_align,
-            border=border,
-            ln=new_line,
-            fill=cell4_fill
-        )
+        self._render_row(
+            (cell1_text, cell2_text, cell3_text, cell4_text),
+            (
+                (0, cell1_width, cell1_align, border, cell1_fill),
+                (cell1_width, cell2_width, cell2_align, border, cell2_fill),
+                (cell1_width + cell2_width, cell3_width, cell3_align, border, cell3_fill),
+                (cell1_width + cell2_width + cell3_width,
+                    cell4_width, cell4_align, border, cell4_fill),
+            ),
+            cell_height,
+            new_line
+            )
 
 
     def add_five_cell_row(
@@ -612,15 +883,17 @@ class EzPDF:
         Raises:
             ValueError: Given width percentages must add up to 1.
         """
-        if cell1_fill or cell2_fill or cell3_fill or cell4_fill or cell5_fill:
-            self.set_cell_fill_color(r, g, b)
+        if self._font_override:
+            self._apply_style(None)
+        filled: bool = cell1_fill or cell2_fill or cell3_fill or cell4_fill or cell5_fill
+        self._use_fill((r, g, b) if filled else None)
 
-        if cell1_width + cell2_width + cell3_width + cell4_width + cell5_width != 1:
+        if not math.isclose(cell1_width + cell2_width + cell3_width + cell4_width + cell5_width, 1):
             raise ValueError(
                 f"Cell widths must add up to 1. "
                 f"Currently widths {cell1_width}, {cell2_width}, {cell3_width}, {cell4_width} "
-                f"and {cell5_width} add up to ", 
-                cell1_width + cell2_width + cell3_width + cell4_width + cell5_width
+                f"and {cell5_width} add up to "
+                f"{cell1_width + cell2_width + cell3_width + cell4_width + cell5_width}"
                 )
 
         page_width: float = page_width - (margin * 2)
@@ -629,64 +902,865 @@ class EzPDF:
         cell3_width: float = page_width * cell3_width
         cell4_width: float = page_width * cell4_width
         cell5_width: float = page_width * cell5_width
-        y_position: float = self.pdf.y
 
-        self.pdf.set_xy(self.pdf.l_margin, y_position)
-        self.pdf.multi_cell(
-            w=cell1_width,
-            h=cell_height,
-            txt=cell1_text,
-            align=cell1_align,
-            border=border,
-            ln=0,
-            fill=cell1_fill
+        self._render_row(
+            (cell1_text, cell2_text, cell3_text, cell4_text, cell5_text),
+            (
+                (0, cell1_width, cell1_align, border, cell1_fill),
+                (cell1_width, cell2_width, cell2_align, border, cell2_fill),
+                (cell1_width + cell2_width, cell3_width, cell3_align, border, cell3_fill),
+                (cell1_width + cell2_width + cell3_width,
+                    cell4_width, cell4_align, border, cell4_fill),
+                (cell1_width + cell2_width + cell3_width + cell4_width,
+                    cell5_width, cell5_align, border, cell5_fill),
+            ),
+            cell_height,
+            new_line
+            )
+
+
+    def add_rows(
+        self,
+        rows: Iterable[Sequence[str]],
+        column_spec: ColumnSpec,
+        cell_height: float = 0.5,
+        new_line: int = 1,
+        style: Optional[Style] = None
+    ) -> None:
+        """Add many rows sharing one precomputed column layout.
+
+        A page is added ahead of a row that would cross the bottom margin, so
+        every cell of a row lands on the same page.
+
+        Args:
+            rows (Iterable[Sequence[str]]): Rows to add, each with one text per column.
+            column_spec (ColumnSpec): Layout of the columns.
+            cell_height (float, optional): Height of cell.
+                Uses whatever format PDF uses, by default in inches. Defaults to 0.5.
+            new_line (int, optional): Indicates if you want the final cell of each row
+                to require subsequent cell to a new line. Options are 0 (no new line)
+                and 1 (new line). Defaults to 1.
+            style (Style, optional): Style of the rows. Defaults to None.
+
+        Raises:
+            ValueError: Row does not have one text per column.
+        """
+        self._apply_style(style)
+        cells, fill_color = styled_cells(column_spec, style)
+        self._use_fill(fill_color)
+
+        pdf = self.pdf
+        columns: int = column_spec.columns
+        row_height = self._row_height
+        render_row = self._render_row
+        for row in rows:
+            if len(row) != columns:
+                raise ValueError(
+                    f"Row has {len(row)} cells but column spec has {columns} columns."
+                    )
+            # Break ahead of the row so its cells are not spread across pages
+            if pdf.will_page_break(row_height(row, cells, cell_height)):
+                pdf.add_page(same=True)
+            render_row(row, cells, cell_height, new_line)
+
+
+    def add_logo(
+        self,
+        path: str,
+        width: float = 1.5,
+        align: str = "L",
+        page_width: float = 8.5,
+        margin: float = 0.5,
+        new_line: int = 1
+    ) -> None:
+        """Adds an image, such as a logo, at the current y position, scaled to
+        width with its aspect ratio kept.
+
+        The file is decoded once per process and embedded once per document,
+        however many pages it is drawn on.
+
+        Args:
+            path (str): Path of a PNG, JPEG or other raster image file.
+            width (float, optional): Width of the image. Uses whatever format
+                PDF uses, by default in inches. Defaults to 1.5.
+            align (str, optional): Position of the image between the margins:
+                L (left), C (center) or R (right). Defaults to "L".
+            page_width (float, optional): Width of page in given format
+                (default inches). Defaults to 8.5.
+            margin (float, optional): Margin of page in given format
+                (default inches). Defaults to 0.5.
+            new_line (int, optional): 1 to move below the image, 0 to keep the
+                current position, e.g. to add a title row beside it. Defaults to 1.
+
+        Raises:
+            ValueError: Align must be L, C or R.
+        """
+        if align not in ("L", "C", "R"):
+            raise ValueError(f"Logo align must be L, C or R. Currently {align}")
+        from .images import IMAGE_CACHE  # pylint: disable=import-outside-toplevel
+
+        pdf = self.pdf
+        name, info = IMAGE_CACHE.install(pdf, path)
+        height: float = width * info["h"] / info["w"]
+        if pdf.will_page_break(height):
+            pdf.add_page(same=True)
+        x_position: float = margin
+        if align == "C":
+            x_position += (page_width - 2 * margin - width) / 2
+        elif align == "R":
+            x_position += page_width - 2 * margin - width
+        y_position: float = pdf.y
+        pdf.image(name, x=x_position, y=y_position, w=width, h=height)
+        if new_line:
+            pdf.set_xy(pdf.l_margin, y_position + height)
+
+
+    def add_image_row(
+        self,
+        images: Sequence[Optional[str]],
+        column_spec: Optional[ColumnSpec] = None,
+        cell_height: float = 1.0,
+        new_line: int = 1
+    ) -> None:
+        """Add a row of cells holding one image each, fitted inside the cell
+        padding with their aspect ratio kept.
+
+        Image files are decoded once per process and embedded once per document,
+        however many cells and pages they are drawn in.
+
+        Args:
+            images (Sequence[Optional[str]]): Path of the raster image of each cell,
+                None for an empty cell.
+            column_spec (ColumnSpec, optional): Layout of the columns; aligns place
+                each image horizontally, borders and fills draw the cells.
+                Defaults to equal widths without borders.
+            cell_height (float, optional): Height of the row.
+                Uses whatever format PDF uses, by default in inches. Defaults to 1.0.
+            new_line (int, optional): Indicates if you want the final cell of the row
+                to require subsequent cell to a new line. Options are 0 (no new line)
+                and 1 (new line). Defaults to 1.
+
+        Raises:
+            ValueError: Row does not have one image per column.
+        """
+        if column_spec is None:
+            column_spec = ColumnSpec([1 / len(images)] * len(images), borders=[0] * len(images))
+        if len(images) != column_spec.columns:
+            raise ValueError(
+                f"Row has {len(images)} cells but column spec has {column_spec.columns} columns."
+                )
+        from .images import IMAGE_CACHE  # pylint: disable=import-outside-toplevel
+
+        pdf = self.pdf
+        if self._font_override:
+            self._apply_style(None)
+        self._use_fill(column_spec.fill_color)
+        if pdf.will_page_break(cell_height):
+            pdf.add_page(same=True)
+        y_position: float = pdf.y
+        self._render_row(("",) * len(images), column_spec.cells, cell_height, new_line)
+
+        padding: float = pdf.c_margin
+        for path, (x_offset, width, align, _, _) in zip(images, column_spec.cells):
+            if path is None:
+                continue
+            name, info = IMAGE_CACHE.install(pdf, path)
+            scale: float = min(
+                (width - 2 * padding) / info["w"],
+                (cell_height - 2 * padding) / info["h"]
+            )
+            image_width: float = info["w"] * scale
+            image_height: float = info["h"] * scale
+            x_position: float = pdf.l_margin + x_offset + padding
+            if align == "R":
+                x_position += width - 2 * padding - image_width
+            elif align != "L":
+                x_position += (width - 2 * padding - image_width) / 2
+            pdf.image(
+                name,
+                x=x_position,
+                y=y_position + (cell_height - image_height) / 2,
+                w=image_width,
+                h=image_height
+            )
+
+
+    def stream_table(
+        self,
+        rows: Iterable[Sequence[str]],
+        columns: Union[ColumnSpec, AutoColumns],
+        chunk_size: int = 1000,
+        cell_height: float = 0.5,
+        header: Optional[Sequence[str]] = None,
+        header_columns: Optional[ColumnSpec] = None,
+        equal_height: bool = False,
+        style: Optional[Style] = None,
+        header_style: Optional[Style] = None
+    ) -> int:
+        """Add rows pulled lazily from an iterator, such as a database cursor.
+
+        Rows are pulled at most chunk_size at a time and laid out like add_table
+        before the next chunk is requested, so the dataset is never materialized.
+
+        Args:
+            rows (Iterable[Sequence[str]]): Rows to add, each with one text per column.
+            columns (Union[ColumnSpec, AutoColumns]): Layout of the columns, or
+                bounds of a layout fitted to the header and the first rows.
+            chunk_size (int, optional): Number of rows pulled from the iterator
+                per batch. Defaults to 1000.
+            cell_height (float, optional): Height of one line of a cell.
+                Uses whatever format PDF uses, by default in inches. Defaults to 0.5.
+            header (Sequence[str], optional): Header row repeated at the top of
+                every page the table spans. Defaults to None.
+            header_columns (ColumnSpec, optional): Layout of the header row.
+                Defaults to columns.
+            equal_height (bool, optional): Stretch every cell of a row to the height
+                of its tallest cell, so borders and fills line up. Defaults to False.
+            style (Style, optional): Style of the rows. Defaults to None.
+            header_style (Style, optional): Style of the header row. Defaults to None.
+
+        Raises:
+            ValueError: Chunk size must be at least 1.
+
+        Returns:
+            int: Number of rows added.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1. Currently {chunk_size}")
+
+        rows, columns = self._fitted_columns(rows, columns, header, style, header_style)
+        header_row = self._start_table(
+            columns, cell_height, header, header_columns, equal_height, style, header_style
         )
+        iterator = iter(rows)
+        row_count: int = 0
+        while True:
+            chunk: List[Sequence[str]] = list(islice(iterator, chunk_size))
+            if not chunk:
+                return row_count
+            row_count += self._add_table_rows(
+                chunk, columns, cell_height, header_row, equal_height, style
+            )
 
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width, y_position)
-        self.pdf.multi_cell(
-            w=cell2_width,
-            h=cell_height,
-            txt=cell2_text,
-            align=cell2_align,
-            border=border,
-            ln=0,
-            fill=cell2_fill
+
+    def add_table(
+        self,
+        rows: Iterable[Sequence[str]],
+        columns: Union[ColumnSpec, AutoColumns],
+        cell_height: float = 0.5,
+        header: Optional[Sequence[str]] = None,
+        header_columns: Optional[ColumnSpec] = None,
+        equal_height: bool = False,
+        style: Optional[Style] = None,
+        header_style: Optional[Style] = None
+    ) -> int:
+        """Add a table that breaks pages between rows and repeats its header.
+
+        The height of every row is measured from its wrapped text before it is
+        emitted, so a page break is taken ahead of a row that would not fit
+        instead of splitting its cells across pages. Rows are laid out in a
+        single pass, each row starting below the tallest cell of the previous one.
+
+        Args:
+            rows (Iterable[Sequence[str]]): Rows to add, each with one text per column.
+            columns (Union[ColumnSpec, AutoColumns]): Layout of the columns, or
+                bounds of a layout fitted to the header and the first rows.
+            cell_height (float, optional): Height of one line of a cell.
+                Uses whatever format PDF uses, by default in inches. Defaults to 0.5.
+            header (Sequence[str], optional): Header row repeated at the top of
+                every page the table spans. Defaults to None.
+            header_columns (ColumnSpec, optional): Layout of the header row.
+                Defaults to columns.
+            equal_height (bool, optional): Stretch every cell of a row to the height
+                of its tallest cell, so borders and fills line up. Defaults to False.
+            style (Style, optional): Style of the rows. Defaults to None.
+            header_style (Style, optional): Style of the header row. Defaults to None.
+
+        Raises:
+            ValueError: Row does not have one text per column.
+
+        Returns:
+            int: Number of rows added, not counting headers.
+        """
+        rows, columns = self._fitted_columns(rows, columns, header, style, header_style)
+        header_row = self._start_table(
+            columns, cell_height, header, header_columns, equal_height, style, header_style
+        )
+        return self._add_table_rows(
+            rows, columns, cell_height, header_row, equal_height, style
         )
 
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width + cell2_width, y_position)
-        self.pdf.multi_cell(
-            w=cell3_width,
-            h=cell_height,
-            txt=cell3_text,
-            align=cell3_align,
-            border=border,
-            ln=0,
-            fill=cell3_fill
+
+    def add_dataframe(
+        self,
+        data: Any,
+        columns: Optional[Sequence[Any]] = None,
+        formats: Optional[Dict[Any, Format]] = None,
+        rows: Any = None,
+        column_spec: Optional[Union[ColumnSpec, AutoColumns]] = None,
+        header: bool = True,
+        cell_height: float = 0.5,
+        na_rep: str = "",
+        equal_height: bool = False,
+        style: Optional[Style] = None,
+        header_style: Optional[Style] = None
+    ) -> int:
+        """Add a pandas DataFrame, Arrow table or NumPy array as a table.
+
+        Columns and rows are selected before any cell text is built, and each
+        column is formatted in one vectorized operation. pandas, pyarrow and
+        numpy are only imported when such a table is passed in.
+
+        Args:
+            data (Any): pandas DataFrame, pyarrow Table or RecordBatch, 2-D NumPy
+                array, or mapping of column name to NumPy/Arrow array.
+            columns (Sequence[Any], optional): Columns to add, in order.
+                Defaults to every column.
+            formats (Dict[Any, Format], optional): Per column format. A string is
+                a strftime pattern for date and time columns and a printf style
+                pattern (e.g. "%.2f") otherwise. A callable receives the whole
+                column and returns its texts. Defaults to None.
+            rows (Any, optional): Positional row selection: slice, sequence of
+                positions or boolean mask. Defaults to every row.
+            column_spec (Union[ColumnSpec, AutoColumns], optional): Layout of the
+                columns, or bounds of a layout fitted to the formatted texts.
+                Defaults to equal widths.
+            header (bool, optional): Repeat the column names as a header row on
+                every page. Defaults to True.
+            cell_height (float, optional): Height of one line of a cell.
+                Uses whatever format PDF uses, by default in inches. Defaults to 0.5.
+            na_rep (str, optional): Text of missing values. Defaults to "".
+            equal_height (bool, optional): Stretch every cell of a row to the height
+                of its tallest cell. Defaults to False.
+            style (Style, optional): Style of the rows. Defaults to None.
+            header_style (Style, optional): Style of the header row. Defaults to None.
+
+        Raises:
+            ValueError: No column is selected.
+
+        Returns:
+            int: Number of rows added, not counting headers.
+        """
+        names, texts = table_columns(data, columns, rows, formats, na_rep)
+        if not names:
+            raise ValueError("Table needs at least one column to add.")
+        if column_spec is None:
+            column_spec = ColumnSpec([1 / len(names)] * len(names))
+        return self.add_table(
+            zip(*texts),
+            column_spec,
+            cell_height=cell_height,
+            header=names if header else None,
+            equal_height=equal_height,
+            style=style,
+            header_style=header_style
         )
 
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width +
-                cell2_width + cell3_width, y_position)
-        self.pdf.multi_cell(
-            w=cell4_width,
-            h=cell_height,
-            txt=cell4_text,
-            align=cell4_align,
-            border=border,
-            ln=0,
-            fill=cell4_fill
+
+    def add_columnar_table(
+        self,
+        table: ColumnarTable,
+        cell_height: float = 0.5,
+        header: bool = True,
+        equal_height: bool = False
+    ) -> int:
+        """Add a ColumnarTable, decoding the texts of one row at a time from its
+        columns, with its layout and styles.
+
+        Args:
+            table (ColumnarTable): Table to add.
+            cell_height (float, optional): Height of one line of a cell.
+                Uses whatever format PDF uses, by default in inches. Defaults to 0.5.
+            header (bool, optional): Repeat the column names as a header row on
+                every page, when the table has names. Defaults to True.
+            equal_height (bool, optional): Stretch every cell of a row to the height
+                of its tallest cell. Defaults to False.
+
+        Returns:
+            int: Number of rows added, not counting headers.
+        """
+        return self.add_table(
+            table.texts(),
+            table.columns,
+            cell_height=cell_height,
+            header=table.names if header else None,
+            equal_height=equal_height,
+            style=table.style,
+            header_style=table.header_style
         )
 
-        self.pdf.set_xy(self.pdf.l_margin + cell1_width + cell2_width +
-                cell3_width + cell4_width, y_position)
-        self.pdf.multi_cell(
-            w=cell5_width,
-            h=cell_height,
-            txt=cell5_text,
-            align=cell5_align,
-            border=border,
-            ln=new_line,
-            fill=cell5_fill
+
+    def fit_columns(
+        self,
+        rows: Iterable[Sequence[str]],
+        auto: AutoColumns,
+        header: Optional[Sequence[str]] = None,
+        style: Optional[Style] = None,
+        header_style: Optional[Style] = None
+    ) -> ColumnSpec:
+        """Fits a column layout to the texts of a table in one pass over them.
+
+        Each distinct text of a column is measured once, with the text cache's
+        font metrics, in the font the rows and header are rendered with.
+
+        Args:
+            rows (Iterable[Sequence[str]]): Rows to measure, each with one text per column.
+            auto (AutoColumns): Width bounds and cell settings of the layout.
+            header (Sequence[str], optional): Header row to measure. Defaults to None.
+            style (Style, optional): Style of the rows. Defaults to None.
+            header_style (Style, optional): Style of the header row. Defaults to None.
+
+        Raises:
+            ValueError: No header or rows to fit the layout to, or rows do not
+                all have the same number of cells.
+
+        Returns:
+            ColumnSpec: Fitted layout.
+        """
+        rows = list(rows)
+        reference: Sequence[str] = header if header is not None else rows[0] if rows else ()
+        count: int = len(reference)
+        if not count:
+            raise ValueError("Auto columns need a header or at least one row to fit.")
+        for row in rows:
+            if len(row) != count:
+                raise ValueError(
+                    f"Row has {len(row)} cells but "
+                    f"{'header' if header is not None else 'first row'} has {count} cells."
+                    )
+        columns: List[Tuple[str, ...]] = list(zip(*rows)) or [()] * count
+
+        pdf = self.pdf
+        string_width = partial(self.text_cache.string_width, pdf)
+
+        def text_width(text: str) -> float:
+            if "\n" in text:
+                return max(map(string_width, text.split("\n")))
+            return string_width(text)
+
+        self._apply_style(style)
+        widths: List[float] = [max(map(text_width, set(column)), default=0) for column in columns]
+        if header is not None:
+            self._apply_style(header_style)
+            widths = [max(width, text_width(text)) for width, text in zip(widths, header)]
+        padding: float = 2 * pdf.c_margin
+        return auto.fit([width + padding for width in widths])
+
+
+    def _fitted_columns(
+        self,
+        rows: Iterable[Sequence[str]],
+        columns: Union[ColumnSpec, AutoColumns],
+        header: Optional[Sequence[str]],
+        style: Optional[Style],
+        header_style: Optional[Style]
+    ) -> Tuple[Iterable[Sequence[str]], ColumnSpec]:
+        """Fits AutoColumns to the header and leading rows of a table.
+
+        Returns:
+            Tuple[Iterable[Sequence[str]], ColumnSpec]: Every row, including the
+                ones read to fit the layout, and the layout of the table.
+        """
+        if isinstance(columns, ColumnSpec):
+            return rows, columns
+        iterator = iter(rows)
+        sample: List[Sequence[str]] = list(
+            iterator if columns.sample is None else islice(iterator, columns.sample)
+        )
+        column_spec = self.fit_columns(sample, columns, header, style, header_style)
+        return chain(sample, iterator), column_spec
+
+
+    def _start_table(
+        self,
+        columns: ColumnSpec,
+        cell_height: float,
+        header: Optional[Sequence[str]],
+        header_columns: Optional[ColumnSpec],
+        equal_height: bool,
+        style: Optional[Style] = None,
+        header_style: Optional[Style] = None
+    ) -> Optional[_HeaderRow]:
+        """Validates and measures the header and emits it at the start of a table."""
+        if header is None:
+            return None
+        header_columns = header_columns or columns
+        if len(header) != header_columns.columns:
+            raise ValueError(
+                f"Header has {len(header)} cells but column spec has "
+                f"{header_columns.columns} columns."
+                )
+        self._apply_style(header_style)
+        header_cells, header_fill = styled_cells(header_columns, header_style)
+        header_row = _HeaderRow(
+            header,
+            header_cells,
+            header_fill,
+            header_style,
+            self._row_height(header, header_cells, cell_height)
+        )
+        self._add_table_rows(
+            (), columns, cell_height, header_row, equal_height, style, start=True
+        )
+        return header_row
+
+
+    def _add_table_rows(
+        self,
+        rows: Iterable[Sequence[str]],
+        columns: ColumnSpec,
+        cell_height: float,
+        header_row: Optional[_HeaderRow],
+        equal_height: bool = False,
+        style: Optional[Style] = None,
+        start: bool = False
+    ) -> int:
+        """Lays out table rows, breaking pages ahead of rows that do not fit.
+
+        Args:
+            rows (Iterable[Sequence[str]]): Rows to add.
+            columns (ColumnSpec): Layout of the columns.
+            cell_height (float): Height of one line of a cell.
+            header_row (Optional[_HeaderRow]): Measured header repeated on new pages.
+            equal_height (bool, optional): Stretch every cell of a row to the height
+                of its tallest cell. Defaults to False.
+            style (Style, optional): Style of the rows. Defaults to None.
+            start (bool, optional): Emit the header before the rows. Defaults to False.
+
+        Returns:
+            int: Number of rows added.
+        """
+        pdf = self.pdf
+        cells, fill_color = styled_cells(columns, style)
+        column_count: int = columns.columns
+        row_height = self._row_height
+        render_row = self._render_row
+        set_xy = pdf.set_xy
+        t_margin: float = pdf.t_margin
+
+        def emit_header() -> None:
+            self._apply_style(header_row.style)
+            self._use_fill(header_row.fill_color)
+            y_position: float = pdf.y
+            render_row(header_row.texts, header_row.cells, cell_height, 1,
+                header_row.height if equal_height else None)
+            set_xy(pdf.l_margin, y_position + header_row.height)
+            self._apply_style(style)
+            self._use_fill(fill_color)
+
+        if header_row is not None and start:
+            if pdf.will_page_break(header_row.height):
+                pdf.add_page(same=True)
+            emit_header()
+        else:
+            self._apply_style(style)
+            self._use_fill(fill_color)
+
+        row_count: int = 0
+        for row in rows:
+            if len(row) != column_count:
+                raise ValueError(
+                    f"Row has {len(row)} cells but column spec has {column_count} columns."
+                    )
+            height: float = row_height(row, cells, cell_height)
+            # Rows taller than a page can not be kept together, let fpdf split them.
+            if pdf.y + height > pdf.page_break_trigger and pdf.y > t_margin:
+                pdf.add_page(same=True)
+                if header_row is not None:
+                    emit_header()
+            y_position: float = pdf.y
+            render_row(row, cells, cell_height, 1, height if equal_height else None)
+            set_xy(pdf.l_margin, y_position + height)
+            row_count += 1
+        return row_count
+
+
+    def _row_height(
+        self,
+        texts: Sequence[str],
+        cells: Sequence[Tuple[float, float, str, Union[int, str], bool]],
+        cell_height: float
+    ) -> float:
+        """Height of the tallest cell of a row once its text is wrapped.
+
+        Args:
+            texts (Sequence[str]): Text of each cell.
+            cells (Sequence[Tuple[float, float, str, Union[int, str], bool]]): Resolved
+                x offset, width, align, border and fill of each cell.
+            cell_height (float): Height of one line of a cell.
+
+        Returns:
+            float: Height of the row.
+        """
+        pdf = self.pdf
+        text_cache = self.text_cache
+        lines: int = 1
+        for text, cell in zip(texts, cells):
+            if text and not text_cache.fits_one_line(pdf, text, cell[1]):
+                lines = max(lines, len(text_cache.split_lines(pdf, text, cell[1])))
+        return lines * cell_height
+
+
+    def _render_row(
+        self,
+        texts: Sequence[str],
+        cells: Sequence[Tuple[float, float, str, Union[int, str], bool]],
+        cell_height: float,
+        new_line: int,
+        row_height: Optional[float] = None
+    ) -> None:
+        """Emits one row of cells starting at the current y position.
+
+        Args:
+            texts (Sequence[str]): Text of each cell.
+            cells (Sequence[Tuple[float, float, str, Union[int, str], bool]]): Resolved
+                x offset, width, align, border and fill of each cell.
+            cell_height (float): Height of cell, or of one line of a wrapped cell.
+            new_line (int): 1 to move to a new line after the final cell, otherwise 0.
+            row_height (Optional[float], optional): Measured height of the row.
+                When given, every cell is stretched to it so borders and fills
+                line up. Defaults to None.
+        """
+        pdf = self.pdf
+        set_xy = pdf.set_xy
+        cell = pdf.cell
+        multi_cell = pdf.multi_cell
+        text_cache = self.text_cache
+        l_margin: float = pdf.l_margin
+        y_position: float = pdf.y
+        last: int = len(cells) - 1
+
+        for index, (x_offset, width, align, border, fill) in enumerate(cells):
+            text: str = texts[index]
+            new_x = XPos.LMARGIN if index == last and new_line else XPos.RIGHT
+            set_xy(l_margin + x_offset, y_position)
+            # Text known to fit on one line skips fpdf's line breaking entirely.
+            if text and align != "J" and text_cache.fits_one_line(pdf, text, width):
+                cell(w=width, h=row_height or cell_height, txt=text, align=align,
+                    border="LTRB" if border == 1 else border or "",
+                    fill=fill, new_x=new_x, new_y=YPos.NEXT)
+            elif row_height and (
+                len(text_cache.split_lines(pdf, text, width)) * cell_height
+                < row_height - 1e-9
+            ):
+                # Lines keep their height, the last one stretches to the row height.
+                multi_cell(w=width, h=row_height, txt=text, align=align,
+                    border=border, fill=fill, new_x=new_x, new_y=YPos.NEXT,
+                    max_line_height=cell_height)
+            else:
+                multi_cell(w=width, h=cell_height, txt=text, align=align,
+                    border=border, fill=fill, new_x=new_x, new_y=YPos.NEXT)
+
+
+    @contextmanager
+    def record_form(
+        self,
+        name: str
+    ) -> Iterator[None]:
+        """Records the rows added inside the with block as a reusable form.
+
+        The rows are rendered once into a PDF form XObject, which is drawn on
+        the current page and can then be stamped onto other pages by reference
+        with stamp_form or repeat_form. The block must fit on the current page.
+
+        Args:
+            name (str): Name to stamp the form by.
+
+        Raises:
+            ValueError: Name is already recorded, no page has been added, or the
+                recorded rows triggered a page break.
+        """
+        pdf = self.pdf
+        if name in self._forms:
+            raise ValueError(f"Form {name} has already been recorded.")
+        if not pdf.page:
+            raise ValueError("Add a page before recording a form.")
+
+        page: int = pdf.page
+        contents: bytearray = pdf.pages[page].contents
+        start: int = len(contents)
+        top: float = pdf.y
+        font = (pdf.font_family, pdf.font_style, pdf.font_size_pt)
+        colors = (pdf.draw_color, pdf.fill_color, pdf.text_color)
+        # Start the form from the current graphics state so it renders the same
+        # wherever it is stamped.
+        prologue: bytes = (
+            f"{pdf.line_width * pdf.k:.2f} w\n"
+            f"BT /F{pdf.current_font['i']} {pdf.font_size_pt:.2f} Tf ET\n"
+            f"{pdf.draw_color.serialize().upper()}\n"
+            f"{pdf.fill_color.serialize().lower()}\n"
+        ).encode("latin1")
+
+        yield
+
+        if pdf.page != page:
+            raise ValueError(f"Form {name} does not fit on one page.")
+        self._forms[name] = StaticForm(
+            f"Frm{len(self._forms) + 1}",
+            prologue + bytes(contents[start:]),
+            top,
+            pdf.y - top
+        )
+        del contents[start:]
+        # The stamp wraps the form in q/Q, so the page is back in the state
+        # it had before recording.
+        pdf.set_font(*font)
+        pdf.draw_color, pdf.fill_color, pdf.text_color = colors
+        pdf.y = top
+        self.stamp_form(name)
+
+
+    def stamp_form(
+        self,
+        name: str
+    ) -> None:
+        """Draws a recorded form at the current y position.
+
+        Args:
+            name (str): Name the form was recorded under.
+
+        Raises:
+            ValueError: No form has been recorded under name.
+        """
+        form = self._forms.get(name)
+        if form is None:
+            raise ValueError(f"No form recorded as {name}.")
+
+        pdf = self.pdf
+        if pdf.will_page_break(form.height):
+            pdf.add_page(same=True)
+        pdf._out(  # pylint: disable=protected-access
+            f"q 1 0 0 1 0 {(form.top - pdf.y) * pdf.k:.2f} cm /{form.name} Do Q"
+        )
+        pdf.set_xy(pdf.l_margin, pdf.y + form.height)
+
+
+    def repeat_form(
+        self,
+        name: Optional[str]
+    ) -> None:
+        """Stamps a recorded form at the top of every page added from now on,
+        including pages added by automatic page breaks.
+
+        Args:
+            name (Optional[str]): Name the form was recorded under. None stops repeating.
+
+        Raises:
+            ValueError: No form has been recorded under name.
+        """
+        if name is not None and name not in self._forms:
+            raise ValueError(f"No form recorded as {name}.")
+        self._repeated_form = name
+        self.pdf.header = self._stamp_repeated_form
+
+
+    def _stamp_repeated_form(self) -> None:
+        """Header hook of the FPDF object stamping the repeated form."""
+        if self._repeated_form is not None:
+            self.stamp_form(self._repeated_form)
+
+
+    def _output(
+        self,
+        name: Union[str, BinaryIO] = ""
+    ) -> Optional[bytearray]:
+        """Serializes the PDF object, including recorded forms and spilled pages.
+
+        Raises:
+            ValueError: Document with spilled pages has already been exported.
+        """
+        producer = partial(
+            EzOutputProducer,
+            forms=self._forms.values(),
+            compression_level=self._compression_level,
+            object_streams=self._object_streams
         )
+        if self._spill is None:
+            return self.pdf.output(name, output_producer_class=producer)
+
+        if self.pdf.buffer:
+            raise ValueError("A document with spilled pages can only be exported once.")
+        producer = partial(producer, spill=self._spill)
+        try:
+            if isinstance(name, str) and name:
+                with open(name, "wb") as stream:
+                    self.pdf.output(output_producer_class=partial(producer, stream=stream))
+                return None
+            if name:
+                self.pdf.output(output_producer_class=partial(producer, stream=name))
+                return None
+            import tempfile  # pylint: disable=import-outside-toplevel
+            with tempfile.TemporaryFile() as stream:
+                self.pdf.output(output_producer_class=partial(producer, stream=stream))
+                stream.seek(0)
+                return bytearray(stream.read())
+        finally:
+            self._spill.close()
+
+
+    def spill_pages(
+        self,
+        directory: Optional[str] = None
+    ) -> None:
+        """Moves the contents of every completed page to a temporary file, so
+        only the current page stays in memory however long the document gets.
+
+        On export the document is written straight to the file or stream
+        instead of being assembled in memory; export_bytes still returns the
+        whole file. A document with spilled pages can only be exported once,
+        and object streams are not used for it.
+
+        Args:
+            directory (str, optional): Directory of the spill file. Defaults to
+                the system temporary directory.
+        """
+        if self._spill is not None:
+            return
+        self._spill = PageSpill(directory)
+        pdf = self.pdf
+        for index in range(1, pdf.page):
+            self._spill.spill(pdf.pages[index])
+        pdf.footer = self._spill_page
+
+
+    def _spill_page(self) -> None:
+        """Footer hook of the FPDF object spilling the page being completed."""
+        pdf = self.pdf
+        # Dry runs of multi_cell break pages with writing disabled, then roll back
+        if "_out" in vars(pdf):
+            return
+        self._spill.spill(pdf.pages[pdf.page])
+
+
+    def set_compression(
+        self,
+        compress: bool = True,
+        level: int = -1,
+        object_streams: bool = False
+    ) -> None:
+        """Sets how the PDF object is compressed on export.
+
+        Level 1 is several times faster than the zlib default for a somewhat
+        larger file. Object streams shrink the cross-reference data of
+        documents with many objects. Level 9 is several times slower than the
+        default and, on table content, does not make files smaller.
+
+        Args:
+            compress (bool, optional): Deflate page content streams. Defaults to True.
+            level (int, optional): zlib level of the deflated streams, 0 (fastest)
+                to 9 (most effort), -1 for the zlib default. Defaults to -1.
+            object_streams (bool, optional): Pack object dictionaries into
+                compressed object streams with a cross-reference stream (PDF 1.5).
+                Ignored for encrypted or signed documents. Defaults to False.
+
+        Raises:
+            ValueError: Level must be between -1 and 9.
+        """
+        if not -1 <= level <= 9:
+            raise ValueError(f"Compression level must be between -1 and 9. Currently {level}")
+        self.pdf.set_compression(compress)
+        self._compression_level = level
+        self._object_streams = object_streams
 
 
     def export(
@@ -698,4 +1772,61 @@ class EzPDF:
         Args:
             filename (str): Name of file to export to.
         """
-        self.pdf.output(filename)
+        self._output(filename)
+
+
+    def export_bytes(self) -> memoryview:
+        """Exports PDF object to memory.
+
+        The returned view wraps the buffer FPDF serialized the document into,
+        so no copy of the PDF is made. Use bytes() on it if a copy is needed.
+
+        Returns:
+            memoryview: Contents of the PDF file.
+        """
+        return memoryview(self._output())
+
+
+    def export_to(
+        self,
+        stream: BinaryIO
+    ) -> None:
+        """Exports PDF object to a binary stream, such as an HTTP response body.
+
+        Args:
+            stream (BinaryIO): Writable binary stream to export to.
+        """
+        self._output(stream)
+
+
+    def instrument(
+        self,
+        hooks: Sequence["Hook"] = (),
+        allocations: bool = False,
+        fpdf_methods: Optional[Sequence[str]] = None
+    ) -> "Instrumentation":
+        """Starts recording call counts, wall time and allocations of the public
+        methods of this document and of the underlying FPDF calls.
+
+        Documents that are never instrumented run unwrapped methods. Use the
+        result as a context manager, or call its detach method, to stop.
+
+        Args:
+            hooks (Sequence[Hook], optional): Callables receiving a CallEvent
+                after every instrumented call. Defaults to ().
+            allocations (bool, optional): Track net allocated bytes with
+                tracemalloc, which slows every call down. Defaults to False.
+            fpdf_methods (Sequence[str], optional): Methods of the underlying
+                FPDF object to instrument. Defaults to FPDF_METHODS.
+
+        Returns:
+            Instrumentation: Attached instrumentation holding the totals.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .instrumentation import FPDF_METHODS, Instrumentation
+        return Instrumentation(
+            self,
+            hooks=hooks,
+            allocations=allocations,
+            fpdf_methods=FPDF_METHODS if fpdf_methods is None else fpdf_methods
+        ).attach()
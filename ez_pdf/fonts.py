@@ -0,0 +1,226 @@
+"""
+    Process-wide registry of TrueType fonts, parsed once and shared by every EzPDF
+
+    Fonts registered before worker processes are forked are shared with them
+    copy-on-write, and font files are memory mapped so every process reads
+    them from the same page cache. Nothing is pickled.
+"""
+import copy
+import mmap
+import threading
+import warnings
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Tuple
+from fontTools import subset as ftsubset
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.fpdf import SubsetMap
+
+# Tables fpdf drops from embedded subsets
+DROP_TABLES: Tuple[str, ...] = ("FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx")
+
+
+class FontSubset(NamedTuple):
+    """Subset of a font holding a set of glyphs.
+
+    Attributes:
+        font_file (bytes): TrueType file of the subset.
+        glyph_ids (Dict[str, int]): Glyph ID in the subset of each glyph name.
+    """
+    font_file: bytes
+    glyph_ids: Dict[str, int]
+
+
+class _RegisteredFont(NamedTuple):
+    """Parsed font shared by every document."""
+    font: dict
+    cmap: Dict[int, str]
+    data: mmap.mmap
+
+
+class FontRegistry:
+    """TrueType fonts parsed once per process, with an LRU cache of their
+    subsets keyed on the set of glyphs a document uses."""
+    def __init__(self, subset_cache_size: int = 64):
+        """Creates an empty registry.
+
+        Args:
+            subset_cache_size (int, optional): Maximum number of font subsets
+                kept. Defaults to 64.
+        """
+        self.subset_cache_size: int = subset_cache_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._fonts: Dict[str, _RegisteredFont] = {}
+        self._names: Dict[Tuple[str, str, str], str] = {}
+        self._subsets: "OrderedDict[Tuple[str, FrozenSet[str]], FontSubset]" = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def __contains__(self, fontkey: str) -> bool:
+        return fontkey in self._fonts
+
+
+    def register(
+        self,
+        family: str,
+        fname: str,
+        style: str = ""
+    ) -> str:
+        """Parses a TrueType or OpenType font file, unless it is already registered.
+
+        Args:
+            family (str): Name to set the font by.
+            fname (str): Path of the font file, or name of a file in FPDF_FONT_DIR.
+            style (str, optional): "", "B", "I" or "BI". Defaults to "".
+
+        Raises:
+            ValueError: Family and style are registered to another file or name a core font.
+
+        Returns:
+            str: Key of the font, family in lower case followed by the style.
+        """
+        fontkey = self._names.get((family, style, str(fname)))
+        if fontkey is not None:
+            return fontkey
+        scratch = FPDF()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            scratch.add_font(family, style, fname)
+        if not scratch.fonts:
+            raise ValueError(f"{family} {style} is a core font and can not be registered.")
+        fontkey, font = next(iter(scratch.fonts.items()))
+        font["ttffile"] = Path(font["ttffile"]).resolve()
+
+        with self._lock:
+            registered = self._fonts.get(fontkey)
+            if registered is not None:
+                if registered.font["ttffile"] != font["ttffile"]:
+                    raise ValueError(
+                        f"Font {fontkey} is already registered to {registered.font['ttffile']}."
+                        )
+            else:
+                with open(font["ttffile"], "rb") as file:
+                    data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                cmap: Dict[int, str] = ttLib.TTFont(data, fontNumber=0, lazy=True).getBestCmap()
+                self._fonts[fontkey] = _RegisteredFont(font, cmap, data)
+            self._names[(family, style, str(fname))] = fontkey
+        return fontkey
+
+
+    def install(
+        self,
+        pdf: FPDF,
+        fontkey: str
+    ) -> None:
+        """Makes a registered font available to set_font of a document.
+
+        The character widths and glyph map are shared, only the set of
+        characters used is per document.
+
+        Args:
+            pdf (FPDF): Document to add the font to.
+            fontkey (str): Key returned by register.
+
+        Raises:
+            ValueError: Font has not been registered.
+        """
+        registered = self._fonts.get(fontkey)
+        if registered is None:
+            raise ValueError(f"Font {fontkey} has not been registered.")
+        if fontkey in pdf.fonts:
+            return
+        font = dict(registered.font)
+        reserved = "\x00 "
+        if pdf.str_alias_nb_pages:
+            reserved += "0123456789" + pdf.str_alias_nb_pages
+        font["i"] = len(pdf.fonts) + 1
+        font["desc"] = copy.copy(registered.font["desc"])
+        font["subset"] = SubsetMap(map(ord, reserved))
+        font["registry"] = self
+        pdf.fonts[fontkey] = font
+
+
+    def glyph_names(
+        self,
+        fontkey: str
+    ) -> Dict[int, str]:
+        """Glyph name of each unicode character of a registered font."""
+        return self._fonts[fontkey].cmap
+
+
+    def subset(
+        self,
+        fontkey: str,
+        glyph_names: Iterable[str]
+    ) -> FontSubset:
+        """Subset of a registered font holding glyph_names, made the way fpdf makes it.
+
+        Args:
+            fontkey (str): Key returned by register.
+            glyph_names (Iterable[str]): Glyphs used by a document.
+
+        Returns:
+            FontSubset: Font file of the subset and its glyph IDs.
+        """
+        key = (fontkey, frozenset(glyph_names))
+        with self._lock:
+            subset = self._subsets.get(key)
+            if subset is not None:
+                self.hits += 1
+                self._subsets.move_to_end(key)
+                return subset
+            self.misses += 1
+
+            # The mapped file is shared, so reads stay under the lock
+            font = ttLib.TTFont(
+                self._fonts[fontkey].data, recalcTimestamp=False, fontNumber=0, lazy=True
+            )
+            options = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+            options.drop_tables += list(DROP_TABLES)
+            subsetter = ftsubset.Subsetter(options)
+            subsetter.populate(glyphs=sorted(key[1]))
+            subsetter.subset(font)
+            output = BytesIO()
+            font.save(output)
+            subset = FontSubset(
+                output.getvalue(),
+                {name: glyph_id for glyph_id, name in enumerate(font.getGlyphOrder())}
+            )
+
+            if self.subset_cache_size:
+                self._subsets[key] = subset
+                if len(self._subsets) > self.subset_cache_size:
+                    self._subsets.popitem(last=False)
+            return subset
+
+
+    def clear_subsets(self) -> None:
+        """Removes every cached subset and resets the counters."""
+        with self._lock:
+            self._subsets.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+FONT_REGISTRY = FontRegistry()
+
+
+def register_font(
+    family: str,
+    fname: str,
+    style: str = ""
+) -> str:
+    """Parses a font once for the whole process, e.g. at worker startup.
+
+    Args:
+        family (str): Name to set the font by.
+        fname (str): Path of the TrueType or OpenType font file.
+        style (str, optional): "", "B", "I" or "BI". Defaults to "".
+
+    Returns:
+        str: Key of the font.
+    """
+    return FONT_REGISTRY.register(family, fname, style)
@@ -0,0 +1,47 @@
+"""
+    Reusable PDF form XObjects for content repeated on many pages
+"""
+import zlib
+from typing import NamedTuple, Optional
+from fpdf.syntax import Name, PDFContentStream
+
+
+class StaticForm(NamedTuple):
+    """Content recorded once and stamped onto pages by reference.
+
+    Attributes:
+        name (str): Resource name of the form XObject.
+        contents (bytes): Content stream operators of the form.
+        top (float): Y position the content was recorded at.
+        height (float): Height of the content.
+    """
+    name: str
+    contents: bytes
+    top: float
+    height: float
+
+
+class PDFStream(PDFContentStream):
+    """Content stream deflated at a chosen zlib level, or left uncompressed."""
+    def __init__(self, contents: bytes, compression_level: Optional[int] = -1):
+        if compression_level is None:
+            super().__init__(contents=contents)
+        else:
+            super().__init__(contents=zlib.compress(contents, compression_level))
+            self.filter = Name("FlateDecode")
+
+
+class PDFFormXObject(PDFStream):
+    """Form XObject sharing the resources of the document pages."""
+    def __init__(
+        self,
+        contents: bytes,
+        width_pt: float,
+        height_pt: float,
+        compression_level: Optional[int] = -1
+    ):
+        super().__init__(contents, compression_level)
+        self.type = Name("XObject")
+        self.subtype = Name("Form")
+        self.b_box = f"[0 0 {width_pt:.2f} {height_pt:.2f}]"
+        self.resources = None  # must always be set before calling .serialize()
@@ -0,0 +1,262 @@
+"""
+    Column-wise text formatting of pandas, Arrow and NumPy tables
+
+    pandas, pyarrow and numpy are optional, each is only imported when a
+    table of its kind is passed in.
+"""
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple, Union
+
+Format = Union[str, Callable[[Any], Sequence[str]]]
+
+
+def table_columns(
+    data: Any,
+    columns: Optional[Sequence[Any]] = None,
+    rows: Any = None,
+    formats: Optional[Mapping[Any, Format]] = None,
+    na_rep: str = ""
+) -> Tuple[List[str], List[List[str]]]:
+    """Selects and formats the cells of a table, one column at a time.
+
+    Column and row selection are applied to the table before any text is built.
+
+    Args:
+        data (Any): pandas DataFrame, pyarrow Table or RecordBatch, 2-D NumPy
+            array, or mapping of column name to NumPy/Arrow array.
+        columns (Sequence[Any], optional): Columns to keep, in order. Positions
+            for 2-D NumPy arrays. Defaults to every column.
+        rows (Any, optional): Positional row selection: slice, sequence of
+            positions or boolean mask. Defaults to every row.
+        formats (Mapping[Any, Format], optional): Per column format. A string is
+            a strftime pattern for date and time columns and a printf style
+            pattern (e.g. "%.2f") otherwise. A callable receives the whole
+            column and returns its texts. Defaults to str of each value.
+        na_rep (str, optional): Text of missing values. Defaults to "".
+
+    Raises:
+        TypeError: Unsupported table type.
+
+    Returns:
+        Tuple[List[str], List[List[str]]]: Column names and the texts of each column.
+    """
+    formats = formats or {}
+    module: str = type(data).__module__.split(".")[0]
+
+    if module == "pandas":
+        if columns is not None:
+            data = data[list(columns)]
+        if rows is not None:
+            data = data.iloc[rows]
+        return (
+            [str(name) for name in data.columns],
+            [
+                _format_pandas(data[name], formats.get(name), na_rep)
+                for name in data.columns
+            ]
+        )
+
+    if module == "pyarrow":
+        if columns is not None:
+            data = data.select(list(columns))
+        if rows is not None:
+            data = _select_arrow_rows(data, rows)
+        return (
+            list(data.schema.names),
+            [
+                _format_arrow(data.column(name), formats.get(name), na_rep)
+                for name in data.schema.names
+            ]
+        )
+
+    if module == "numpy":
+        if data.ndim != 2:
+            raise TypeError(f"NumPy tables must be 2-D. Currently {data.ndim}-D")
+        names = list(range(data.shape[1])) if columns is None else list(columns)
+        if rows is not None:
+            data = data[rows]
+        return (
+            [str(name) for name in names],
+            [_format_numpy(data[:, name], formats.get(name), na_rep) for name in names]
+        )
+
+    if isinstance(data, Mapping):
+        names = list(data) if columns is None else list(columns)
+        texts: List[List[str]] = []
+        for name in names:
+            values = data[name]
+            if type(values).__module__.split(".")[0] == "pyarrow":
+                if rows is not None:
+                    values = _select_arrow_rows(values, rows)
+                texts.append(_format_arrow(values, formats.get(name), na_rep))
+            else:
+                import numpy  # pylint: disable=import-outside-toplevel
+                values = numpy.asarray(values)
+                if rows is not None:
+                    values = values[rows]
+                texts.append(_format_numpy(values, formats.get(name), na_rep))
+        return [str(name) for name in names], texts
+
+    raise TypeError(f"Unsupported table type {type(data).__name__}")
+
+
+def _format_pandas(series: Any, column_format: Optional[Format], na_rep: str) -> List[str]:
+    """Formats a pandas Series."""
+    if callable(column_format):
+        return list(column_format(series))
+    if column_format is not None and hasattr(series, "dt"):
+        return series.dt.strftime(column_format).fillna(na_rep).tolist()
+    missing = series.isna().to_numpy()
+    if column_format is not None:
+        return _printf(column_format, series[~missing].to_numpy(), missing, na_rep).tolist()
+    texts = series.astype(str).to_numpy()
+    if missing.any():
+        texts = texts.copy()
+        texts[missing] = na_rep
+    return texts.tolist()
+
+
+def _format_arrow(array: Any, column_format: Optional[Format], na_rep: str) -> List[str]:
+    """Formats a pyarrow Array or ChunkedArray."""
+    # pylint: disable=import-outside-toplevel
+    import pyarrow
+    import pyarrow.compute
+
+    if callable(column_format):
+        return list(column_format(array))
+    kind = array.type
+    if column_format is not None and (
+        pyarrow.types.is_temporal(kind) and not pyarrow.types.is_duration(kind)
+    ):
+        texts = pyarrow.compute.strftime(array, format=column_format)
+    elif pyarrow.types.is_timestamp(kind) and kind.tz is None:
+        # Same text as pandas and NumPy columns of the same values
+        missing = pyarrow.compute.is_null(array).to_numpy(zero_copy_only=False)
+        return _datetime_texts(
+            array.to_numpy(zero_copy_only=False), missing, na_rep
+        ).tolist()
+    elif column_format is not None:
+        # Nulls would turn integer columns into floats holding NaN
+        missing = pyarrow.compute.is_null(array).to_numpy(zero_copy_only=False)
+        present = pyarrow.compute.drop_null(array).to_numpy(zero_copy_only=False)
+        return _printf(column_format, present, missing, na_rep).tolist()
+    else:
+        texts = pyarrow.compute.cast(array, pyarrow.string())
+    return texts.fill_null(na_rep).to_pylist()
+
+
+def _format_numpy(values: Any, column_format: Optional[Format], na_rep: str) -> List[str]:
+    """Formats a 1-D NumPy array."""
+    import numpy  # pylint: disable=import-outside-toplevel
+
+    if callable(column_format):
+        return list(column_format(values))
+    if values.dtype.kind == "M":
+        missing = numpy.isnat(values)
+        if column_format is None:
+            return _datetime_texts(values, missing, na_rep).tolist()
+        texts = numpy.full(len(values), na_rep, dtype=object)
+        texts[~missing] = [
+            _python_datetime(value).strftime(column_format)
+            for value in values[~missing].astype("datetime64[us]").astype(object)
+        ]
+        return texts.tolist()
+    missing = numpy.isnan(values) if values.dtype.kind == "f" else None
+    if column_format is not None:
+        if missing is None:
+            missing = numpy.zeros(len(values), dtype=bool)
+        return _printf(column_format, values[~missing], missing, na_rep).tolist()
+    texts = values.astype(str)
+    if missing is not None and missing.any():
+        texts = texts.astype(object)
+        texts[missing] = na_rep
+    return texts.tolist()
+
+
+def _printf(column_format: str, values: Any, missing: Any, na_rep: str) -> Any:
+    """Applies a printf style pattern to the present values of a column at once.
+
+    Missing values are never formatted, so patterns such as "%d" do not fail
+    on NaN or NA.
+
+    Args:
+        column_format (str): printf style pattern.
+        values (Any): NumPy array of the values that are not missing, in order.
+        missing (Any): NumPy boolean mask of the missing values of the column.
+        na_rep (str): Text of missing values.
+
+    Returns:
+        Any: NumPy array of the texts of the column.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    if not missing.any():
+        return numpy.char.mod(column_format, values)
+    texts = numpy.full(len(missing), na_rep, dtype=object)
+    if len(values):
+        texts[~missing] = numpy.char.mod(column_format, values)
+    return texts
+
+
+def _datetime_texts(values: Any, missing: Any, na_rep: str) -> Any:
+    """Formats a NumPy datetime64 column the way pandas does by default.
+
+    Columns holding only midnights are shown as dates. Otherwise every value
+    is shown with the finest of seconds, milliseconds, microseconds or
+    nanoseconds that any value of the column needs.
+
+    Args:
+        values (Any): NumPy datetime64 array.
+        missing (Any): NumPy boolean mask of the missing values of the column.
+        na_rep (str): Text of missing values.
+
+    Returns:
+        Any: NumPy array of the texts of the column.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    present = values[~missing]
+    if numpy.datetime_data(values.dtype)[0] in ("Y", "M"):
+        unit = numpy.datetime_data(values.dtype)[0]
+    else:
+        unit = next(
+            unit for unit in ("D", "s", "ms", "us", "ns", "ps", "fs", "as")
+            if (present == present.astype(f"datetime64[{unit}]")).all()
+        )
+    texts = numpy.full(len(values), na_rep, dtype=object)
+    if len(present):
+        texts[~missing] = numpy.char.replace(
+            numpy.datetime_as_string(present, unit=unit), "T", " "
+        )
+    return texts
+
+
+def _python_datetime(value: Any) -> Any:
+    """Checks that a datetime64[us] value converted to object is a datetime.datetime.
+
+    Args:
+        value (Any): Result of converting a datetime64[us] value to object.
+
+    Raises:
+        ValueError: The value is outside the years 1 to 9999 of datetime.datetime.
+
+    Returns:
+        Any: The datetime.datetime.
+    """
+    if isinstance(value, int):
+        raise ValueError(
+            "Only dates in the years 1 to 9999 can be formatted with a pattern. "
+            f"Currently {value} microseconds since 1970"
+            )
+    return value
+
+
+def _select_arrow_rows(data: Any, rows: Any) -> Any:
+    """Applies a positional row selection to an Arrow table or array."""
+    if isinstance(rows, slice):
+        start, stop, step = rows.indices(len(data))
+        if step == 1:
+            return data.slice(start, max(stop - start, 0))
+        return data.take(list(range(start, stop, step)))
+    import numpy  # pylint: disable=import-outside-toplevel
+    rows = numpy.asarray(rows)
+    if rows.dtype == bool:
+        return data.filter(rows)
+    return data.take(rows)
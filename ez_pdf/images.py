@@ -0,0 +1,169 @@
+"""
+    Process-wide cache of decoded images, shared by every EzPDF
+
+    Images are decoded and compressed once per process, keyed on the SHA-256
+    of their file, and every document embedding one reuses the result. Images
+    cached before worker processes are forked are shared with them.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+from fpdf import FPDF
+from fpdf.fpdf import ImageInfo
+from fpdf.image_parsing import get_img_info
+
+
+class ImageCacheInfo(NamedTuple):
+    """Hit/miss counters of an ImageCache."""
+    hits: int
+    misses: int
+    max_size: int
+    size: int
+
+
+class ImageCache:
+    """LRU cache of decoded raster images, ready to embed as image XObjects.
+
+    Entries are keyed on the SHA-256 of the image file and FPDF's image
+    filter. The hash of each path is remembered with the size and
+    modification time it was read at, so an unchanged file is only read
+    once; as many paths are remembered as images are kept.
+    """
+    def __init__(self, max_size: int = 64):
+        """Creates an empty cache.
+
+        Args:
+            max_size (int, optional): Maximum number of decoded images, and of
+                file hashes, kept. Defaults to 64.
+
+        Raises:
+            ValueError: Max size can not be negative.
+        """
+        if max_size < 0:
+            raise ValueError(f"Image cache max size can not be negative. Currently {max_size}")
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._images: "OrderedDict[Tuple[str, str], ImageInfo]" = OrderedDict()
+        # Path to the size and modification time its digest was read at
+        self._digests: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def digest(self, path: str) -> str:
+        """SHA-256 of an image file, read again only when the file changed.
+
+        Args:
+            path (str): Path of the image file.
+
+        Returns:
+            str: Hex digest of the file contents.
+        """
+        path = os.fspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._digests.get(path)
+            if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                self._digests.move_to_end(path)
+                return entry[2]
+
+        # Hashed outside the lock, so other threads are not held up by the read
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                file_hash.update(block)
+        digest = file_hash.hexdigest()
+        if self.max_size:
+            with self._lock:
+                self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+                self._digests.move_to_end(path)
+                if len(self._digests) > self.max_size:
+                    self._digests.popitem(last=False)
+        return digest
+
+
+    def decoded(
+        self,
+        path: str,
+        image_filter: str = "AUTO"
+    ) -> Tuple[str, ImageInfo]:
+        """Decoded and compressed image of a file, decoding it on a miss.
+
+        Args:
+            path (str): Path of a PNG, JPEG, GIF, TIFF or other Pillow readable file.
+            image_filter (str, optional): FPDF image filter the data is compressed
+                with. Defaults to "AUTO".
+
+        Returns:
+            Tuple[str, ImageInfo]: File digest and the shared decoded image,
+                which must not be modified.
+        """
+        digest = self.digest(path)
+        key = (digest, image_filter)
+        with self._lock:
+            info = self._images.get(key)
+            if info is not None:
+                self.hits += 1
+                self._images.move_to_end(key)
+                return digest, info
+            self.misses += 1
+        info = ImageInfo(get_img_info(os.fspath(path), None, image_filter))
+        if self.max_size:
+            with self._lock:
+                self._images[key] = info
+                if len(self._images) > self.max_size:
+                    self._images.popitem(last=False)
+        return digest, info
+
+
+    def install(
+        self,
+        pdf: FPDF,
+        path: str
+    ) -> Tuple[str, ImageInfo]:
+        """Adds a cached image to a document, once however often it is drawn.
+
+        Args:
+            pdf (FPDF): Document to add the image to.
+            path (str): Path of the image file.
+
+        Returns:
+            Tuple[str, ImageInfo]: Name to draw the image by with FPDF.image, and
+                the image of the document.
+        """
+        digest, decoded = self.decoded(path, pdf.image_filter)
+        name = f"ezpdf-image-{digest}"
+        info = pdf.images.get(name)
+        if info is not None:
+            return name, info
+
+        # Registered the way FPDF.preload_image does, on a copy sharing the data
+        info = ImageInfo(decoded)
+        info["i"] = len(pdf.images) + 1
+        info["usages"] = 0
+        info["iccp_i"] = None
+        iccp = info.get("iccp")
+        if iccp:
+            info["iccp_i"] = pdf.icc_profiles.setdefault(iccp, len(pdf.icc_profiles))
+            info["iccp"] = None
+        pdf.images[name] = info
+        return name, info
+
+
+    def cache_info(self) -> ImageCacheInfo:
+        """Returns hit/miss counters and the current size of the cache."""
+        return ImageCacheInfo(self.hits, self.misses, self.max_size, len(self._images))
+
+
+    def clear(self) -> None:
+        """Drops every decoded image and file hash, and resets the counters."""
+        with self._lock:
+            self._images.clear()
+            self._digests.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+IMAGE_CACHE = ImageCache()
@@ -0,0 +1,242 @@
+"""
+    Opt-in call counting, timing and allocation tracking of EzPDF documents
+
+    Methods are wrapped on one document instance only while instrumentation is
+    attached, so documents that are not instrumented run the plain methods.
+"""
+import time
+import tracemalloc
+from functools import update_wrapper
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+FPDF_METHODS: Tuple[str, ...] = (
+    "add_page",
+    "cell",
+    "multi_cell",
+    "get_string_width",
+    "set_font",
+    "set_fill_color",
+    "set_draw_color",
+    "set_xy",
+    "set_x",
+    "set_y",
+    "output",
+)
+
+
+class CallEvent(NamedTuple):
+    """One finished call of an instrumented method.
+
+    Attributes:
+        name (str): Qualified method name, e.g. "EzPDF.add_rows" or "FPDF.multi_cell".
+        page (int): Page the call started on, 0 before the first page.
+        seconds (float): Wall time of the call, including nested calls.
+        allocated (int): Net bytes allocated during the call, 0 when allocations
+            are not tracked.
+    """
+    name: str
+    page: int
+    seconds: float
+    allocated: int
+
+
+class CallStats:
+    """Running totals of the calls of one method."""
+    __slots__ = ("calls", "seconds", "allocated")
+
+    def __init__(self):
+        self.calls: int = 0
+        self.seconds: float = 0.0
+        self.allocated: int = 0
+
+
+    def add(self, event: CallEvent) -> None:
+        """Adds a finished call to the totals."""
+        self.calls += 1
+        self.seconds += event.seconds
+        self.allocated += event.allocated
+
+
+    def __repr__(self) -> str:
+        return (
+            f"CallStats(calls={self.calls}, seconds={self.seconds:.6f}, "
+            f"allocated={self.allocated})"
+        )
+
+
+Hook = Callable[[CallEvent], None]
+
+
+class Instrumentation:
+    """Call counts, cumulative wall time and allocations of an EzPDF document,
+    totalled per document and per page.
+
+    Times are inclusive: an EzPDF method's time contains the FPDF calls it
+    makes, and FPDF methods calling each other (multi_cell calls cell) are
+    counted at every level.
+    """
+    def __init__(
+        self,
+        ez_pdf: Any,
+        hooks: Sequence[Hook] = (),
+        allocations: bool = False,
+        fpdf_methods: Sequence[str] = FPDF_METHODS
+    ):
+        """Creates detached instrumentation of a document.
+
+        Args:
+            ez_pdf (EzPDF): Document to instrument.
+            hooks (Sequence[Hook], optional): Callables receiving a CallEvent
+                after every instrumented call. Defaults to ().
+            allocations (bool, optional): Track net allocated bytes with
+                tracemalloc, which slows every call down. Defaults to False.
+            fpdf_methods (Sequence[str], optional): Methods of the underlying
+                FPDF object to instrument. Defaults to FPDF_METHODS.
+        """
+        self.ez_pdf = ez_pdf
+        self.hooks: List[Hook] = list(hooks)
+        self.allocations: bool = allocations
+        self.fpdf_methods: Tuple[str, ...] = tuple(fpdf_methods)
+        self.totals: Dict[str, CallStats] = {}
+        self.pages: Dict[int, Dict[str, CallStats]] = {}
+        self._wrapped: List[Tuple[Any, str]] = []
+        self._started_tracing: bool = False
+
+
+    @property
+    def attached(self) -> bool:
+        """True while the document's methods are instrumented."""
+        return bool(self._wrapped)
+
+
+    def attach(self) -> "Instrumentation":
+        """Wraps every public EzPDF method and the chosen FPDF methods of the document.
+
+        Returns:
+            Instrumentation: self, to allow use as a context manager.
+        """
+        if self.attached:
+            return self
+        ez_pdf = self.ez_pdf
+        for name in dir(type(ez_pdf)):
+            if name.startswith("_") or name == "instrument":
+                continue
+            if callable(getattr(type(ez_pdf), name)):
+                self._wrap(ez_pdf, f"EzPDF.{name}")
+        for name in self.fpdf_methods:
+            self._wrap(ez_pdf.pdf, f"FPDF.{name}")
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+
+    def detach(self) -> None:
+        """Restores the plain methods of the document. Collected totals are kept."""
+        for owner, name in self._wrapped:
+            delattr(owner, name)
+        self._wrapped.clear()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+    def __enter__(self) -> "Instrumentation":
+        return self.attach()
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.detach()
+
+
+    def add_hook(
+        self,
+        hook: Hook
+    ) -> None:
+        """Adds a callable receiving a CallEvent after every instrumented call.
+
+        Args:
+            hook (Hook): Callable forwarding events, e.g. to a metrics system.
+        """
+        self.hooks.append(hook)
+
+
+    def reset(self) -> None:
+        """Clears the collected totals."""
+        self.totals.clear()
+        self.pages.clear()
+
+
+    def _wrap(
+        self,
+        owner: Any,
+        qualified_name: str
+    ) -> None:
+        """Shadows one method of owner with a recording wrapper on the instance."""
+        name: str = qualified_name.split(".", 1)[1]
+        method = getattr(owner, name)
+        fpdf = self.ez_pdf.pdf
+        record = self._record
+        allocations: bool = self.allocations
+        perf_counter = time.perf_counter
+        traced_memory = tracemalloc.get_traced_memory
+
+        def wrapper(*args, **kwargs):
+            page: int = fpdf.page
+            before: int = traced_memory()[0] if allocations else 0
+            start: float = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds: float = perf_counter() - start
+                allocated: int = traced_memory()[0] - before if allocations else 0
+                record(CallEvent(qualified_name, page, seconds, allocated))
+
+        setattr(owner, name, update_wrapper(wrapper, method))
+        self._wrapped.append((owner, name))
+
+
+    def _record(self, event: CallEvent) -> None:
+        """Adds an event to the document and page totals and calls the hooks."""
+        stats = self.totals.get(event.name)
+        if stats is None:
+            stats = self.totals[event.name] = CallStats()
+        stats.add(event)
+
+        page_totals = self.pages.setdefault(event.page, {})
+        stats = page_totals.get(event.name)
+        if stats is None:
+            stats = page_totals[event.name] = CallStats()
+        stats.add(event)
+
+        for hook in self.hooks:
+            hook(event)
+
+
+    def summary(
+        self,
+        page: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> str:
+        """Formats the totals as a table sorted by cumulative time.
+
+        Args:
+            page (int, optional): Page to report on. Defaults to the whole document.
+            limit (int, optional): Maximum number of methods listed. Defaults to all.
+
+        Returns:
+            str: Report with one line per method.
+        """
+        totals = self.totals if page is None else self.pages.get(page, {})
+        ranked = sorted(totals.items(), key=lambda item: item[1].seconds, reverse=True)
+        lines: List[str] = [
+            f"{'page ' + str(page) if page is not None else 'document'}, "
+            f"{len(self.pages)} page(s) instrumented, times include nested calls",
+            f"{'method':<28} {'calls':>9} {'total ms':>11} {'us/call':>10} {'alloc KiB':>10}",
+        ]
+        for name, stats in ranked[:limit]:
+            lines.append(
+                f"{name:<28} {stats.calls:>9} {stats.seconds * 1000:>11.2f} "
+                f"{stats.seconds / stats.calls * 1e6:>10.1f} {stats.allocated / 1024:>10.1f}"
+            )
+        return "\n".join(lines)
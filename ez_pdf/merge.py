@@ -0,0 +1,771 @@
+"""
+    Merging and splitting of existing PDF files at the object level
+
+    Pages are copied with the objects they use, without rendering anything
+    again. Input files are memory mapped and read one object at a time, and
+    the output is written as objects are copied, so memory stays bounded
+    however many files are merged. Objects that are identical once copied,
+    such as the fonts and resource dictionaries every EzPDF document carries,
+    are written once.
+
+    Files with classic cross-reference tables, cross-reference streams,
+    object streams and incremental updates are read; encrypted files are not.
+    Document level structures (outlines, named destinations, forms) are not
+    carried over.
+"""
+import hashlib
+import mmap
+import os
+import re
+import zlib
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from .spill import StreamBuffer
+
+# Page attributes a page inherits from its ancestors in the page tree
+INHERITED: Tuple[str, ...] = ("Resources", "MediaBox", "CropBox", "Rotate")
+
+_WHITESPACE = re.compile(rb"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*")
+_REGULAR = rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]"
+_NAME = re.compile(rb"/(" + _REGULAR + rb"*)")
+_NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_REFERENCE = re.compile(rb"(\d+)\s+(\d+)\s+R(?!" + _REGULAR + rb")")
+_KEYWORD = re.compile(rb"[A-Za-z]+")
+_OBJECT_HEADER = re.compile(rb"(?:[\x00\t\n\x0c\r ]|%[^\r\n]*)*(\d+)\s+(\d+)\s+obj")
+_XREF_SECTION = re.compile(rb"\s*(\d+)\s+(\d+)")
+_XREF_ENTRY = re.compile(rb"\s*(\d{1,10})\s+(\d{1,5})\s+([nf])")
+_VERSION = re.compile(rb"%PDF-(\d\.\d)")
+
+
+class Ref(NamedTuple):
+    """Indirect reference to an object."""
+    number: int
+    generation: int
+
+
+class Name(str):
+    """PDF name, without its leading slash and with any #xx escapes kept."""
+
+
+class Raw(bytes):
+    """Token copied verbatim: strings, real numbers, booleans and null."""
+
+
+class Stream(NamedTuple):
+    """Stream object: its dictionary and its still encoded data."""
+    dictionary: Dict[Name, Any]
+    data: Union[bytes, memoryview]
+
+
+NULL = Raw(b"null")
+
+
+class PDFReader:
+    """Memory mapped PDF file whose objects are parsed on demand."""
+    def __init__(self, path: str):
+        """Opens a PDF file and reads its cross-reference sections.
+
+        Args:
+            path (str): Path of the PDF file.
+
+        Raises:
+            ValueError: File is not a readable PDF or is encrypted.
+        """
+        self.path: str = path
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._data)
+        # None marks an object freed by the newest section listing it
+        self._xref: Dict[int, Optional[Tuple[int, int, int]]] = {}
+        self._object_streams: Dict[int, Tuple[bytes, List[int]]] = {}
+        try:
+            match = _VERSION.search(self._data, 0, 1024)
+            if match is None:
+                raise ValueError(f"{path} is not a PDF file.")
+            self.version: str = match.group(1).decode("latin1")
+            self.trailer: Dict[Name, Any] = self._read_xref(self._startxref())
+            if "Encrypt" in self.trailer:
+                raise ValueError(f"{path} is encrypted, encrypted files can not be merged.")
+            self._page_tree: Set[int] = set()
+            self.pages: List[Tuple[Ref, Dict[Name, Any]]] = self._read_pages()
+        except Exception:
+            self.close()
+            raise
+
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+
+    def __enter__(self) -> "PDFReader":
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._object_streams.clear()
+        self._view.release()
+        self._data.close()
+
+
+    def _startxref(self) -> int:
+        """Offset of the last cross-reference section."""
+        position = self._data.rfind(b"startxref", max(0, len(self._data) - 2048))
+        if position < 0:
+            raise ValueError(f"{self.path} has no startxref, the file may be truncated.")
+        match = _NUMBER.search(self._data, position + 9)
+        return int(match.group())
+
+
+    def _read_xref(self, offset: int) -> Dict[Name, Any]:
+        """Reads the cross-reference sections from offset back through /Prev.
+
+        Each object takes its entry, in use or free, from the newest section
+        listing it.
+
+        Returns:
+            Dict[Name, Any]: Trailer dictionary of the newest section.
+        """
+        trailer: Optional[Dict[Name, Any]] = None
+        seen: Set[int] = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            section: Dict[int, Optional[Tuple[int, int, int]]] = {}
+            position = _WHITESPACE.match(self._data, offset).end()
+            if self._data[position:position + 4] == b"xref":
+                section_trailer = self._read_xref_table(position + 4, section)
+                if "XRefStm" in section_trailer:
+                    # Hybrid files list their compressed objects in a stream,
+                    # usually marking them free in the table
+                    compressed: Dict[int, Optional[Tuple[int, int, int]]] = {}
+                    self._read_xref_stream(section_trailer["XRefStm"], compressed)
+                    section.update(
+                        (number, entry) for number, entry in compressed.items()
+                        if entry is not None
+                    )
+            else:
+                section_trailer = self._read_xref_stream(offset, section)
+            for number, entry in section.items():
+                self._xref.setdefault(number, entry)
+            if trailer is None:
+                trailer = section_trailer
+            offset = section_trailer.get("Prev")
+        return trailer
+
+
+    def _read_xref_table(
+        self, position: int, section: Dict[int, Optional[Tuple[int, int, int]]]
+    ) -> Dict[Name, Any]:
+        """Reads the entries of a classic cross-reference table into section,
+        None for free objects, and returns its trailer."""
+        data = self._data
+        while True:
+            position = _WHITESPACE.match(data, position).end()
+            if data[position:position + 7] == b"trailer":
+                trailer, _ = self._parse(position + 7)
+                return trailer
+            match = _XREF_SECTION.match(data, position)
+            if match is None:
+                raise ValueError(f"Malformed cross-reference table in {self.path}.")
+            first, count = int(match.group(1)), int(match.group(2))
+            position = match.end()
+            for number in range(first, first + count):
+                entry = _XREF_ENTRY.match(data, position)
+                if entry is None:
+                    raise ValueError(f"Malformed cross-reference table in {self.path}.")
+                position = entry.end()
+                section[number] = (
+                    (1, int(entry.group(1)), int(entry.group(2)))
+                    if entry.group(3) == b"n" else None
+                )
+
+
+    def _read_xref_stream(
+        self, offset: int, section: Dict[int, Optional[Tuple[int, int, int]]]
+    ) -> Dict[Name, Any]:
+        """Reads the entries of a cross-reference stream into section, None for
+        free objects, and returns its dictionary."""
+        stream = self._object_at(offset)
+        if not isinstance(stream, Stream):
+            raise ValueError(f"Malformed cross-reference stream in {self.path}.")
+        dictionary = stream.dictionary
+        widths = dictionary["W"]
+        index = dictionary.get("Index", [0, dictionary["Size"]])
+        rows = _decode(stream)
+        row_size = sum(widths)
+        row = 0
+        for first, count in zip(index[::2], index[1::2]):
+            for number in range(first, first + count):
+                fields = []
+                start = row * row_size
+                for width in widths:
+                    fields.append(int.from_bytes(rows[start:start + width], "big"))
+                    start += width
+                row += 1
+                kind = fields[0] if widths[0] else 1
+                section[number] = (kind, fields[1], fields[2]) if kind in (1, 2) else None
+        return dictionary
+
+
+    def _read_pages(self) -> List[Tuple[Ref, Dict[Name, Any]]]:
+        """Walks the page tree, returning each page with the attributes it inherits."""
+        pages = []
+        root = self.resolve(self.trailer["Root"])
+        stack = [(root["Pages"], {})]
+        while stack:
+            node_ref, inherited = stack.pop()
+            if not isinstance(node_ref, Ref) or node_ref.number in self._page_tree:
+                continue
+            node = self.resolve(node_ref)
+            if node.get("Type") == "Pages" or "Kids" in node:
+                self._page_tree.add(node_ref.number)
+                inherited = dict(inherited)
+                inherited.update((key, node[key]) for key in INHERITED if key in node)
+                stack.extend((kid, inherited) for kid in reversed(self.resolve(node["Kids"])))
+            else:
+                pages.append((node_ref, inherited))
+        return pages
+
+
+    def is_page_tree(self, ref: Ref) -> bool:
+        """Whether ref points at an intermediate node of the page tree."""
+        return ref.number in self._page_tree
+
+
+    def resolve(self, value: Any) -> Any:
+        """Returns the object a reference points at, or value itself if it is
+        not a reference. Missing objects resolve to null."""
+        if not isinstance(value, Ref):
+            return value
+        entry = self._xref.get(value.number)
+        if entry is None:
+            return NULL
+        kind, first, second = entry
+        if kind == 1:
+            return self._object_at(first)
+        data, offsets = self._object_stream(first)
+        result, _ = _Parser(data).parse(offsets[second])
+        return result
+
+
+    def _object_stream(self, number: int) -> Tuple[bytes, List[int]]:
+        """Decoded data of an object stream and the offset of each object in it."""
+        cached = self._object_streams.get(number)
+        if cached is None:
+            stream = self.resolve(Ref(number, 0))
+            data = _decode(stream)
+            first = stream.dictionary["First"]
+            header = data[:first].split()
+            offsets = [first + int(offset) for offset in header[1::2]]
+            cached = self._object_streams[number] = (data, offsets)
+        return cached
+
+
+    def _object_at(self, offset: int) -> Any:
+        """Parses the indirect object starting at offset."""
+        match = _OBJECT_HEADER.match(self._data, offset)
+        if match is None:
+            raise ValueError(f"No object at offset {offset} of {self.path}.")
+        value, position = self._parse(match.end())
+        position = _WHITESPACE.match(self._data, position).end()
+        if isinstance(value, dict) and self._data[position:position + 6] == b"stream":
+            position += 6
+            if self._data[position:position + 2] == b"\r\n":
+                position += 2
+            elif self._data[position:position + 1] in (b"\n", b"\r"):
+                position += 1
+            length = self.resolve(value["Length"])
+            return Stream(value, self._view[position:position + length])
+        return value
+
+
+    def _parse(self, position: int) -> Tuple[Any, int]:
+        return _Parser(self._data).parse(position)
+
+
+class _Parser:
+    """Recursive descent parser of PDF objects in a buffer."""
+    def __init__(self, data: Union[bytes, mmap.mmap]):
+        self.data = data
+
+
+    def parse(self, position: int) -> Tuple[Any, int]:
+        """Parses the object at position.
+
+        Returns:
+            Tuple[Any, int]: Object and the position after it.
+        """
+        data = self.data
+        position = _WHITESPACE.match(data, position).end()
+        char = data[position:position + 1]
+        if char == b"/":
+            match = _NAME.match(data, position)
+            return Name(match.group(1).decode("latin1")), match.end()
+        if char == b"<":
+            if data[position + 1:position + 2] == b"<":
+                return self._dictionary(position + 2)
+            end = data.find(b">", position) + 1
+            return Raw(data[position:end]), end
+        if char == b"[":
+            array = []
+            position += 1
+            while True:
+                position = _WHITESPACE.match(data, position).end()
+                if data[position:position + 1] == b"]":
+                    return array, position + 1
+                value, position = self.parse(position)
+                array.append(value)
+        if char == b"(":
+            end = self._string_end(position)
+            return Raw(data[position:end]), end
+        match = _REFERENCE.match(data, position)
+        if match is not None:
+            return Ref(int(match.group(1)), int(match.group(2))), match.end()
+        match = _NUMBER.match(data, position)
+        if match is not None:
+            token = match.group()
+            if b"." in token:
+                return Raw(token), match.end()
+            return int(token), match.end()
+        match = _KEYWORD.match(data, position)
+        if match is not None and match.group() in (b"true", b"false", b"null"):
+            return Raw(match.group()), match.end()
+        raise ValueError(
+            f"Unexpected PDF token at offset {position}: {bytes(data[position:position + 20])!r}"
+            )
+
+
+    def _dictionary(self, position: int) -> Tuple[Dict[Name, Any], int]:
+        data = self.data
+        dictionary: Dict[Name, Any] = {}
+        while True:
+            position = _WHITESPACE.match(data, position).end()
+            if data[position:position + 2] == b">>":
+                return dictionary, position + 2
+            key, position = self.parse(position)
+            if not isinstance(key, Name):
+                raise ValueError(f"Dictionary key expected at offset {position}.")
+            value, position = self.parse(position)
+            dictionary[key] = value
+
+
+    def _string_end(self, position: int) -> int:
+        """Position after the literal string starting at position."""
+        data = self.data
+        depth = 0
+        while True:
+            char = data[position:position + 1]
+            if char == b"\\":
+                position += 2
+                continue
+            if char == b"(":
+                depth += 1
+            elif char == b")":
+                depth -= 1
+                if not depth:
+                    return position + 1
+            elif not char:
+                raise ValueError("Unterminated PDF string.")
+            position += 1
+
+
+def _decode(stream: Stream) -> bytes:
+    """Decoded data of a FlateDecode or unfiltered stream, e.g. an object stream."""
+    data = bytes(stream.data)
+    filters = stream.dictionary.get("Filter", [])
+    filters = filters if isinstance(filters, list) else [filters]
+    params = stream.dictionary.get("DecodeParms") or {}
+    params = params[0] if isinstance(params, list) else params
+    for name in filters:
+        if name != "FlateDecode":
+            raise ValueError(f"Unsupported filter {name} on a cross-reference or object stream.")
+        data = zlib.decompress(data)
+    predictor = params.get("Predictor", 1) if isinstance(params, dict) else 1
+    if predictor >= 10:
+        bits = params.get("Colors", 1) * params.get("BitsPerComponent", 8)
+        data = _png_unpredict(data, (params.get("Columns", 1) * bits + 7) // 8, max(1, bits // 8))
+    elif predictor != 1:
+        raise ValueError(
+            f"Unsupported predictor {predictor} on a cross-reference or object stream."
+            )
+    return data
+
+
+def _png_unpredict(data: bytes, width: int, pixel: int) -> bytes:
+    """Reverses the PNG filters (None, Sub, Up, Average, Paeth) of each row.
+
+    Args:
+        data (bytes): Rows, each a filter type byte followed by width bytes.
+        width (int): Bytes of a row, without its filter type byte.
+        pixel (int): Bytes of a pixel, the distance Sub, Average and Paeth
+            look back.
+
+    Raises:
+        ValueError: Row has an unknown filter type.
+
+    Returns:
+        bytes: Rows without their filter type bytes.
+    """
+    rows = []
+    previous = bytearray(width)
+    for start in range(0, len(data), width + 1):
+        kind, row = data[start], bytearray(data[start + 1:start + width + 1])
+        if kind == 1:
+            for index in range(pixel, len(row)):
+                row[index] = (row[index] + row[index - pixel]) & 0xFF
+        elif kind == 2:
+            row = bytearray((value + above) & 0xFF for value, above in zip(row, previous))
+        elif kind == 3:
+            for index, value in enumerate(row):
+                left = row[index - pixel] if index >= pixel else 0
+                row[index] = (value + (left + previous[index]) // 2) & 0xFF
+        elif kind == 4:
+            for index, value in enumerate(row):
+                left = row[index - pixel] if index >= pixel else 0
+                upper_left = previous[index - pixel] if index >= pixel else 0
+                row[index] = (value + _paeth(left, previous[index], upper_left)) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"Unsupported PNG filter type {kind} in a predicted stream.")
+        rows.append(bytes(row))
+        previous = row
+    return b"".join(rows)
+
+
+def _paeth(left: int, above: int, upper_left: int) -> int:
+    """PNG Paeth predictor: the neighbour closest to left + above - upper_left."""
+    estimate = left + above - upper_left
+    distance_left = abs(estimate - left)
+    distance_above = abs(estimate - above)
+    distance_upper_left = abs(estimate - upper_left)
+    if distance_left <= distance_above and distance_left <= distance_upper_left:
+        return left
+    if distance_above <= distance_upper_left:
+        return above
+    return upper_left
+
+
+def _serialize(value: Any) -> bytes:
+    """PDF syntax of a parsed object."""
+    if isinstance(value, Raw):
+        return value
+    if isinstance(value, Name):
+        return b"/" + value.encode("latin1")
+    if isinstance(value, Ref):
+        return b"%d %d R" % value
+    if isinstance(value, int):
+        return b"%d" % value
+    if isinstance(value, dict):
+        return b"<<" + b"".join(
+            b"/" + key.encode("latin1") + b" " + _serialize(item) for key, item in value.items()
+        ) + b">>"
+    if isinstance(value, list):
+        return b"[" + b" ".join(_serialize(item) for item in value) + b"]"
+    raise TypeError(f"Can not serialize {type(value).__name__}.")
+
+
+class PDFMerger:
+    """Writes the pages of existing PDF files into one new file.
+
+    Example:
+        with PDFMerger("mailing.pdf") as merger:
+            for path in statements:
+                merger.append(path)
+    """
+    def __init__(
+        self,
+        output: Union[str, BinaryIO],
+        dedupe: bool = True
+    ):
+        """Starts a merged file.
+
+        Args:
+            output (Union[str, BinaryIO]): Name of file, or writable binary
+                stream, to write to.
+            dedupe (bool, optional): Write objects that are identical once
+                copied, such as shared fonts, only once. Defaults to True.
+        """
+        self._file: Optional[BinaryIO] = None
+        if isinstance(output, (str, os.PathLike)):
+            self._file = open(output, "wb")
+            output = self._file
+        self._buffer = StreamBuffer(output)
+        self.dedupe: bool = dedupe
+        self.pages: int = 0
+        self.objects: int = 0
+        self.deduplicated: int = 0
+        self._version: str = "1.3"
+        self._offsets: Dict[int, int] = {}
+        self._digests: Dict[bytes, int] = {}
+        self._kids: List[int] = []
+        self._closed: bool = False
+        # Objects 1 and 2 are the page tree root and the catalog, written last
+        self._next_number: int = 3
+        self._buffer += b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+
+    def __enter__(self) -> "PDFMerger":
+        return self
+
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+
+
+    def append(
+        self,
+        source: Union[str, PDFReader],
+        pages: Optional[Iterable[int]] = None
+    ) -> int:
+        """Copies pages of a PDF file to the end of the merged file.
+
+        Args:
+            source (Union[str, PDFReader]): Path of the PDF file, or an open reader.
+            pages (Iterable[int], optional): Numbers of the pages to copy,
+                starting at 1, in the order to copy them. Defaults to every page.
+
+        Raises:
+            ValueError: Merger is closed, a page number is out of range or the
+                file can not be read.
+
+        Returns:
+            int: Number of pages copied.
+        """
+        if self._closed:
+            raise ValueError("Pages can not be appended to a closed merger.")
+        if isinstance(source, PDFReader):
+            return self._append(source, pages)
+        with PDFReader(source) as reader:
+            return self._append(reader, pages)
+
+
+    def _append(self, reader: PDFReader, pages: Optional[Iterable[int]]) -> int:
+        numbers = range(1, len(reader) + 1) if pages is None else list(pages)
+        for number in numbers:
+            if not 1 <= number <= len(reader):
+                raise ValueError(
+                    f"{reader.path} has {len(reader)} pages. Currently page {number}"
+                    )
+        self._version = max(self._version, reader.version)
+
+        selected: Dict[int, int] = {}
+        for number in numbers:
+            ref = reader.pages[number - 1][0]
+            if ref.number not in selected:
+                selected[ref.number] = self._reserve()
+        copier = _Copier(self, reader, selected)
+        copied = set()
+        for number in numbers:
+            ref, inherited = reader.pages[number - 1]
+            page = dict(reader.resolve(ref))
+            page.pop("Parent", None)
+            for key, value in inherited.items():
+                page.setdefault(key, value)
+            page = copier.copy(page)
+            page["Parent"] = Ref(1, 0)
+            # A page listed twice gets its own object the second time
+            out = selected[ref.number] if ref.number not in copied else self._reserve()
+            copied.add(ref.number)
+            self._write(out, _serialize(page))
+            self._kids.append(out)
+        self.pages += len(numbers)
+        return len(numbers)
+
+
+    def _reserve(self) -> int:
+        """Allocates the next object number of the merged file."""
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+
+    def _write(
+        self,
+        number: int,
+        body: bytes,
+        stream: Optional[Union[bytes, memoryview]] = None
+    ) -> None:
+        """Writes an object of the merged file."""
+        self._offsets[number] = len(self._buffer)
+        self._buffer += b"%d 0 obj\n" % number + body
+        if stream is not None:
+            self._buffer += b"\nstream\n"
+            self._buffer += stream
+            self._buffer += b"\nendstream"
+        self._buffer += b"\nendobj\n"
+        self.objects += 1
+
+
+    def _store(
+        self,
+        body: bytes,
+        stream: Optional[Union[bytes, memoryview]] = None,
+        number: Optional[int] = None
+    ) -> int:
+        """Writes an object unless an identical one was written, returning its number."""
+        if number is None and self.dedupe:
+            digest = hashlib.sha256(body)
+            if stream is not None:
+                digest.update(b"\x00stream")
+                digest.update(stream)
+            key = digest.digest()
+            existing = self._digests.get(key)
+            if existing is not None:
+                self.deduplicated += 1
+                return existing
+            number = self._digests[key] = self._reserve()
+        elif number is None:
+            number = self._reserve()
+        self._write(number, body, stream)
+        return number
+
+
+    def close(self) -> None:
+        """Writes the page tree, catalog and cross-reference table, and closes
+        the output file if the merger opened it."""
+        if self._closed:
+            return
+        self._closed = True
+        kids = b" ".join(b"%d 0 R" % kid for kid in self._kids)
+        self._write(1, b"<</Type /Pages /Kids [%s] /Count %d>>" % (kids, len(self._kids)))
+        version = b" /Version /%s" % self._version.encode() if self._version > "1.4" else b""
+        self._write(2, b"<</Type /Catalog /Pages 1 0 R%s>>" % version)
+
+        xref_position = len(self._buffer)
+        size = self._next_number
+        rows = [b"xref\n0 %d\n0000000000 65535 f \n" % size]
+        for number in range(1, size):
+            offset = self._offsets.get(number)
+            rows.append(
+                b"0000000000 65535 f \n" if offset is None else b"%010d 00000 n \n" % offset
+            )
+        file_id = self._buffer.md5.hexdigest().upper().encode()
+        rows.append(
+            b"trailer\n<</Size %d /Root 2 0 R /ID [<%s><%s>]>>\nstartxref\n%d\n%%%%EOF\n"
+            % (size, file_id, file_id, xref_position)
+        )
+        self._buffer += b"".join(rows)
+        if self._file is not None:
+            self._file.close()
+
+
+class _Copier:
+    """Copies the objects reachable from the pages of one source file,
+    renumbering references into the merged file."""
+    def __init__(self, merger: PDFMerger, reader: PDFReader, pages: Dict[int, int]):
+        self.merger = merger
+        self.reader = reader
+        self.pages = pages
+        self.copied: Dict[int, int] = {}
+        self.in_progress: Set[int] = set()
+        # Objects referenced from their own descendants, written under a number reserved early
+        self.reserved: Dict[int, int] = {}
+
+
+    def copy(self, value: Any) -> Any:
+        """Copy of a parsed object with every reference renumbered."""
+        if isinstance(value, Ref):
+            return self.copy_ref(value)
+        if isinstance(value, dict):
+            return {key: self.copy(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.copy(item) for item in value]
+        return value
+
+
+    def copy_ref(self, ref: Ref) -> Union[Ref, Raw]:
+        """Reference in the merged file to a copy of the object ref points at."""
+        number = ref.number
+        if number in self.pages:
+            return Ref(self.pages[number], 0)
+        if self.reader.is_page_tree(ref):
+            return Ref(1, 0)
+        if number in self.copied:
+            return Ref(self.copied[number], 0)
+        if number in self.in_progress:
+            if number not in self.reserved:
+                self.reserved[number] = self.merger._reserve()  # pylint: disable=protected-access
+            return Ref(self.reserved[number], 0)
+
+        value = self.reader.resolve(ref)
+        if isinstance(value, dict) and value.get("Type") == "Page":
+            # Pages left out of the merged file, e.g. link destinations
+            return NULL
+        self.in_progress.add(number)
+        if isinstance(value, Stream):
+            dictionary = self.copy(value.dictionary)
+            dictionary["Length"] = len(value.data)
+            body, stream = _serialize(dictionary), value.data
+        else:
+            body, stream = _serialize(self.copy(value)), None
+        self.in_progress.discard(number)
+        out = self.merger._store(  # pylint: disable=protected-access
+            body, stream, self.reserved.pop(number, None)
+        )
+        self.copied[number] = out
+        return Ref(out, 0)
+
+
+def merge_pdfs(
+    sources: Iterable[Union[str, PDFReader]],
+    output: Union[str, BinaryIO],
+    dedupe: bool = True
+) -> int:
+    """Concatenates the pages of PDF files into one file, e.g. a mailing file
+    of the statements exported by many EzPDF documents.
+
+    Args:
+        sources (Iterable[Union[str, PDFReader]]): PDF files, in order. Each
+            file is opened only while its pages are copied.
+        output (Union[str, BinaryIO]): Name of file, or writable binary
+            stream, to write to.
+        dedupe (bool, optional): Write objects that are identical once copied,
+            such as shared fonts, only once. Defaults to True.
+
+    Returns:
+        int: Number of pages of the merged file.
+    """
+    with PDFMerger(output, dedupe=dedupe) as merger:
+        for source in sources:
+            merger.append(source)
+    return merger.pages
+
+
+def split_pdf(
+    source: str,
+    sections: Mapping[str, Iterable[int]],
+    dedupe: bool = True
+) -> None:
+    """Writes sections of a PDF file to separate files.
+
+    Args:
+        source (str): Path of the PDF file.
+        sections (Mapping[str, Iterable[int]]): Page numbers, starting at 1,
+            to write to each output file, e.g. {"intro.pdf": range(1, 3)}.
+        dedupe (bool, optional): Write objects that are identical once copied
+            only once per output file. Defaults to True.
+
+    Raises:
+        ValueError: A page number is out of range.
+    """
+    with PDFReader(source) as reader:
+        for output, pages in sections.items():
+            with PDFMerger(output, dedupe=dedupe) as merger:
+                merger.append(reader, pages)
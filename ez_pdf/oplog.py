@@ -0,0 +1,336 @@
+"""
+    Recording of EzPDF calls into a serializable operation log, rendered later
+    by replaying it, e.g. in a worker pool or on another machine
+"""
+import base64
+import json
+import zlib
+from array import array
+from collections.abc import Iterator as IteratorType
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+from .columnar import ColumnarTable
+from .ez_pdf import AutoColumns, ColumnSpec, EzPDF
+from .styles import Style
+
+# Bumped whenever the serialized format changes
+OPLOG_FORMAT: int = 2
+# EzPDF methods a log records. They lay out or configure the document and
+# return nothing a caller needs before rendering; the row counts of the table
+# methods are only known once the log is replayed
+OPERATIONS: FrozenSet[str] = frozenset((
+    "add_page",
+    "set_font",
+    "add_font",
+    "add_empty_row",
+    "set_cell_fill_color",
+    "add_one_cell_row",
+    "add_two_cell_row",
+    "add_three_cell_row",
+    "add_four_cell_row",
+    "add_five_cell_row",
+    "add_rows",
+    "add_logo",
+    "add_image_row",
+    "stream_table",
+    "add_table",
+    "add_dataframe",
+    "add_columnar_table",
+    "record_form",
+    "stamp_form",
+    "repeat_form",
+    "spill_pages",
+    "set_compression",
+))
+
+Operation = Tuple[str, tuple, Dict[str, Any]]
+
+
+class ReplayCancelled(Exception):
+    """Raised by OpLog.build when its cancelled callback returns True."""
+
+
+class OpLog:
+    """EzPDF facade recording calls instead of rendering them.
+
+    Calls to the EzPDF methods of OPERATIONS, such as add_page, set_font,
+    add_five_cell_row or set_cell_fill_color, are appended to the log and
+    return None, including the table methods that return a row count on
+    EzPDF; rows passed as iterators are read into lists. record_form is used
+    as a context manager as on EzPDF. Methods returning a value, such as
+    fit_columns or export_bytes, raise AttributeError. The log renders with
+    replay and serializes with to_bytes.
+
+    Example:
+        log = OpLog(font="helvetica")
+        log.add_page()
+        log.add_two_cell_row("Client", "Balance")
+        data = log.to_bytes()
+        ...
+        OpLog.from_bytes(data).replay("statement.pdf")
+    """
+    def __init__(
+        self,
+        *args: Any,
+        creation_date: Optional[datetime] = None,
+        **kwargs: Any
+    ):
+        """Creates an empty log.
+
+        Args:
+            *args (Any): Positional arguments of EzPDF.
+            creation_date (datetime, optional): Creation date written to the
+                document. A fixed date makes every replay of the log export
+                the same bytes. Defaults to the time of the replay.
+            **kwargs (Any): Keyword arguments of EzPDF.
+        """
+        self.args: Tuple[Any, ...] = args
+        self.kwargs: Dict[str, Any] = kwargs
+        self.creation_date: Optional[datetime] = creation_date
+        self.operations: List[Operation] = []
+
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        if name not in OPERATIONS:
+            raise AttributeError(f"{type(self).__name__} has no method {name}")
+        if name == "record_form":
+            return self._record_form
+
+        def record(*args: Any, **kwargs: Any) -> None:
+            self._record(name, args, kwargs)
+        record.__name__ = name
+        record.__doc__ = getattr(EzPDF, name).__doc__
+        return record
+
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+
+    def _record(self, name: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        """Appends a call, reading iterator arguments into lists."""
+        self.operations.append((
+            name,
+            tuple(list(arg) if isinstance(arg, IteratorType) else arg for arg in args),
+            {
+                key: list(arg) if isinstance(arg, IteratorType) else arg
+                for key, arg in kwargs.items()
+            }
+        ))
+
+
+    def _record_form(self, name: str) -> "_RecordedForm":
+        """Recorded counterpart of EzPDF.record_form, used as a context manager."""
+        return _RecordedForm(self.operations, name)
+
+
+    def copy(self) -> "OpLog":
+        """Returns a plain log of the calls recorded so far, unaffected by later calls."""
+        log = OpLog(*self.args, creation_date=self.creation_date, **self.kwargs)
+        log.operations = list(self.operations)
+        return log
+
+
+    def build(
+        self,
+        cancelled: Optional[Callable[[], bool]] = None
+    ) -> EzPDF:
+        """Creates a document and applies the recorded calls to it.
+
+        Args:
+            cancelled (Callable[[], bool], optional): Checked before every call;
+                returning True stops the replay. Defaults to None.
+
+        Raises:
+            ReplayCancelled: cancelled returned True.
+
+        Returns:
+            EzPDF: Filled document, ready to export.
+        """
+        pdf = EzPDF(*self.args, **self.kwargs)
+        if self.creation_date is not None:
+            pdf.pdf.set_creation_date(self.creation_date)
+        forms = []
+        for name, args, kwargs in self.operations:
+            if cancelled is not None and cancelled():
+                raise ReplayCancelled("Replay cancelled")
+            if name == "record_form":
+                forms.append(pdf.record_form(*args))
+                forms[-1].__enter__()
+            elif name == "_end_form":
+                forms.pop().__exit__(None, None, None)
+            else:
+                getattr(pdf, name)(*args, **kwargs)
+        return pdf
+
+
+    def replay(
+        self,
+        output: Optional[str] = None
+    ) -> Optional[bytes]:
+        """Renders the log into a PDF.
+
+        Args:
+            output (str, optional): Name of file to export to. Defaults to None,
+                returning the PDF.
+
+        Returns:
+            Optional[bytes]: Contents of the PDF file if no output was given.
+        """
+        pdf = self.build()
+        if output is not None:
+            pdf.export(output)
+            return None
+        return bytes(pdf.export_bytes())
+
+
+    def to_bytes(
+        self,
+        compress: bool = True
+    ) -> bytes:
+        """Serializes the log as JSON, deflated by default.
+
+        Arguments can be None, booleans, numbers, strings, lists, tuples,
+        dictionaries with string keys, ColumnSpec, AutoColumns, Style and
+        ColumnarTable objects.
+
+        Args:
+            compress (bool, optional): Deflate the JSON. Defaults to True.
+
+        Raises:
+            TypeError: An argument can not be serialized.
+
+        Returns:
+            bytes: Serialized log.
+        """
+        data = json.dumps(
+            {
+                "format": OPLOG_FORMAT,
+                "args": _encode(list(self.args)),
+                "kwargs": _encode(self.kwargs),
+                "creation_date": (
+                    None if self.creation_date is None else self.creation_date.isoformat()
+                ),
+                "operations": [
+                    [name, _encode(list(args)), _encode(kwargs)]
+                    for name, args, kwargs in self.operations
+                ],
+            },
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+        return zlib.compress(data) if compress else data
+
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "OpLog":
+        """Loads a log serialized by to_bytes, deflated or not.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): Serialized log.
+
+        Raises:
+            ValueError: Data is not an operation log of a supported format.
+
+        Returns:
+            OpLog: Log ready to replay.
+        """
+        data = bytes(data)
+        if not data.lstrip().startswith(b"{"):
+            data = zlib.decompress(data)
+        log = json.loads(data)
+        if not isinstance(log, dict) or log.get("format") != OPLOG_FORMAT:
+            raise ValueError(f"Unsupported operation log format. Expected format {OPLOG_FORMAT}")
+        creation_date = log["creation_date"]
+        result = cls(
+            *_decode(log["args"]),
+            creation_date=None if creation_date is None else datetime.fromisoformat(creation_date),
+            **_decode(log["kwargs"])
+        )
+        for name, args, kwargs in log["operations"]:
+            if name != "_end_form" and name not in OPERATIONS:
+                raise ValueError(f"Operation log calls unknown method {name}.")
+            result.operations.append((name, tuple(_decode(args)), _decode(kwargs)))
+        return result
+
+
+class _RecordedForm:
+    """Context manager recording the start and end of a form."""
+    def __init__(self, operations: List[Operation], name: str):
+        self._operations = operations
+        self._name = name
+
+
+    def __enter__(self) -> None:
+        self._operations.append(("record_form", (self._name,), {}))
+
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self._operations.append(("_end_form", (), {}))
+
+
+def _encode(value: Any) -> Any:
+    """JSON compatible form of an argument."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Style):
+        return {"$Style": _encode(list(value))}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) and not key.startswith("$") for key in value):
+            raise TypeError("Only dictionaries with string keys can be serialized.")
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (ColumnSpec, AutoColumns)):
+        return {f"${type(value).__name__}": _encode(vars(value))}
+    if isinstance(value, ColumnarTable):
+        return {"$ColumnarTable": _encode(value.__getstate__())}
+    if isinstance(value, array):
+        return value.tolist()
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Argument of type {type(value).__name__} can not be serialized.")
+
+
+def _decode(value: Any) -> Any:
+    """Argument from its JSON compatible form."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        for layout_type in (ColumnSpec, AutoColumns):
+            if f"${layout_type.__name__}" in value:
+                layout = layout_type.__new__(layout_type)
+                for name, state in value[f"${layout_type.__name__}"].items():
+                    setattr(layout, name, _tuples(state))
+                return layout
+        if "$Style" in value:
+            return Style(*_tuples(value["$Style"]))
+        if "$bytes" in value:
+            return base64.b64decode(value["$bytes"])
+        if "$ColumnarTable" in value:
+            table = ColumnarTable.__new__(ColumnarTable)
+            table.__setstate__(_decode(value["$ColumnarTable"]))
+            return table
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def _tuples(value: Any) -> Any:
+    """Turns the lists of decoded layout and Style state back into tuples."""
+    if isinstance(value, list):
+        return tuple(_tuples(item) for item in value)
+    return value
+
+
+def render_log(data: bytes) -> EzPDF:
+    """Builds the document of a serialized log, usable as the builder of
+    render_many and iter_render with serialized logs as job data.
+
+    Args:
+        data (bytes): Log serialized by OpLog.to_bytes.
+
+    Returns:
+        EzPDF: Filled document.
+    """
+    return OpLog.from_bytes(data).build()
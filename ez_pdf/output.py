@@ -0,0 +1,317 @@
+"""
+    PDF serialization for EzPDF documents
+"""
+import zlib
+from functools import partial
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from fpdf import FPDF
+from fpdf.output import (
+    CIDSystemInfo,
+    OutputProducer,
+    PDFFont,
+    PDFFontStream,
+    _dimensions_to_mediabox,
+    _tt_font_widths,
+)
+from fpdf.syntax import Name, PDFArray, PDFContentStream
+from fpdf.syntax import create_dictionary_string as pdf_dict
+from fpdf.syntax import iobj_ref as pdf_ref
+from .forms import PDFFormXObject, PDFStream, StaticForm
+from .spill import PageSpill, SpilledStream, StreamBuffer
+
+OBJECTS_PER_STREAM: int = 100
+
+
+class EzOutputProducer(OutputProducer):
+    """OutputProducer adding recorded forms, a deflate level, object streams
+    and pages spilled to disk.
+
+    Given a stream, objects are written to it as they are serialized instead
+    of being collected in memory.
+    """
+    def __init__(
+        self,
+        fpdf,
+        forms: Iterable[StaticForm] = (),
+        compression_level: int = -1,
+        object_streams: bool = False,
+        spill: Optional[PageSpill] = None,
+        stream: Optional[BinaryIO] = None
+    ):
+        super().__init__(fpdf)
+        self.forms = tuple(forms)
+        self.compression_level = compression_level
+        self.object_streams = object_streams
+        self.spill = spill
+        if stream is not None:
+            self.buffer = StreamBuffer(stream)
+
+
+    def bufferize(self):
+        fpdf = self.fpdf
+        streamed: bool = isinstance(self.buffer, StreamBuffer)
+        if streamed and type(fpdf).file_id is FPDF.file_id:
+            fpdf.file_id = self._streamed_file_id
+        buffer = super().bufferize()
+        if (
+            not self.object_streams
+            or streamed
+            or fpdf._security_handler
+            or fpdf._sign_key
+        ):
+            return buffer
+        self.buffer = self._pack_object_streams(buffer)
+        return self.buffer
+
+
+    def _add_pages(self, _slice=slice(0, None)):
+        fpdf = self.fpdf
+        level = self.compression_level if fpdf.compress else None
+        page_objs = []
+        for page_obj in list(fpdf.pages.values())[_slice]:
+            if fpdf.pdf_version > "1.3":
+                page_obj.group = pdf_dict(
+                    {"/Type": "/Group", "/S": "/Transparency", "/CS": "/DeviceRGB"},
+                    field_join=" ",
+                )
+            if page_obj.dimensions() != fpdf.default_page_dimensions:
+                page_obj.media_box = _dimensions_to_mediabox(page_obj.dimensions())
+            self._add_pdf_obj(page_obj, "pages")
+            page_objs.append(page_obj)
+
+            if self.spill is not None and page_obj.index() in self.spill:
+                cs_obj = SpilledStream(partial(self._load_page, page_obj.index()), level)
+            else:
+                cs_obj = PDFStream(page_obj.contents, level)
+            self._add_pdf_obj(cs_obj, "pages")
+            page_obj.contents = cs_obj
+        return page_objs
+
+
+    def _add_fonts(self):
+        fpdf = self.fpdf
+        fonts = fpdf.fonts
+        registered = [font for font in fonts.values() if "registry" in font]
+        if not registered:
+            return super()._add_fonts()
+
+        # fpdf parses and subsets TTF fonts itself, hide the registered ones from it
+        fpdf.fonts = {key: font for key, font in fonts.items() if "registry" not in font}
+        try:
+            font_objs_per_index = super()._add_fonts()
+        finally:
+            fpdf.fonts = fonts
+        for font in registered:
+            font_objs_per_index[font["i"]] = self._add_registered_font(font)
+        return font_objs_per_index
+
+
+    def _add_registered_font(self, font: dict) -> PDFFont:
+        """Adds the objects of a registry font, embedding a cached subset.
+
+        Mirrors the TTF branch of OutputProducer._add_fonts.
+        """
+        fontname = f"MPDFAA+{font['name']}"
+        registry = font["registry"]
+        cmap = registry.glyph_names(font["fontkey"])
+        uni_to_new_code_char = font["subset"].dict()
+        del uni_to_new_code_char[0]
+        subset = registry.subset(
+            font["fontkey"],
+            [cmap[code] for code in uni_to_new_code_char if code in cmap]
+        )
+
+        composite_font_obj = PDFFont(subtype="Type0", base_font=fontname, encoding="Identity-H")
+        self._add_pdf_obj(composite_font_obj, "fonts")
+        cid_font_obj = PDFFont(
+            subtype="CIDFontType2",
+            base_font=fontname,
+            d_w=font["desc"].missing_width,
+            w=_tt_font_widths(font, max(uni_to_new_code_char)),
+        )
+        self._add_pdf_obj(cid_font_obj, "fonts")
+        composite_font_obj.descendant_fonts = PDFArray([cid_font_obj])
+
+        bf_chars: List[str] = []
+        for code, code_mapped in font["subset"].dict().items():
+            if code > 0xFFFF:
+                code_high = 0xD800 | (code - 0x10000) >> 10
+                code_low = 0xDC00 | (code & 0x3FF)
+                bf_chars.append(f"<{code_mapped:04X}> <{code_high:04X}{code_low:04X}>\n")
+            else:
+                bf_chars.append(f"<{code_mapped:04X}> <{code:04X}>\n")
+        to_unicode_obj = PDFContentStream(
+            "/CIDInit /ProcSet findresource begin\n"
+            "12 dict begin\n"
+            "begincmap\n"
+            "/CIDSystemInfo\n"
+            "<</Registry (Adobe)\n"
+            "/Ordering (UCS)\n"
+            "/Supplement 0\n"
+            ">> def\n"
+            "/CMapName /Adobe-Identity-UCS def\n"
+            "/CMapType 2 def\n"
+            "1 begincodespacerange\n"
+            "<0000> <FFFF>\n"
+            "endcodespacerange\n"
+            f"{len(bf_chars)} beginbfchar\n"
+            f"{''.join(bf_chars)}"
+            "endbfchar\n"
+            "endcmap\n"
+            "CMapName currentdict /CMap defineresource pop\n"
+            "end\n"
+            "end"
+        )
+        self._add_pdf_obj(to_unicode_obj, "fonts")
+        composite_font_obj.to_unicode = to_unicode_obj
+
+        cid_system_info_obj = CIDSystemInfo()
+        self._add_pdf_obj(cid_system_info_obj, "fonts")
+        cid_font_obj.c_i_d_system_info = cid_system_info_obj
+
+        font_descriptor_obj = font["desc"]
+        font_descriptor_obj.font_name = Name(fontname)
+        self._add_pdf_obj(font_descriptor_obj, "fonts")
+        cid_font_obj.font_descriptor = font_descriptor_obj
+
+        cid_to_gid_map = bytearray(256 * 256 * 2)
+        for code, code_mapped in uni_to_new_code_char.items():
+            glyph_id = subset.glyph_ids[cmap.get(code, ".notdef")]
+            cid_to_gid_map[code_mapped * 2] = glyph_id >> 8
+            cid_to_gid_map[code_mapped * 2 + 1] = glyph_id & 0xFF
+        cid_to_gid_map_obj = PDFStream(cid_to_gid_map)
+        self._add_pdf_obj(cid_to_gid_map_obj, "fonts")
+        cid_font_obj.c_i_d_to_g_i_d_map = cid_to_gid_map_obj
+
+        font_file_cs_obj = PDFFontStream(contents=subset.font_file)
+        self._add_pdf_obj(font_file_cs_obj, "fonts")
+        font_descriptor_obj.font_file2 = font_file_cs_obj
+        return composite_font_obj
+
+
+    def _load_page(self, index: int) -> bytes:
+        """Reads a spilled page back, substituting the page count alias as
+        FPDF does for pages kept in memory."""
+        contents: bytes = self.spill.read(index)
+        alias: str = self.fpdf.str_alias_nb_pages
+        if alias:
+            count = str(self.fpdf.pages_count)
+            contents = contents.replace(
+                alias.encode("utf-16-be"), count.encode("utf-16-be")
+            ).replace(alias.encode("latin-1"), count.encode("latin-1"))
+        return contents
+
+
+    def _streamed_file_id(self) -> str:
+        """File identifier computed like FPDF's default, from the running hash
+        of the bytes already written."""
+        id_hash = self.buffer.md5.copy()
+        if self.fpdf.creation_date:
+            id_hash.update(self.fpdf.creation_date.strftime("%Y%m%d%H%M%S").encode("utf8"))
+        hash_hex = id_hash.hexdigest().upper()
+        return f"<{hash_hex}><{hash_hex}>"
+
+
+    def _add_resources_dict(
+        self, font_objs_per_index, img_objs_per_index, gfxstate_objs_per_name
+    ):
+        resources_obj = super()._add_resources_dict(
+            font_objs_per_index, img_objs_per_index, gfxstate_objs_per_name
+        )
+        if not self.forms:
+            return resources_obj
+
+        fpdf = self.fpdf
+        x_objects = {
+            f"/I{index}": pdf_ref(img_obj.id)
+            for index, img_obj in sorted(img_objs_per_index.items())
+        }
+        for form in self.forms:
+            form_obj = PDFFormXObject(
+                form.contents,
+                fpdf.w_pt,
+                fpdf.h_pt,
+                self.compression_level if fpdf.compress else None
+            )
+            form_obj.resources = resources_obj
+            self._add_pdf_obj(form_obj, "forms")
+            x_objects[f"/{form.name}"] = pdf_ref(form_obj.id)
+        resources_obj.x_object = pdf_dict(x_objects)
+        return resources_obj
+
+
+    def _pack_object_streams(self, buffer: bytearray) -> bytearray:
+        """Rewrites a serialized document with its dictionaries packed into
+        compressed object streams and a cross-reference stream (PDF 1.5).
+
+        Args:
+            buffer (bytearray): Document serialized with a classic xref table.
+
+        Returns:
+            bytearray: Equivalent, smaller document.
+        """
+        xref_position: int = buffer.rfind(b"\nxref\n") + 1
+        trailer: bytes = bytes(buffer[buffer.rfind(b"trailer\n<<"):])
+        trailer_entries: List[str] = [
+            line for line in trailer.decode("latin1").splitlines()
+            if line.startswith(("/Root", "/Info", "/ID"))
+        ]
+        ids: List[int] = sorted(self.offsets, key=self.offsets.get)
+        ends: Dict[int, int] = dict(zip(
+            ids, [self.offsets[obj_id] for obj_id in ids[1:]] + [xref_position]
+        ))
+
+        version: bytes = buffer[5:8]
+        packed = bytearray(b"%PDF-" + max(version, b"1.5") + buffer[8:self.offsets[ids[0]]])
+        offsets: Dict[int, int] = {}
+        packable: List[Tuple[int, bytes]] = []
+        for obj_id in ids:
+            span = bytes(buffer[self.offsets[obj_id]:ends[obj_id]])
+            prefix = f"{obj_id} 0 obj\n".encode("latin1")
+            if (
+                b"\nendstream" in span
+                or not span.startswith(prefix)
+                or not span.endswith(b"\nendobj\n")
+            ):
+                offsets[obj_id] = len(packed)
+                packed += span
+            else:
+                packable.append((obj_id, span[len(prefix):-len(b"\nendobj\n")]))
+
+        next_id: int = max(ids) + 1
+        locations: Dict[int, Tuple[int, int]] = {}
+        for start in range(0, len(packable), OBJECTS_PER_STREAM):
+            group = packable[start:start + OBJECTS_PER_STREAM]
+            index, bodies, position = [], [], 0
+            for number, (obj_id, body) in enumerate(group):
+                index.append(f"{obj_id} {position}")
+                bodies.append(body)
+                position += len(body) + 1
+                locations[obj_id] = (next_id, number)
+            header = " ".join(index).encode("latin1") + b"\n"
+            stream = zlib.compress(header + b"\n".join(bodies), self.compression_level)
+            offsets[next_id] = len(packed)
+            packed += (
+                f"{next_id} 0 obj\n<< /Type /ObjStm /N {len(group)} /First {len(header)} "
+                f"/Filter /FlateDecode /Length {len(stream)} >>\nstream\n"
+            ).encode("latin1") + stream + b"\nendstream\nendobj\n"
+            next_id += 1
+
+        xref_id: int = next_id
+        offsets[xref_id] = len(packed)
+        rows = bytearray(b"\x00\x00\x00\x00\x00\xff\xff")
+        for obj_id in range(1, xref_id + 1):
+            if obj_id in locations:
+                stream_id, number = locations[obj_id]
+                rows += b"\x02" + stream_id.to_bytes(4, "big") + number.to_bytes(2, "big")
+            else:
+                rows += b"\x01" + offsets[obj_id].to_bytes(4, "big") + b"\x00\x00"
+        stream = zlib.compress(bytes(rows), self.compression_level)
+        packed += (
+            f"{xref_id} 0 obj\n<< /Type /XRef /Size {xref_id + 1} /W [1 4 2] "
+            f"{' '.join(trailer_entries)} /Filter /FlateDecode /Length {len(stream)} >>\n"
+            f"stream\n"
+        ).encode("latin1") + stream + (
+            f"\nendstream\nendobj\nstartxref\n{offsets[xref_id]}\n%%EOF\n"
+        ).encode("latin1")
+        return packed
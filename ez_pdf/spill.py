@@ -0,0 +1,114 @@
+"""
+    Spilling of completed page contents to disk for very long documents
+"""
+import hashlib
+import zlib
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+from fpdf.output import PDFPage
+from .forms import PDFStream
+
+
+class PageSpill:
+    """Temporary file holding the content streams of completed pages.
+
+    Spilled pages keep their PDFPage object with empty contents; the contents
+    are read back one page at a time while the document is serialized.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        """Creates an empty spill file.
+
+        Args:
+            directory (str, optional): Directory of the spill file. Defaults to
+                the system temporary directory.
+        """
+        import tempfile  # pylint: disable=import-outside-toplevel
+        self._file: BinaryIO = tempfile.TemporaryFile(dir=directory)
+        self._pages: Dict[int, Tuple[int, int]] = {}
+        self.size: int = 0
+
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._pages
+
+
+    def spill(
+        self,
+        page: PDFPage
+    ) -> None:
+        """Moves the contents of a completed page to the spill file.
+
+        Args:
+            page (PDFPage): Page whose contents will not change anymore.
+        """
+        contents = page.contents
+        self._file.seek(self.size)
+        self._file.write(contents)
+        self._pages[page.index()] = (self.size, len(contents))
+        self.size += len(contents)
+        page.contents = bytearray()
+
+
+    def read(
+        self,
+        index: int
+    ) -> bytes:
+        """Reads the contents of a spilled page back.
+
+        Args:
+            index (int): Number of the page, starting at 1.
+
+        Returns:
+            bytes: Content stream operators of the page.
+        """
+        offset, length = self._pages[index]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+
+    def close(self) -> None:
+        """Deletes the spill file."""
+        self._file.close()
+        self._pages.clear()
+
+
+class SpilledStream(PDFStream):
+    """Page content stream loaded, and deflated, only while it is serialized."""
+    def __init__(self, load: Callable[[], bytes], compression_level: Optional[int] = -1):
+        super().__init__(b"", compression_level)
+        self._load = load
+        self._compression_level = compression_level
+
+
+    def serialize(self, obj_dict=None, _security_handler=None):
+        contents = self._load()
+        if self._compression_level is not None:
+            contents = zlib.compress(contents, self._compression_level)
+        self._contents = contents
+        self.length = len(contents)
+        try:
+            return super().serialize(obj_dict, _security_handler)
+        finally:
+            self._contents = b""
+
+
+class StreamBuffer:
+    """Write-through stand-in for the output buffer of an OutputProducer.
+
+    Serialized objects go straight to the stream, only the position and a
+    running hash for the file identifier are kept.
+    """
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.position: int = 0
+        self.md5 = hashlib.new("md5", usedforsecurity=False)  # nosec B324
+
+
+    def __len__(self) -> int:
+        return self.position
+
+
+    def __iadd__(self, data: bytes) -> "StreamBuffer":
+        self.stream.write(data)
+        self.md5.update(data)
+        self.position += len(data)
+        return self
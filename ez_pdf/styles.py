@@ -0,0 +1,104 @@
+"""
+    Immutable cell styles shared by any number of rows
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from .ez_pdf import ColumnSpec
+
+Cells = Tuple[Tuple[float, float, str, Union[int, str], bool], ...]
+
+
+class _StyleFields(NamedTuple):
+    """Fields of Style, which checks them on creation."""
+    font: Optional[str] = None
+    font_size: Optional[float] = None
+    fill: Optional[Tuple[int, int, int]] = None
+    border: Optional[Union[int, str]] = None
+    align: Optional[str] = None
+
+
+class Style(_StyleFields):
+    """Look of a row, applied over the layout of its ColumnSpec.
+
+    Styles are immutable and hashable, so one style object is declared once
+    and referenced by every row that uses it. Fields left as None keep the
+    document font or the column's own setting.
+
+    Attributes:
+        font (str, optional): Font family of the row. Defaults to the document font.
+        font_size (float, optional): Font size of the row. Defaults to the
+            document font size.
+        fill (Tuple[int, int, int], optional): RGB color (0-255) filling every
+            cell of the row, given as any sequence of three ints. Defaults to
+            the column spec fills.
+        border (Union[int, str], optional): Border of every cell. Can be 0, 1,
+            or string containing LRTB. Defaults to the column spec borders.
+        align (str, optional): Text alignment of every cell (L, C, X or R).
+            Defaults to the column spec aligns.
+
+    Raises:
+        ValueError: Fill is not three color codes between 0 and 255.
+    """
+    __slots__ = ()
+
+    def __new__(
+        cls,
+        font: Optional[str] = None,
+        font_size: Optional[float] = None,
+        fill: Optional[Sequence[int]] = None,
+        border: Optional[Union[int, str]] = None,
+        align: Optional[str] = None
+    ):
+        if fill is not None:
+            fill = tuple(fill)
+            if len(fill) != 3 or not all(
+                isinstance(code, int) and 0 <= code <= 255 for code in fill
+            ):
+                raise ValueError(
+                    f"Style fill must be three color codes (0-255). Currently {fill}"
+                    )
+        return super().__new__(cls, font, font_size, fill, border, align)
+
+
+def styled_cells(
+    columns: "ColumnSpec",
+    style: Optional[Style]
+) -> Tuple[Cells, Optional[Tuple[int, int, int]]]:
+    """Cells of a column spec with a style applied.
+
+    Args:
+        columns (ColumnSpec): Layout of the columns.
+        style (Optional[Style]): Style of the row.
+
+    Returns:
+        Tuple[Cells, Optional[Tuple[int, int, int]]]: Resolved x offset, width,
+            align, border and fill of each cell, and the fill color of the
+            filled cells, None if no cell is filled.
+    """
+    if style is None:
+        return columns.cells, columns.fill_color
+    return _styled_cells(columns.cells, columns.fill_color, style)
+
+
+# Keyed on the resolved cells rather than the ColumnSpec, so equal layouts share
+# an entry and no layout object is kept alive
+@lru_cache(maxsize=256)
+def _styled_cells(
+    cells: Cells,
+    fill_color: Optional[Tuple[int, int, int]],
+    style: Style
+) -> Tuple[Cells, Optional[Tuple[int, int, int]]]:
+    """Cells with a style applied, resolved once per distinct layout and style."""
+    styled = tuple(
+        (
+            x_offset,
+            width,
+            align if style.align is None else style.align,
+            border if style.border is None else style.border,
+            fill or style.fill is not None,
+        )
+        for x_offset, width, align, border, fill in cells
+    )
+    return styled, fill_color if style.fill is None else style.fill
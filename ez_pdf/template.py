@@ -0,0 +1,220 @@
+"""
+    Declarative document templates compiled once and rendered many times
+"""
+from string import Formatter
+from typing import Any, Callable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+from fpdf.errors import FPDFPageFormatException
+from fpdf.fpdf import get_page_format
+from .ez_pdf import ColumnSpec, EzPDF
+
+Step = Callable[[EzPDF, Mapping[str, Any]], None]
+
+
+class RowTemplate(NamedTuple):
+    """Row whose cell texts may reference context values, e.g. "Client {name}".
+
+    Attributes:
+        texts (Sequence[str]): str.format templates, one per cell.
+        widths (Sequence[float]): Width of each cell as a percentage of available space.
+        aligns (Sequence[str], optional): Text alignment of each cell. Defaults to "C".
+        fills (Sequence[bool], optional): Option to fill each cell with set color.
+            Defaults to False.
+        border (Union[int, str], optional): Can be 0, 1, or string containing LRTB.
+            Defaults to 1.
+        cell_height (float, optional): Height of cell. Defaults to 0.5.
+        new_line (int, optional): 1 to move to a new line after the row. Defaults to 1.
+        r (int, optional): Color code for red (0-255). Defaults to 0.
+        g (int, optional): Color code for green (0-255). Defaults to 0.
+        b (int, optional): Color code for blue (0-255). Defaults to 0.
+    """
+    texts: Sequence[str]
+    widths: Sequence[float]
+    aligns: Optional[Sequence[str]] = None
+    fills: Optional[Sequence[bool]] = None
+    border: Union[int, str] = 1
+    cell_height: float = 0.5
+    new_line: int = 1
+    r: int = 0
+    g: int = 0
+    b: int = 0
+
+
+class EmptyRowTemplate(NamedTuple):
+    """Empty row.
+
+    Attributes:
+        height (float, optional): Height of empty cell. Defaults to 0.5.
+    """
+    height: float = 0.5
+
+
+class TableTemplate(NamedTuple):
+    """Rows taken from a context value at render time.
+
+    Attributes:
+        key (str): Context key holding an iterable of rows, each with one text per column.
+        columns (ColumnSpec): Layout of the columns.
+        cell_height (float, optional): Height of cell. Defaults to 0.5.
+    """
+    key: str
+    columns: ColumnSpec
+    cell_height: float = 0.5
+
+
+class DocumentTemplate(NamedTuple):
+    """Layout of a document, declared once.
+
+    Attributes:
+        rows (Sequence[Union[RowTemplate, EmptyRowTemplate, TableTemplate]]):
+            Content of the document, top to bottom.
+        page_format (Union[str, Tuple[float, float]], optional): One of 'a3', 'a4',
+            'a5', 'letter', or 'legal', or the portrait width and height in inches.
+            Rows are laid out across the width of this page. Defaults to "legal".
+        font (str, optional): Font of the document. Defaults to "times".
+        font_size (int, optional): Font size. Defaults to 8.
+        margin (float, optional): Margin of page in given format (default inches).
+            Defaults to 0.5.
+        orientation (str, optional): "portrait" or "landscape". Defaults to "portrait".
+    """
+    rows: Sequence[Union[RowTemplate, EmptyRowTemplate, TableTemplate]]
+    page_format: Union[str, Tuple[float, float]] = "legal"
+    font: str = "times"
+    font_size: int = 8
+    margin: float = 0.5
+    orientation: str = "portrait"
+
+    def compile(self) -> "CompiledTemplate":
+        """Validates the layout and resolves it into a render plan.
+
+        Raises:
+            ValueError: Unknown page format or orientation, or row widths do not
+                add up to 1 or do not match its texts.
+            TypeError: Unknown row type.
+
+        Returns:
+            CompiledTemplate: Plan that renders the layout against data contexts.
+        """
+        page_width: float = self.page_width()
+        return CompiledTemplate(self, [self._compile_row(row, page_width) for row in self.rows])
+
+
+    def page_width(self) -> float:
+        """Width of the template's pages, in inches.
+
+        Raises:
+            ValueError: Unknown page format or orientation.
+
+        Returns:
+            float: Width of a page of page_format in the template's orientation.
+        """
+        try:
+            # EzPDF documents are in inches, 72 points each
+            width, height = get_page_format(self.page_format, 72)
+        except FPDFPageFormatException as error:
+            raise ValueError(
+                f"Unknown page format. Currently {self.page_format}"
+                ) from error
+        orientation: str = self.orientation.lower()
+        if orientation in ("p", "portrait"):
+            return width / 72
+        if orientation in ("l", "landscape"):
+            return height / 72
+        raise ValueError(
+            f"Orientation must be portrait or landscape. Currently {self.orientation}"
+            )
+
+
+    def _compile_row(
+        self,
+        row: Union[RowTemplate, EmptyRowTemplate, TableTemplate],
+        page_width: float
+    ) -> Step:
+        """Turns one declared row into a render step."""
+        if isinstance(row, RowTemplate):
+            if len(row.texts) != len(row.widths):
+                raise ValueError(
+                    f"Row template has {len(row.texts)} texts but {len(row.widths)} widths."
+                    )
+            column_spec = ColumnSpec(
+                row.widths,
+                aligns=row.aligns,
+                fills=row.fills,
+                borders=[row.border] * len(row.widths),
+                page_width=page_width,
+                margin=self.margin,
+                r=row.r,
+                g=row.g,
+                b=row.b
+            )
+            return _row_step(
+                [_compile_text(text) for text in row.texts],
+                column_spec,
+                row.cell_height,
+                row.new_line
+            )
+
+        if isinstance(row, EmptyRowTemplate):
+            height: float = row.height
+            return lambda pdf, context: pdf.add_empty_row(height)
+
+        if isinstance(row, TableTemplate):
+            key, columns, cell_height = row
+            return lambda pdf, context: pdf.add_rows(
+                context[key], columns, cell_height=cell_height
+            )
+
+        raise TypeError(f"Unknown row template {type(row).__name__}")
+
+
+class CompiledTemplate:
+    """Render plan of a DocumentTemplate."""
+    def __init__(self, template: DocumentTemplate, steps: List[Step]):
+        self.template = template
+        self._steps = steps
+
+
+    def render(
+        self,
+        context: Mapping[str, Any]
+    ) -> EzPDF:
+        """Renders the template against a data context.
+
+        Args:
+            context (Mapping[str, Any]): Values referenced by the row texts and tables.
+
+        Returns:
+            EzPDF: Filled document, ready to export.
+        """
+        template = self.template
+        pdf = EzPDF(font=template.font, font_size=template.font_size)
+        pdf.add_page(page_format=template.page_format, orientation=template.orientation)
+        for step in self._steps:
+            step(pdf, context)
+        return pdf
+
+
+def _compile_text(text: str) -> Callable[[Mapping[str, Any]], str]:
+    """Returns a formatter for text, skipping str.format for constant text."""
+    if all(field is None for _, field, _, _ in Formatter().parse(text)):
+        constant: str = text.replace("{{", "{").replace("}}", "}")
+        return lambda context: constant
+    return text.format_map
+
+
+def _row_step(
+    formatters: List[Callable[[Mapping[str, Any]], str]],
+    column_spec: ColumnSpec,
+    cell_height: float,
+    new_line: int
+) -> Step:
+    """Returns a step rendering one templated row with a resolved layout,
+    through EzPDF.add_rows so it gets the same font, fill and page break
+    handling as any other row."""
+    def step(pdf: EzPDF, context: Mapping[str, Any]) -> None:
+        pdf.add_rows(
+            ([formatter(context) for formatter in formatters],),
+            column_spec,
+            cell_height=cell_height,
+            new_line=new_line
+        )
+    return step
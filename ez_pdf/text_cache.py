@@ -0,0 +1,145 @@
+"""
+    Bounded cache of text measurements used by EzPDF layout
+"""
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple, Union
+from fpdf import FPDF
+from fpdf.enums import MethodReturnValue
+
+
+class TextCacheInfo(NamedTuple):
+    """Hit/miss counters of a TextCache."""
+    hits: int
+    misses: int
+    max_size: int
+    size: int
+
+
+class TextCache:
+    """LRU cache of string widths and wrapped lines.
+
+    Entries are keyed on (font family, style, size, text, cell width), where a
+    cell width of None marks a plain string width.
+    """
+    def __init__(self, max_size: int = 4096):
+        """Creates an empty cache.
+
+        Args:
+            max_size (int, optional): Maximum number of entries kept. 0 disables
+                caching. Defaults to 4096.
+
+        Raises:
+            ValueError: Max size can not be negative.
+        """
+        if max_size < 0:
+            raise ValueError(f"Text cache max size can not be negative. Currently {max_size}")
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[tuple, Union[float, Tuple[str, ...]]]" = OrderedDict()
+
+
+    def _get(self, key: tuple) -> Optional[Union[float, Tuple[str, ...]]]:
+        """Returns a cached value and marks it as recently used."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+
+    def _put(self, key: tuple, value: Union[float, Tuple[str, ...]]) -> None:
+        """Stores a value, evicting the least recently used entry when full."""
+        if not self.max_size:
+            return
+        self._entries[key] = value
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+    def string_width(
+        self,
+        pdf: FPDF,
+        text: str
+    ) -> float:
+        """Width of text in the current font of pdf.
+
+        Args:
+            pdf (FPDF): Document whose current font is used.
+            text (str): Text to measure.
+
+        Returns:
+            float: Width of text in user units.
+        """
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, text, None)
+        width = self._get(key)
+        if width is None:
+            width = pdf.get_string_width(text)
+            self._put(key, width)
+        return width
+
+
+    def split_lines(
+        self,
+        pdf: FPDF,
+        text: str,
+        cell_width: float
+    ) -> Tuple[str, ...]:
+        """Lines text wraps to in a multi_cell of cell_width.
+
+        Args:
+            pdf (FPDF): Document whose current font is used.
+            text (str): Text to wrap.
+            cell_width (float): Width of the cell in user units.
+
+        Returns:
+            Tuple[str, ...]: Wrapped lines.
+        """
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, text, cell_width)
+        lines = self._get(key)
+        if lines is None:
+            lines = tuple(pdf.multi_cell(
+                w=cell_width,
+                txt=text,
+                dry_run=True,
+                output=MethodReturnValue.LINES
+            ))
+            self._put(key, lines)
+        return lines
+
+
+    def fits_one_line(
+        self,
+        pdf: FPDF,
+        text: str,
+        cell_width: float
+    ) -> bool:
+        """Checks if text fits on a single line of a cell without wrapping.
+
+        Args:
+            pdf (FPDF): Document whose current font is used.
+            text (str): Text to check.
+            cell_width (float): Width of the cell in user units.
+
+        Returns:
+            bool: True when text needs no line break.
+        """
+        if "\n" in text:
+            return False
+        # Stay clear of the exact boundary so float rounding can never disagree
+        # with fpdf's own line breaking.
+        return self.string_width(pdf, text) < cell_width - 2 * pdf.c_margin - 1e-6
+
+
+    def cache_info(self) -> TextCacheInfo:
+        """Returns hit/miss counters and the current size of the cache."""
+        return TextCacheInfo(self.hits, self.misses, self.max_size, len(self._entries))
+
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
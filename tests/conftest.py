@@ -0,0 +1,15 @@
+"""
+    Shared fixtures of the test suite
+"""
+from typing import Callable, List
+import pytest
+from ez_pdf.ez_pdf import EzPDF
+
+
+@pytest.fixture
+def pages_with() -> Callable[[EzPDF, str], List[int]]:
+    """Numbers of the pages whose content shows a text."""
+    def pages(pdf: EzPDF, text: str) -> List[int]:
+        token = f"({text}) Tj".encode("latin1")
+        return [number for number, page in pdf.pdf.pages.items() if token in page.contents]
+    return pages
@@ -0,0 +1,115 @@
+"""
+    Tests of AsyncRenderer and AsyncEzPDF
+"""
+import asyncio
+import threading
+import time
+import pytest
+from ez_pdf.aio import AsyncEzPDF, AsyncRenderer, default_renderer
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+COLUMNS = ColumnSpec((0.5, 0.5))
+
+
+def statement(rows: int) -> EzPDF:
+    """Module level builder, so process pools can pickle it."""
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_rows([(f"a{i}", "b") for i in range(rows)], COLUMNS, cell_height=0.25)
+    return pdf
+
+
+def test_renders_are_limited_to_max_concurrency():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work() -> None:
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    async def main() -> None:
+        async with AsyncRenderer(max_workers=4, max_concurrency=2) as renderer:
+            await asyncio.gather(*(renderer.run(work) for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak[0] == 2
+
+
+def test_cancelled_render_that_has_not_started_never_runs():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def blocking() -> None:
+        started.set()
+        release.wait(5)
+
+    async def main() -> None:
+        async with AsyncRenderer(max_workers=2, max_concurrency=1) as renderer:
+            first = asyncio.create_task(renderer.run(blocking))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            queued = asyncio.create_task(renderer.run(calls.append, "ran"))
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            release.set()
+            await first
+            assert await renderer.run(len, "abc") == 3
+
+    asyncio.run(main())
+    assert calls == []
+
+
+def test_cancelled_export_leaves_the_renderer_usable():
+    async def main() -> bytes:
+        async with AsyncRenderer() as renderer:
+            pdf = AsyncEzPDF(renderer=renderer)
+            pdf.add_page()
+            # Cancellation is checked between recorded calls
+            for i in range(2000):
+                pdf.add_rows([(f"a{i}", "b")] * 10, COLUMNS, cell_height=0.25)
+            task = asyncio.create_task(pdf.export_bytes_async())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await renderer.render_bytes(statement, 10)
+
+    assert asyncio.run(main()).startswith(b"%PDF-")
+
+
+def test_default_renderer_is_reused_across_event_loops():
+    async def main() -> list:
+        # More renders than the single slot of the default renderer, so they
+        # wait on its semaphore
+        return await asyncio.gather(
+            *(default_renderer().render_bytes(statement, 50) for _ in range(3))
+        )
+
+    for _ in range(2):
+        assert all(data.startswith(b"%PDF-") for data in asyncio.run(main()))
+    assert default_renderer() is default_renderer()
+
+
+def test_stream_yields_the_whole_document():
+    async def main() -> list:
+        async with AsyncRenderer() as renderer:
+            expected = await renderer.render_bytes(statement, 200)
+            chunks = [chunk async for chunk in renderer.stream(statement, 200, chunk_size=1000)]
+            return expected, chunks
+
+    expected, chunks = asyncio.run(main())
+    assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+    assert len(b"".join(chunks)) == len(expected)
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError, match="Max workers"):
+        AsyncRenderer(max_workers=0)
+    with pytest.raises(ValueError, match="Max concurrency"):
+        AsyncRenderer(max_concurrency=0)
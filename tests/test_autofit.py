@@ -0,0 +1,67 @@
+"""
+    Tests of AutoColumns and EzPDF.fit_columns
+"""
+import pytest
+from ez_pdf.ez_pdf import AutoColumns, EzPDF
+
+
+def test_fit_keeps_widths_within_bounds():
+    spec = AutoColumns(min_widths=0.1, max_widths=0.6).fit([1.0, 50.0, 2.0])
+    widths = [cell[1] for cell in spec.cells]
+    available = sum(widths)
+    shares = [width / available for width in widths]
+    assert sum(shares) == pytest.approx(1)
+    assert all(0.1 - 1e-6 <= share <= 0.6 + 1e-6 for share in shares)
+    assert shares[1] == pytest.approx(0.6)
+
+
+def test_fit_is_proportional_without_bounds():
+    spec = AutoColumns(min_widths=0.0).fit([1.0, 3.0])
+    widths = [cell[1] for cell in spec.cells]
+    assert widths[1] == pytest.approx(3 * widths[0])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"min_widths": 0.6},
+        {"max_widths": 0.2},
+        {"min_widths": (0.5, 0.1), "max_widths": (0.4, 1.0)},
+    ],
+)
+def test_fit_rejects_bounds_that_can_not_add_up(kwargs):
+    with pytest.raises(ValueError):
+        AutoColumns(**kwargs).fit([1.0, 1.0])
+
+
+def test_sample_must_be_positive():
+    with pytest.raises(ValueError, match="sample"):
+        AutoColumns(sample=0)
+
+
+def test_fit_columns_gives_wider_text_more_space():
+    pdf = EzPDF()
+    pdf.add_page()
+    spec = pdf.fit_columns([("a", "a much longer piece of text")], AutoColumns())
+    assert spec.cells[1][1] > spec.cells[0][1]
+
+
+def test_fit_columns_rejects_rows_of_different_lengths():
+    pdf = EzPDF()
+    pdf.add_page()
+    with pytest.raises(ValueError, match="Row has 2 cells but first row has 3"):
+        pdf.fit_columns([("a", "bb", "c"), ("x", "y")], AutoColumns())
+    with pytest.raises(ValueError, match="but header has 2"):
+        pdf.fit_columns([("a", "b", "c")], AutoColumns(), header=("h", "i"))
+
+
+def test_fit_columns_needs_a_header_or_rows():
+    with pytest.raises(ValueError, match="at least one row"):
+        EzPDF().fit_columns([], AutoColumns())
+
+
+def test_add_table_with_auto_columns():
+    pdf = EzPDF()
+    pdf.add_page()
+    rows = [(str(i), f"item {i}") for i in range(50)]
+    assert pdf.add_table(rows, AutoColumns(sample=10), header=("n", "description")) == 50
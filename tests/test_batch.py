@@ -0,0 +1,82 @@
+"""
+    Tests of render_many and iter_render
+"""
+import os
+import pytest
+from ez_pdf.batch import RenderJob, iter_render, render_many
+from ez_pdf.ez_pdf import EzPDF
+
+
+def statement(client: int) -> EzPDF:
+    """Module level builder, so worker processes can unpickle it."""
+    if client < 0:
+        raise ValueError(f"No client {client}")
+    pdf = EzPDF()
+    pdf.set_compression(False)
+    pdf.add_page()
+    pdf.add_one_cell_row(f"Statement for client {client}")
+    return pdf
+
+
+def jobs(directory, clients) -> list:
+    return [RenderJob(os.path.join(str(directory), f"{client}.pdf"), client) for client in clients]
+
+
+def client_of(path: str) -> int:
+    """Client number shown in an exported statement."""
+    with open(path, "rb") as file:
+        data = file.read()
+    start = data.index(b"(Statement for client ") + len(b"(Statement for client ")
+    return int(data[start:data.index(b")", start)])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_render_many_keeps_job_order(tmp_path, workers):
+    clients = list(range(12))
+    results = render_many(jobs(tmp_path, clients), statement, workers=workers, chunksize=3)
+    assert [result.output for result in results] == [job.output for job in jobs(tmp_path, clients)]
+    assert all(result.error is None and result.seconds > 0 for result in results)
+    assert [client_of(result.output) for result in results] == clients
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_render_keeps_job_order(tmp_path, workers):
+    clients = list(range(10))
+    pulled = []
+
+    def lazy_jobs():
+        for job in jobs(tmp_path, clients):
+            pulled.append(job)
+            yield job
+
+    results = iter_render(lazy_jobs(), statement, workers=workers, max_pending=2)
+    first = next(results)
+    # Jobs are pulled as results are consumed, not all up front
+    assert len(pulled) < len(clients)
+    assert [first.output, *(result.output for result in results)] == [
+        job.output for job in jobs(tmp_path, clients)
+    ]
+
+
+@pytest.mark.parametrize("render", [render_many, iter_render])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failing_job_reports_its_error(tmp_path, render, workers):
+    results = list(render(jobs(tmp_path, [1, -1, 2]), statement, workers=workers))
+    assert [result.error is None for result in results] == [True, False, True]
+    assert "ValueError: No client -1" in results[1].error
+    assert not os.path.exists(results[1].output)
+    assert client_of(results[2].output) == 2
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda: render_many([], statement, workers=0),
+        lambda: render_many([], statement, chunksize=0),
+        lambda: list(iter_render([], statement, workers=0)),
+        lambda: list(iter_render([], statement, max_pending=0)),
+    ],
+)
+def test_invalid_settings_are_rejected(call):
+    with pytest.raises(ValueError):
+        call()
@@ -0,0 +1,120 @@
+"""
+    Tests of RenderCache and CachedEzPDF
+"""
+import os
+import threading
+from datetime import datetime, timezone
+import pytest
+from ez_pdf.cache import CachedEzPDF, RenderCache
+from ez_pdf.ez_pdf import ColumnSpec
+from ez_pdf.styles import Style
+
+CREATION_DATE = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def statement(cache: RenderCache, client: str = "Ada", fill=(230, 230, 230)) -> CachedEzPDF:
+    pdf = CachedEzPDF(cache=cache, creation_date=CREATION_DATE)
+    pdf.add_page()
+    pdf.add_rows(
+        [(client, "2023-01-01", "12.50")] * 3,
+        ColumnSpec((0.4, 0.3, 0.3)),
+        style=Style(fill=fill)
+    )
+    return pdf
+
+
+def test_repeated_document_is_a_hit(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    first = statement(cache)
+    data = first.export_bytes()
+    assert first.hit is False
+    second = statement(cache)
+    assert second.export_bytes() == data
+    assert second.hit is True
+    assert cache.info()[:3] == (1, 1, 1)
+    assert cache.hit_rate == 0.5
+
+
+@pytest.mark.parametrize("change", [{"client": "Bob"}, {"fill": (0, 0, 255)}])
+def test_changed_argument_is_a_miss(tmp_path, change):
+    cache = RenderCache(str(tmp_path))
+    statement(cache).export_bytes()
+    changed = statement(cache, **change)
+    assert changed.key != statement(cache).key
+    changed.export_bytes()
+    assert changed.hit is False
+    assert cache.info().entries == 2
+
+
+def test_changed_file_contents_are_a_miss(tmp_path):
+    pil_image = pytest.importorskip("PIL.Image")
+    logo = str(tmp_path / "logo.png")
+    pil_image.new("RGB", (20, 10), (255, 0, 0)).save(logo)
+    cache = RenderCache(str(tmp_path / "cache"))
+
+    def with_logo() -> CachedEzPDF:
+        pdf = CachedEzPDF(cache=cache)
+        pdf.add_page()
+        pdf.add_logo(logo)
+        return pdf
+
+    key = with_logo().key
+    pil_image.new("RGB", (20, 10), (0, 0, 255)).save(logo)
+    assert with_logo().key != key
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    for i, key in enumerate("abc"):
+        cache.put(key, b"x" * 100)
+        os.utime(os.path.join(str(tmp_path), f"{key}.pdf"), (1000 + i, 1000 + i))
+    # Reading a marks it as the most recently used
+    assert cache.get("a") == b"x" * 100
+    cache.max_bytes = 250
+    cache.put("d", b"y" * 100)
+    assert cache.get("b") is None
+    assert cache.get("c") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.info().size == 200
+
+
+def test_documents_larger_than_the_cache_are_not_stored(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=10)
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    with pytest.raises(ValueError):
+        RenderCache(str(tmp_path), max_bytes=0)
+
+
+def test_concurrent_writers_of_one_key(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    payloads = [bytes([i]) * 100000 for i in range(8)]
+    threads = [threading.Thread(target=cache.put, args=("same", data)) for data in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.get("same") in payloads
+    assert os.listdir(str(tmp_path)) == ["same.pdf"]
+
+
+def test_unserializable_arguments_are_rejected(tmp_path):
+    pdf = CachedEzPDF(cache=RenderCache(str(tmp_path)))
+    pdf.add_page()
+    pdf.add_rows([(object(),)], ColumnSpec((1.0,)))
+    with pytest.raises(TypeError):
+        pdf.key  # pylint: disable=pointless-statement
+
+
+def test_clear_removes_every_entry(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    statement(cache).export_bytes()
+    cache.clear()
+    assert cache.info()[:4] == (0, 0, 0, 0)
+
+
+def test_key_changes_with_the_ez_pdf_source(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path))
+    key = statement(cache).key
+    monkeypatch.setattr("ez_pdf.cache._code_digest", lambda: "0" * 64)
+    assert statement(cache).key != key
@@ -0,0 +1,129 @@
+"""
+    Tests of the ezpdf command line
+"""
+import json
+import pytest
+from ez_pdf.cli import main
+
+CLIENTS = [
+    {"name": "Ada", "branch": "north", "balance": 10.5},
+    {"name": "Bob", "branch": "north", "balance": None},
+    {"name": "Cy", "branch": "south/east", "balance": 3},
+]
+
+
+@pytest.fixture
+def layout(tmp_path):
+    """Path of a three column layout."""
+    path = tmp_path / "layout.json"
+    path.write_text(json.dumps({
+        "columns": [
+            {"field": "name", "title": "Client", "width": 0.5, "align": "L"},
+            {"field": "branch", "width": 0.2},
+            {"field": "balance", "width": 0.3, "align": "R", "fill": True},
+        ],
+        "title": "Clients of {key}",
+        "fill_color": [230, 230, 230],
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def csv_data(tmp_path):
+    """Path of the clients as CSV."""
+    path = tmp_path / "clients.csv"
+    lines = ["name,branch,balance"] + [
+        f"{row['name']},{row['branch']},{'' if row['balance'] is None else row['balance']}"
+        for row in CLIENTS
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def jsonl_data(tmp_path):
+    """Path of the clients as JSON Lines."""
+    path = tmp_path / "clients.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in CLIENTS) + "\n\n")
+    return str(path)
+
+
+def is_pdf(path) -> bool:
+    with open(path, "rb") as file:
+        return file.read(5) == b"%PDF-"
+
+
+@pytest.mark.parametrize("data", ["csv_data", "jsonl_data"])
+def test_renders_one_document(request, layout, data, tmp_path):
+    output = tmp_path / "clients.pdf"
+    assert main([layout, request.getfixturevalue(data), "-o", str(output), "-q"]) == 0
+    assert is_pdf(output)
+
+
+@pytest.mark.parametrize("jobs", [[], ["--jobs", "2"]])
+def test_split_by_writes_one_document_per_group(layout, csv_data, tmp_path, jobs):
+    output = tmp_path / "branches"
+    assert main([layout, csv_data, "-o", str(output), "--split-by", "branch", "-q", *jobs]) == 0
+    assert sorted(path.name for path in output.iterdir()) == ["north.pdf", "south_east.pdf"]
+    assert all(is_pdf(path) for path in output.iterdir())
+
+
+def test_split_by_output_pattern(layout, jsonl_data, tmp_path):
+    pattern = str(tmp_path / "statement-{key}.pdf")
+    assert main([layout, jsonl_data, "-o", pattern, "--split-by", "name", "-q"]) == 0
+    assert sorted(path.name for path in tmp_path.glob("statement-*")) == [
+        "statement-Ada.pdf", "statement-Bob.pdf", "statement-Cy.pdf"
+    ]
+
+
+@pytest.mark.parametrize("data", ["csv_data", "jsonl_data"])
+def test_unknown_split_by_field_fails(request, layout, data, tmp_path, capsys):
+    output = tmp_path / "branches"
+    args = [layout, request.getfixturevalue(data), "-o", str(output), "--split-by", "brnach"]
+    assert main(args + ["-q"]) == 1
+    assert "Record 1 has no field brnach" in capsys.readouterr().err
+    assert not list(output.iterdir())
+
+
+def test_groups_must_be_consecutive(layout, tmp_path, capsys):
+    data = tmp_path / "unsorted.jsonl"
+    data.write_text("\n".join(json.dumps(row) for row in CLIENTS + CLIENTS[:1]))
+    args = [layout, str(data), "-o", str(tmp_path / "out"), "--split-by", "branch", "-q"]
+    assert main(args) == 1
+    assert "not consecutive" in capsys.readouterr().err
+
+
+def test_jobs_needs_split_by(layout, csv_data, tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main([layout, csv_data, "-o", str(tmp_path / "out.pdf"), "--jobs", "2"])
+    assert exit_info.value.code == 2
+
+
+def test_malformed_data_fails_without_traceback(layout, tmp_path, capsys):
+    csv_file = tmp_path / "huge.csv"
+    csv_file.write_text("name,branch,balance\n" + "x" * 200000 + ",a,1\n")
+    assert main([layout, str(csv_file), "-o", str(tmp_path / "out.pdf"), "-q"]) == 1
+    assert "field larger than field limit" in capsys.readouterr().err
+    json_file = tmp_path / "list.jsonl"
+    json_file.write_text("[1, 2]\n")
+    assert main([layout, str(json_file), "-o", str(tmp_path / "out.pdf"), "-q"]) == 1
+    assert "Line 1 is not a JSON object" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "layout_data",
+    [{}, {"columns": [{"field": "a"}]}, {"columns": [{"field": "a", "width": 0.5}]}],
+)
+def test_invalid_layouts_and_missing_files_exit_with_usage_error(tmp_path, csv_data, layout_data):
+    layout_file = tmp_path / "bad.json"
+    layout_file.write_text(json.dumps(layout_data))
+    for args in ([str(layout_file), csv_data], [str(tmp_path / "missing.json"), csv_data]):
+        with pytest.raises(SystemExit) as exit_info:
+            main([*args, "-o", str(tmp_path / "out.pdf")])
+        assert exit_info.value.code == 2
+
+
+def test_missing_data_file_exits_with_usage_error(layout, tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main([layout, str(tmp_path / "missing.csv"), "-o", str(tmp_path / "out.pdf")])
+    assert exit_info.value.code == 2
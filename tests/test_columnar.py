@@ -0,0 +1,95 @@
+"""
+    Tests of ColumnarTable and EzPDF.add_columnar_table
+"""
+import pickle
+import pytest
+from ez_pdf.columnar import ColumnarTable
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+COLUMNS = ColumnSpec((0.4, 0.3, 0.3))
+
+
+def services(count: int = 2000) -> ColumnarTable:
+    """Table of text, integer and float columns with some missing values."""
+    table = ColumnarTable(
+        COLUMNS, names=("service", "count", "amount"), formats=(None, "%d", "%.2f"), na_rep="-"
+    )
+    table.extend(
+        (f"Service {i % 7}", None if i % 10 == 0 else i, i * 12.5) for i in range(count)
+    )
+    return table
+
+
+def test_rows_decode_by_position_and_name():
+    table = services()
+    assert len(table) == 2000
+    assert tuple(table[3]) == ("Service 3", "3", "37.50")
+    assert table[-1]["amount"] == "24987.50"
+    assert table[10]["count"] == "-"
+    assert table[21][1:] == ("21", "262.50")
+    with pytest.raises(IndexError):
+        table[2000]  # pylint: disable=pointless-statement
+    with pytest.raises(KeyError):
+        table.position("missing")
+
+
+def test_rows_of_the_wrong_length_are_rejected():
+    with pytest.raises(ValueError, match="Row has 2 cells"):
+        services(0).append(("a", 1))
+    with pytest.raises(ValueError, match="2 names"):
+        ColumnarTable(COLUMNS, names=("a", "b"))
+
+
+def test_pickled_table_keeps_its_rows():
+    table = services()
+    assert list(pickle.loads(pickle.dumps(table)).texts()) == list(table.texts())
+
+
+def test_add_columnar_table_renders_like_add_table():
+    table = services(300)
+    tables = []
+    for columnar in (True, False):
+        pdf = EzPDF()
+        pdf.add_page()
+        if columnar:
+            assert pdf.add_columnar_table(table, cell_height=0.2) == 300
+        else:
+            pdf.add_table(table.texts(), COLUMNS, cell_height=0.2, header=table.names)
+        tables.append([bytes(page.contents) for page in pdf.pdf.pages.values()])
+    assert len(tables[0]) > 1
+    assert tables[0] == tables[1]
+
+
+def test_integer_columns_keep_every_digit():
+    table = ColumnarTable(ColumnSpec((0.5, 0.5)), formats=("%d", "%d"))
+    table.extend([(2**60 + 1, None), (-2**63, 7)])
+    assert list(table.texts()) == [(str(2**60 + 1), ""), (str(-2**63), "7")]
+    assert list(pickle.loads(pickle.dumps(table)).texts()) == list(table.texts())
+    with pytest.raises(ValueError, match="8 bytes"):
+        table.append((2**63, 1))
+
+
+def test_integer_columns_switch_to_floats_only_when_exact():
+    table = ColumnarTable(ColumnSpec((0.5, 0.5)), formats=("%.1f", "%.1f"))
+    table.extend([(1, None), (2.5, 3)])
+    assert list(table.texts()) == [("1.0", ""), ("2.5", "3.0")]
+    table.append((2**53, 4.5))
+    assert table[-1][:] == ("9007199254740992.0", "4.5")
+    with pytest.raises(ValueError, match="2\\*\\*53"):
+        table.append((2**53 + 1, 5))
+    exact = ColumnarTable(ColumnSpec((1.0,)), formats=("%d",))
+    exact.append((2**60 + 1,))
+    with pytest.raises(ValueError, match="2\\*\\*53"):
+        exact.append((0.5,))
+
+
+def test_packed_text_column_pickles_its_bytes():
+    table = ColumnarTable(ColumnSpec((1.0,)))
+    table.extend((f"Customer {i}",) for i in range(10000))
+    state = table.__getstate__()["data"][0]
+    assert isinstance(state["packed"], bytes)
+    assert "texts" not in state
+    restored = pickle.loads(pickle.dumps(table))
+    assert list(restored.texts()) == list(table.texts())
+    restored.append(("Customer 10000",))
+    assert restored[-1][0] == "Customer 10000"
@@ -0,0 +1,95 @@
+"""
+    Tests of EzPDF exports, compression settings and spilled pages
+"""
+import io
+from datetime import datetime, timezone
+import pytest
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+CREATION_DATE = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def statement(pages: int = 3, spill: bool = False, **compression) -> EzPDF:
+    """Document of pages pages of rows, with a fixed creation date."""
+    pdf = EzPDF()
+    pdf.pdf.set_creation_date(CREATION_DATE)
+    if compression:
+        pdf.set_compression(**compression)
+    pdf.add_page()
+    if spill:
+        pdf.spill_pages()
+    pdf.add_rows(
+        ((f"Service {i}", "2023-01-01", f"{i * 12.5:.2f}") for i in range(40 * pages)),
+        ColumnSpec((0.4, 0.3, 0.3)),
+        cell_height=0.3
+    )
+    return pdf
+
+
+def test_exports_write_the_same_bytes(tmp_path):
+    data = bytes(statement().export_bytes())
+    assert data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF")
+    stream = io.BytesIO()
+    statement().export_to(stream)
+    assert stream.getvalue() == data
+    path = tmp_path / "statement.pdf"
+    statement().export(str(path))
+    assert path.read_bytes() == data
+
+
+def test_compression_settings_change_the_output():
+    default = bytes(statement().export_bytes())
+    assert len(bytes(statement(compress=False).export_bytes())) > len(default)
+    assert bytes(statement(level=9).export_bytes()) != default
+    packed = bytes(statement(object_streams=True).export_bytes())
+    assert b"/ObjStm" in packed and b"/ObjStm" not in default
+
+
+def test_spilled_document_exports_the_same_bytes(tmp_path):
+    expected = bytes(statement(pages=5).export_bytes())
+    spilled = statement(pages=5, spill=True)
+    pages = spilled.pdf.pages
+    assert len(pages) >= 5
+    assert all(not pages[index].contents for index in range(1, len(pages)))
+    assert bytes(spilled.export_bytes()) == expected
+    stream = io.BytesIO()
+    statement(pages=5, spill=True).export_to(stream)
+    assert stream.getvalue() == expected
+    path = tmp_path / "spilled.pdf"
+    statement(pages=5, spill=True).export(str(path))
+    assert path.read_bytes() == expected
+
+
+def test_spilled_document_exports_once():
+    pdf = statement(spill=True)
+    pdf.export_bytes()
+    with pytest.raises(ValueError, match="only be exported once"):
+        pdf.export_bytes()
+
+
+def test_spilled_document_reads_back_with_pypdf():
+    pypdf = pytest.importorskip("pypdf")
+    reader = pypdf.PdfReader(io.BytesIO(bytes(statement(spill=True).export_bytes())), strict=True)
+    assert "Service 0" in reader.pages[0].extract_text()
+    assert "Service 119" in reader.pages[-1].extract_text()
+
+
+@pytest.mark.parametrize("level", [-1, 1, 9])
+def test_object_streams_read_back_with_pypdf(level):
+    pypdf = pytest.importorskip("pypdf")
+    pdf = statement(pages=4, level=level, object_streams=True)
+    with pdf.record_form("footer"):
+        pdf.add_one_cell_row("Footer", cell_height=0.25)
+    pdf.stamp_form("footer")
+    data = bytes(pdf.export_bytes())
+    assert b"/ObjStm" in data and b"/XRef" in data
+    reader = pypdf.PdfReader(io.BytesIO(data), strict=True)
+    assert len(reader.pages) == len(pdf.pdf.pages)
+    assert "Service 0" in reader.pages[0].extract_text()
+    assert "Footer" in reader.pages[-1].extract_text()
+    assert reader.pages[-1]["/Resources"]["/XObject"]
+
+
+def test_invalid_compression_level_is_rejected():
+    with pytest.raises(ValueError, match="between -1 and 9"):
+        EzPDF().set_compression(level=10)
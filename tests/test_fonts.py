@@ -0,0 +1,82 @@
+"""
+    Tests of the process-wide FontRegistry and EzPDF.add_font
+"""
+import glob
+from datetime import datetime, timezone
+import pytest
+from ez_pdf.ez_pdf import EzPDF
+from ez_pdf.fonts import FontRegistry, FONT_REGISTRY
+
+pytest.importorskip("fontTools")
+
+CREATION_DATE = datetime(2023, 1, 1, tzinfo=timezone.utc)
+FONT_PATTERNS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/**/DejaVuSans.ttf",
+    "/Library/Fonts/*.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+)
+
+
+@pytest.fixture(scope="module")
+def font_file() -> str:
+    """Path of a TrueType font installed on the system."""
+    for pattern in FONT_PATTERNS:
+        paths = sorted(glob.glob(pattern, recursive=True))
+        if paths:
+            return paths[0]
+    pytest.skip("No TrueType font found on this system")
+    return ""
+
+
+def statement(font_file: str, registry: bool, names=("Zoë Müller", "Søren Ødegård")) -> bytes:
+    pdf = EzPDF()
+    pdf.pdf.set_creation_date(CREATION_DATE)
+    if registry:
+        pdf.add_font("sans", font_file)
+    else:
+        pdf.pdf.add_font("sans", "", font_file)
+    pdf.set_font("sans", 10)
+    pdf.add_page()
+    for name in names:
+        pdf.add_two_cell_row(cell1_text=name, cell2_text="Ñandú Peña", cell1_align="L")
+    return bytes(pdf.export_bytes())
+
+
+def test_registry_output_matches_fpdf_add_font(font_file):
+    assert statement(font_file, registry=True) == statement(font_file, registry=False)
+
+
+def test_documents_using_the_same_glyphs_share_a_subset(font_file):
+    FONT_REGISTRY.clear_subsets()
+    first = statement(font_file, registry=True)
+    assert (FONT_REGISTRY.hits, FONT_REGISTRY.misses) == (0, 1)
+    assert statement(font_file, registry=True) == first
+    assert (FONT_REGISTRY.hits, FONT_REGISTRY.misses) == (1, 1)
+    statement(font_file, registry=True, names=("Łukasz Żak",))
+    assert FONT_REGISTRY.misses == 2
+
+
+def test_subset_cache_evicts_least_recently_used(font_file):
+    registry = FontRegistry(subset_cache_size=2)
+    key = registry.register("sans", font_file)
+    names = registry.glyph_names(key)
+    glyphs = [{names[ord(char)]} for char in "abc"]
+    first = registry.subset(key, glyphs[0])
+    registry.subset(key, glyphs[1])
+    assert registry.subset(key, glyphs[0]) is first
+    registry.subset(key, glyphs[2])
+    registry.subset(key, glyphs[1])
+    assert (registry.hits, registry.misses) == (1, 4)
+
+
+def test_family_can_not_be_registered_to_two_files(font_file, tmp_path):
+    registry = FontRegistry()
+    key = registry.register("sans", font_file)
+    assert registry.register("sans", font_file) == key
+    assert key in registry
+    other = tmp_path / "copy.ttf"
+    with open(font_file, "rb") as source:
+        other.write_bytes(source.read())
+    with pytest.raises(ValueError):
+        registry.register("sans", str(other))
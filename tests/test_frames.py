@@ -0,0 +1,102 @@
+"""
+    Tests of dataframe formatting and EzPDF.add_dataframe
+"""
+import sys
+import pytest
+from ez_pdf.ez_pdf import EzPDF
+from ez_pdf.frames import table_columns
+
+numpy = pytest.importorskip("numpy")
+
+
+def test_numpy_float_column_with_nan_and_integer_format():
+    names, texts = table_columns({"n": numpy.array([1.0, numpy.nan, 3.0])}, formats={"n": "%d"})
+    assert names == ["n"]
+    assert texts == [["1", "", "3"]]
+
+
+def test_numpy_missing_values_use_na_rep():
+    _, texts = table_columns(
+        {"n": numpy.array([numpy.nan, 2.5])}, formats={"n": "%.2f"}, na_rep="-"
+    )
+    assert texts == [["-", "2.50"]]
+
+
+def test_numpy_without_missing_values():
+    _, texts = table_columns(numpy.array([[1, 2], [3, 4]]), formats={1: "%03d"})
+    assert texts == [["1", "3"], ["002", "004"]]
+
+
+def test_pandas_nullable_integer_with_na():
+    pandas = pytest.importorskip("pandas")
+    frame = pandas.DataFrame({
+        "count": pandas.array([1, None, 3], dtype="Int64"),
+        "amount": [1.5, float("nan"), 2.0],
+        "name": ["a", None, "c"],
+    })
+    names, texts = table_columns(
+        frame, formats={"count": "%d", "amount": "%d"}, na_rep="n/a"
+    )
+    assert names == ["count", "amount", "name"]
+    assert texts == [["1", "n/a", "3"], ["1", "n/a", "2"], ["a", "n/a", "c"]]
+
+
+def test_pandas_all_missing_column():
+    pandas = pytest.importorskip("pandas")
+    frame = pandas.DataFrame({"n": pandas.array([None, None], dtype="Int64")})
+    assert table_columns(frame, formats={"n": "%d"})[1] == [["", ""]]
+
+
+def test_arrow_integer_column_with_nulls():
+    pyarrow = pytest.importorskip("pyarrow")
+    table = pyarrow.table({"n": pyarrow.array([10, None, 2**60], type=pyarrow.int64())})
+    _, texts = table_columns(table, formats={"n": "%d"}, na_rep="?")
+    assert texts == [["10", "?", str(2**60)]]
+
+
+def test_add_dataframe_rejects_empty_column_selection():
+    pdf = EzPDF()
+    pdf.add_page()
+    with pytest.raises(ValueError, match="at least one column"):
+        pdf.add_dataframe({"n": numpy.arange(3)}, columns=[])
+
+
+def test_add_dataframe_adds_every_row():
+    pdf = EzPDF()
+    pdf.add_page()
+    assert pdf.add_dataframe({"n": numpy.arange(3), "v": numpy.ones(3)}, formats={"v": "%.1f"}) == 3
+
+
+
+@pytest.mark.parametrize("values, expected, formatted", [
+    (["2020-01-01", "2020-01-02"], ["2020-01-01", "2020-01-02"], ["01/01 00:00", "02/01 00:00"]),
+    (["2020-01-01 10:30", None], ["2020-01-01 10:30:00", "-"], ["01/01 10:30", "-"]),
+    (
+        ["2020-01-01 10:30:15.5", "2020-01-02"],
+        ["2020-01-01 10:30:15.500", "2020-01-02 00:00:00.000"],
+        ["01/01 10:30", "02/01 00:00"]
+    ),
+])
+def test_datetime_columns_read_the_same_in_every_library(values, expected, formatted):
+    pandas = pytest.importorskip("pandas")
+    pyarrow = pytest.importorskip("pyarrow")
+    series = pandas.Series(pandas.to_datetime(values, format="ISO8601"))
+    for table in (
+        pandas.DataFrame({"d": series}),
+        pyarrow.table({"d": pyarrow.array(series)}),
+        {"d": series.to_numpy()},
+    ):
+        assert table_columns(table, na_rep="-")[1] == [expected]
+        assert table_columns(table, formats={"d": "%d/%m %H:%M"}, na_rep="-")[1] == [formatted]
+
+
+def test_numpy_datetime_format_does_not_import_pandas(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    dates = numpy.array(["2020-03-04", "NaT"], dtype="datetime64[D]")
+    assert table_columns({"d": dates}, formats={"d": "%d.%m.%Y"})[1] == [["04.03.2020", ""]]
+
+
+def test_numpy_datetime_format_rejects_years_past_9999():
+    dates = numpy.array(["10000-01-01"], dtype="datetime64[D]")
+    with pytest.raises(ValueError, match="years 1 to 9999"):
+        table_columns({"d": dates}, formats={"d": "%Y"})
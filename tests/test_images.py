@@ -0,0 +1,72 @@
+"""
+    Tests of ImageCache, EzPDF.add_logo and EzPDF.add_image_row
+"""
+import os
+import pytest
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+from ez_pdf.images import IMAGE_CACHE, ImageCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def logo(tmp_path):
+    """Path of a small RGB PNG."""
+    path = str(tmp_path / "logo.png")
+    Image.new("RGB", (60, 20), (200, 30, 30)).save(path)
+    return path
+
+
+def test_decoded_image_is_shared_between_documents(logo):
+    cache = ImageCache()
+    first, second = EzPDF(), EzPDF()
+    name, info = cache.install(first.pdf, logo)
+    assert cache.install(second.pdf, logo)[0] == name
+    assert cache.install(first.pdf, logo)[1] is info
+    assert cache.cache_info() == (2, 1, 64, 1)
+
+
+def test_changed_file_is_hashed_again(logo):
+    cache = ImageCache()
+    digest = cache.digest(logo)
+    Image.new("RGB", (30, 30), (0, 0, 255)).save(logo)
+    os.utime(logo, ns=(1, 1))
+    assert cache.digest(logo) != digest
+    assert len(cache._digests) == 1  # pylint: disable=protected-access
+
+
+def test_file_hashes_are_bounded_by_max_size(tmp_path):
+    cache = ImageCache(max_size=2)
+    for i in range(5):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(bytes([i]))
+        cache.digest(str(path))
+    assert len(cache._digests) == 2  # pylint: disable=protected-access
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_negative_max_size_is_rejected():
+    with pytest.raises(ValueError, match="negative"):
+        ImageCache(max_size=-1)
+
+
+def test_image_is_embedded_once_however_often_it_is_drawn(logo):
+    IMAGE_CACHE.clear()
+    pdf = EzPDF()
+    pdf.add_page()
+    for _ in range(3):
+        pdf.add_logo(logo, width=1.0)
+        pdf.add_image_row([logo, None, logo], cell_height=0.5)
+    pdf.add_page()
+    pdf.add_logo(logo)
+    data = bytes(pdf.export_bytes())
+    assert data.count(b"/Subtype /Image") == 1
+    assert IMAGE_CACHE.cache_info().misses == 1
+
+
+def test_image_row_needs_one_image_per_column(logo):
+    pdf = EzPDF()
+    pdf.add_page()
+    with pytest.raises(ValueError):
+        pdf.add_image_row([logo], ColumnSpec((0.5, 0.5)))
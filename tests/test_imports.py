@@ -0,0 +1,51 @@
+"""
+    Tests of the lazy names of the ez_pdf package
+"""
+import subprocess
+import sys
+from importlib import import_module
+import pytest
+import ez_pdf
+
+# Loaded only when used; fpdf itself already imports asyncio and fontTools
+HEAVY = (
+    "ez_pdf.aio", "ez_pdf.batch", "ez_pdf.cache", "ez_pdf.columnar", "ez_pdf.fonts",
+    "ez_pdf.images", "ez_pdf.instrumentation", "ez_pdf.merge", "ez_pdf.oplog",
+    "ez_pdf.template", "numpy", "pandas", "pyarrow",
+)
+
+
+def loaded_modules(statement: str) -> set:
+    """Modules loaded by statement in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return set(result.stdout.split())
+
+
+def test_importing_the_package_loads_no_submodule():
+    modules = loaded_modules("import ez_pdf")
+    assert not {"fpdf", "typing", *HEAVY} & modules
+    assert not any(name.startswith("ez_pdf.") for name in modules)
+
+
+def test_importing_ezpdf_leaves_optional_machinery_unloaded():
+    modules = loaded_modules("from ez_pdf.ez_pdf import EzPDF")
+    assert "fpdf" in modules
+    assert not set(HEAVY) & modules
+
+
+@pytest.mark.parametrize("name", ez_pdf.__all__)
+def test_every_lazy_name_resolves(name):
+    # pylint: disable=protected-access
+    submodule = import_module(f"ez_pdf.{ez_pdf._SUBMODULES[name]}")
+    assert getattr(ez_pdf, name) is getattr(submodule, name)
+    assert name in dir(ez_pdf)
+
+
+def test_unknown_names_raise_attribute_error():
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        ez_pdf.missing  # pylint: disable=pointless-statement,no-member
@@ -0,0 +1,58 @@
+"""
+    Tests of EzPDF.instrument
+"""
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+
+def three_pages(pdf: EzPDF) -> None:
+    for page in range(3):
+        pdf.add_page()
+        for row in range(page + 1):
+            pdf.add_two_cell_row(f"p{page}", f"r{row}")
+
+
+def test_counts_calls_per_document_and_page():
+    pdf = EzPDF()
+    events = []
+    with pdf.instrument(hooks=[events.append]) as instrumentation:
+        three_pages(pdf)
+    assert instrumentation.totals["EzPDF.add_page"].calls == 3
+    assert instrumentation.totals["EzPDF.add_two_cell_row"].calls == 6
+    # add_page starts on the page before the one it adds
+    pages = instrumentation.pages
+    assert sorted(page for page in pages if "EzPDF.add_page" in pages[page]) == [0, 1, 2]
+    assert [pages[page]["EzPDF.add_two_cell_row"].calls for page in (1, 2, 3)] == [1, 2, 3]
+    assert instrumentation.totals["FPDF.cell"].calls >= 12
+    assert len(events) == sum(stats.calls for stats in instrumentation.totals.values())
+    assert "EzPDF.add_two_cell_row" in instrumentation.summary(page=3)
+
+
+def test_detach_restores_the_plain_methods():
+    pdf = EzPDF()
+    plain = type(pdf).add_rows
+    instrumentation = pdf.instrument()
+    assert instrumentation.attached
+    assert "add_rows" in vars(pdf) and "cell" in vars(pdf.pdf)
+    instrumentation.detach()
+    assert not instrumentation.attached
+    assert "add_rows" not in vars(pdf) and "cell" not in vars(pdf.pdf)
+    assert pdf.add_rows.__func__ is plain
+    pdf.add_page()
+    pdf.add_rows([("a", "b")], ColumnSpec((0.5, 0.5)))
+    assert "EzPDF.add_rows" not in instrumentation.totals
+
+
+def test_other_documents_are_not_instrumented():
+    instrumented, plain = EzPDF(), EzPDF()
+    with instrumented.instrument() as instrumentation:
+        three_pages(plain)
+    assert instrumentation.totals == {}
+
+
+def test_allocations_are_tracked_on_request():
+    pdf = EzPDF()
+    with pdf.instrument(allocations=True, fpdf_methods=()) as instrumentation:
+        pdf.add_page()
+        pdf.add_rows([("x" * 50, "y")] * 200, ColumnSpec((0.5, 0.5)))
+    assert set(instrumentation.totals) == {"EzPDF.add_page", "EzPDF.add_rows"}
+    assert instrumentation.totals["EzPDF.add_rows"].allocated > 0
@@ -0,0 +1,160 @@
+"""
+    Tests of merge_pdfs, split_pdf and PDFMerger, read back with pypdf
+"""
+import io
+import zlib
+import pytest
+from ez_pdf.ez_pdf import EzPDF
+from ez_pdf.merge import (
+    NULL, PDFMerger, PDFReader, Ref, Stream, _decode, merge_pdfs, split_pdf
+)
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def statement(path, name: str, pages: int = 2, object_streams: bool = False) -> str:
+    """Exports a statement whose pages show "<name> page <n>"."""
+    pdf = EzPDF()
+    pdf.set_compression(object_streams=object_streams)
+    for page in range(1, pages + 1):
+        pdf.add_page()
+        pdf.add_one_cell_row(f"{name} page {page}")
+    output = str(path / f"{name}.pdf")
+    pdf.export(output)
+    return output
+
+
+def page_texts(source) -> list:
+    """Text of every page, read in strict mode."""
+    reader = pypdf.PdfReader(source, strict=True)
+    return [page.extract_text().strip() for page in reader.pages]
+
+
+def test_merge_keeps_pages_in_order(tmp_path):
+    sources = [statement(tmp_path, name) for name in ("alpha", "beta", "gamma")]
+    output = str(tmp_path / "merged.pdf")
+    assert merge_pdfs(sources, output) == 6
+    assert page_texts(output) == [
+        f"{name} page {page}" for name in ("alpha", "beta", "gamma") for page in (1, 2)
+    ]
+
+
+def test_merge_reads_object_streams_and_writes_to_streams(tmp_path):
+    sources = [
+        statement(tmp_path, "packed", object_streams=True),
+        statement(tmp_path, "plain", pages=1),
+    ]
+    output = io.BytesIO()
+    assert merge_pdfs(sources, output) == 3
+    assert page_texts(output) == ["packed page 1", "packed page 2", "plain page 1"]
+
+
+def test_merge_writes_shared_objects_once(tmp_path):
+    sources = [statement(tmp_path, f"s{i}", pages=1) for i in range(5)]
+    with PDFMerger(io.BytesIO()) as merger:
+        for source in sources:
+            merger.append(source)
+    assert merger.deduplicated > 0
+    with PDFMerger(io.BytesIO(), dedupe=False) as copied:
+        for source in sources:
+            copied.append(source)
+    assert copied.deduplicated == 0
+    assert copied.objects > merger.objects
+
+
+def test_split_round_trips_a_merged_file(tmp_path):
+    merged = str(tmp_path / "merged.pdf")
+    merge_pdfs([statement(tmp_path, "a", pages=3), statement(tmp_path, "b", pages=2)], merged)
+    first, rest = str(tmp_path / "first.pdf"), str(tmp_path / "rest.pdf")
+    split_pdf(merged, {first: [1], rest: [5, 2, 3]})
+    assert page_texts(first) == ["a page 1"]
+    assert page_texts(rest) == ["b page 2", "a page 2", "a page 3"]
+    with PDFReader(rest) as reader:
+        assert len(reader) == 3
+
+
+def test_split_rejects_pages_out_of_range(tmp_path):
+    source = statement(tmp_path, "short", pages=1)
+    with pytest.raises(ValueError):
+        split_pdf(source, {str(tmp_path / "out.pdf"): [2]})
+
+
+def test_reader_rejects_files_that_are_not_pdf(tmp_path):
+    path = tmp_path / "note.txt"
+    path.write_bytes(b"not a pdf")
+    with pytest.raises(ValueError, match="not a PDF"):
+        PDFReader(str(path))
+
+
+def drop_last_page(path: str) -> Ref:
+    """Appends an incremental update whose page tree leaves out the last page
+    and whose cross-reference section frees the page object, returned."""
+    with PDFReader(path) as reader:
+        pages = reader.resolve(reader.trailer["Root"])["Pages"]
+        first, last = reader.pages[0][0], reader.pages[-1][0]
+        root, size = reader.trailer["Root"], reader.trailer["Size"]
+    with open(path, "rb") as file:
+        data = file.read()
+    previous = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    tree = b"%d 0 obj\n<</Type /Pages /Kids [%d 0 R] /Count 1>>\nendobj\n" % (
+        pages.number, first.number
+    )
+    xref = len(data) + len(tree)
+    update = tree + (
+        b"xref\n0 1\n0000000000 65535 f \n%d 1\n%010d 00000 n \n%d 1\n0000000000 00001 f \n"
+        b"trailer\n<</Size %d /Root %d 0 R /Prev %d>>\nstartxref\n%d\n%%%%EOF\n"
+    ) % (pages.number, len(data), last.number, size, root.number, previous, xref)
+    with open(path, "ab") as file:
+        file.write(update)
+    return last
+
+
+def test_newest_section_wins_for_updated_and_freed_objects(tmp_path):
+    source = statement(tmp_path, "updated", pages=2)
+    freed = drop_last_page(source)
+    assert page_texts(source) == ["updated page 1"]
+    with PDFReader(source) as reader:
+        assert len(reader) == 1
+        assert reader.resolve(freed) == NULL
+    output = io.BytesIO()
+    assert merge_pdfs([source, statement(tmp_path, "next", pages=1)], output) == 2
+    assert page_texts(output) == ["updated page 1", "next page 1"]
+
+
+def png_rows(rows: list, pixel: int) -> bytes:
+    """Rows encoded with the PNG filters, cycling through None, Sub, Up,
+    Average and Paeth."""
+    encoded = bytearray()
+    previous = bytes(len(rows[0]))
+    for number, row in enumerate(rows):
+        kind = number % 5
+        encoded.append(kind)
+        for index, value in enumerate(row):
+            left = row[index - pixel] if index >= pixel else 0
+            above = previous[index]
+            upper_left = previous[index - pixel] if index >= pixel else 0
+            estimate = left + above - upper_left
+            paeth = min(
+                (left, above, upper_left), key=lambda neighbour: abs(estimate - neighbour)
+            )
+            predicted = (0, left, above, (left + above) // 2, paeth)[kind]
+            encoded.append((value - predicted) & 0xFF)
+        previous = row
+    return bytes(encoded)
+
+
+def test_decode_reverses_every_png_filter():
+    rows = [
+        bytes((row * 37 + column * column * 11) % 256 for column in range(8))
+        for row in range(12)
+    ]
+    data = zlib.compress(png_rows(rows, pixel=2))
+    stream = Stream(
+        {"Filter": "FlateDecode", "DecodeParms": {"Predictor": 12, "Columns": 4, "Colors": 2}},
+        data
+    )
+    assert _decode(stream) == b"".join(rows)
+    with pytest.raises(ValueError, match="Unsupported predictor 2"):
+        _decode(Stream({"DecodeParms": {"Predictor": 2}}, b""))
+    with pytest.raises(ValueError, match="filter type 5"):
+        _decode(Stream({"DecodeParms": {"Predictor": 12, "Columns": 1}}, b"\x05\x00"))
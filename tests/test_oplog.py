@@ -0,0 +1,90 @@
+"""
+    Tests of OpLog recording, serialization and replay
+"""
+from datetime import datetime, timezone
+import pytest
+from ez_pdf.columnar import ColumnarTable
+from ez_pdf.ez_pdf import AutoColumns, ColumnSpec, EzPDF
+from ez_pdf.oplog import OpLog, render_log
+from ez_pdf.styles import Style
+
+CREATION_DATE = datetime(2023, 1, 1, tzinfo=timezone.utc)
+COLUMNS = ColumnSpec((0.4, 0.3, 0.3), aligns=("L", "C", "R"), fills=(True, False, False), r=200)
+STRIPE = Style(font="helvetica", fill=(235, 235, 235), align="L")
+
+
+def build_statement(pdf) -> None:
+    """Calls every kind of argument the log serializes."""
+    pdf.add_page()
+    pdf.set_cell_fill_color(230, 230, 230)
+    pdf.add_one_cell_row("Statement", fill=True)
+    with pdf.record_form("footer"):
+        pdf.add_one_cell_row("Footer", cell_height=0.25)
+    pdf.add_rows(iter([("a", "b", "c"), ("d", "e", "f")]), COLUMNS, style=STRIPE)
+    pdf.add_table([("1", "2", "3")] * 5, AutoColumns(), header=("x", "y", "z"))
+    table = ColumnarTable(COLUMNS, names=("name", "count", "amount"), formats=(None, "%d", "%.2f"))
+    table.extend([("pen", 2, 1.5), ("ink", None, 3.25)])
+    pdf.add_columnar_table(table)
+    pdf.stamp_form("footer")
+
+
+def test_replay_matches_direct_rendering():
+    direct = EzPDF()
+    direct.pdf.set_creation_date(CREATION_DATE)
+    build_statement(direct)
+    log = OpLog(creation_date=CREATION_DATE)
+    build_statement(log)
+    assert log.replay() == bytes(direct.export_bytes())
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_serialized_log_replays_the_same_bytes(compress):
+    log = OpLog(font="helvetica", creation_date=CREATION_DATE)
+    build_statement(log)
+    loaded = OpLog.from_bytes(log.to_bytes(compress=compress))
+    assert [op[0] for op in loaded.operations] == [op[0] for op in log.operations]
+    assert loaded.replay() == log.replay()
+    assert bytes(render_log(log.to_bytes()).export_bytes()) == log.replay()
+
+
+def test_serialized_log_keeps_packed_and_integer_columns():
+    table = ColumnarTable(ColumnSpec((0.5, 0.5)), formats=(None, "%d"))
+    table.extend((f"Customer {i}", None if i % 3 else 2**60 + i) for i in range(5000))
+    log = OpLog()
+    log.add_page()
+    log.add_columnar_table(table)
+    loaded = OpLog.from_bytes(log.to_bytes())
+    assert list(loaded.operations[1][1][0].texts()) == list(table.texts())
+
+
+def test_recorded_calls_return_none():
+    log = OpLog()
+    log.add_page()
+    assert log.add_table([("a",)], ColumnSpec((1.0,))) is None
+    assert [name for name, _, _ in log.operations] == ["add_page", "add_table"]
+
+
+@pytest.mark.parametrize(
+    "name", ["fit_columns", "export_bytes", "instrument", "_render_row", "pdf"]
+)
+def test_methods_returning_values_are_not_recorded(name):
+    log = OpLog()
+    with pytest.raises(AttributeError, match=name):
+        getattr(log, name)
+    assert len(log) == 0
+
+
+def test_unserializable_arguments_are_rejected():
+    log = OpLog()
+    log.add_rows([(object(),)], ColumnSpec((1.0,)))
+    with pytest.raises(TypeError):
+        log.to_bytes()
+
+
+def test_from_bytes_rejects_unknown_methods_and_formats():
+    log = OpLog()
+    log.operations.append(("fit_columns", ([],), {}))
+    with pytest.raises(ValueError, match="unknown method fit_columns"):
+        OpLog.from_bytes(log.to_bytes())
+    with pytest.raises(ValueError, match="format"):
+        OpLog.from_bytes(b'{"format": 0}')
@@ -0,0 +1,89 @@
+"""
+    Tests of ColumnSpec and EzPDF.add_rows
+"""
+import re
+import pytest
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+
+def test_column_spec_resolves_offsets_and_widths():
+    columns = ColumnSpec((0.25, 0.75), aligns=("L", "R"), page_width=8.5, margin=0.5)
+    assert columns.columns == 2
+    assert columns.cells[0][:3] == (0, pytest.approx(1.875), "L")
+    assert columns.cells[1][:3] == (pytest.approx(1.875), pytest.approx(5.625), "R")
+    assert columns.fill_color is None
+
+
+def test_column_spec_accepts_thirds():
+    assert ColumnSpec((1 / 3, 1 / 3, 1 / 3)).columns == 3
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"widths": ()},
+        {"widths": (0.5, 0.4)},
+        {"widths": (0.5, 0.5), "aligns": ("L",)},
+        {"widths": (0.5, 0.5), "borders": (1, 1, 1)},
+    ],
+)
+def test_column_spec_rejects_invalid_layouts(kwargs):
+    with pytest.raises(ValueError):
+        ColumnSpec(**kwargs)
+
+
+def test_add_rows_keeps_every_cell_of_a_row_on_one_page(pages_with):
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_rows(
+        [(f"r{i}", "x", f"v{i}") for i in range(500)],
+        ColumnSpec((0.4, 0.3, 0.3)),
+        cell_height=0.2
+    )
+    assert len(pdf.pdf.pages) > 1
+    for i in range(500):
+        first, last = pages_with(pdf, f"r{i}"), pages_with(pdf, f"v{i}")
+        assert len(first) == 1
+        assert first == last
+
+
+def test_add_rows_rejects_rows_of_the_wrong_length():
+    pdf = EzPDF()
+    pdf.add_page()
+    with pytest.raises(ValueError, match="Row has 2 cells"):
+        pdf.add_rows([("a", "b")], ColumnSpec((0.4, 0.3, 0.3)))
+
+
+def horizontal_borders(pdf: EzPDF) -> dict:
+    """Left x of the horizontal border segments at each y of the first page, in points."""
+    borders: dict = {}
+    segment = re.compile(rb"([\d.]+) ([\d.]+) m ([\d.]+) ([\d.]+) l S")
+    for x_start, y_start, _, y_end in segment.findall(bytes(pdf.pdf.pages[1].contents)):
+        if y_start == y_end:
+            borders.setdefault(float(y_start), set()).add(float(x_start))
+    return borders
+
+
+@pytest.mark.parametrize("equal_height", [True, False])
+def test_wrapped_row_sets_the_height_of_the_row(equal_height):
+    pdf = EzPDF()
+    pdf.set_compression(False)
+    pdf.add_page()
+    top = pdf.pdf.y
+    pdf.add_table(
+        [("a", " ".join(["word"] * 30), "c"), ("d", "e", "f")],
+        ColumnSpec((0.3, 0.4, 0.3)),
+        cell_height=0.2,
+        equal_height=equal_height
+    )
+    lines = 3
+    # The next row starts below the tallest cell
+    assert pdf.pdf.y == pytest.approx(top + (lines + 1) * 0.2)
+    borders = horizontal_borders(pdf)
+    row_bottom = round((pdf.pdf.h - top - lines * 0.2) * 72, 2)
+    assert borders[row_bottom] == {28.35, 190.35, 406.35}
+    if equal_height:
+        # Every cell spans the whole row, so borders only run along row edges
+        assert len(borders) == 3
+    else:
+        assert len(borders) > 3
@@ -0,0 +1,83 @@
+"""
+    Tests of row styles and fill color tracking
+"""
+import pytest
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+from ez_pdf.styles import Style, _styled_cells, styled_cells
+
+
+def content(pdf: EzPDF, page: int = 1) -> str:
+    """Uncompressed content stream of a page."""
+    return bytes(pdf.pdf.pages[page].contents).decode("latin1")
+
+
+def test_unfilled_rows_keep_the_cell_fill_color():
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.set_cell_fill_color(10, 20, 30)
+    fill_color = pdf.pdf.fill_color
+    pdf.add_one_cell_row("plain")
+    pdf.add_rows([("a", "b")], ColumnSpec((0.5, 0.5)))
+    assert pdf.pdf.fill_color == fill_color
+    pdf.pdf.cell(1, 0.2, "filled by FPDF", fill=True)
+    assert pdf.pdf.fill_color == fill_color
+
+
+def test_fill_color_is_only_emitted_when_it_changes():
+    pdf = EzPDF()
+    pdf.add_page()
+    for i in range(3):
+        pdf.add_one_cell_row(f"grey {i}", fill=True, r=10, g=20, b=30)
+        pdf.add_one_cell_row(f"plain {i}")
+    pdf.add_one_cell_row("blue", fill=True, r=0, g=0, b=255)
+    stream = content(pdf)
+    assert stream.count("0.0392 0.0784 0.1176 rg") == 1
+    assert stream.count("0 0 1 rg") == 1
+
+
+def test_fill_color_set_on_the_fpdf_object_is_replaced():
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_one_cell_row("grey", fill=True, r=10, g=20, b=30)
+    pdf.pdf.set_fill_color(255, 0, 0)
+    pdf.add_one_cell_row("grey again", fill=True, r=10, g=20, b=30)
+    assert content(pdf).count("0.0392 0.0784 0.1176 rg") == 2
+
+
+def test_row_style_font_does_not_leak_into_the_next_rows():
+    pdf = EzPDF(font="times", font_size=8)
+    pdf.add_page()
+    columns = ColumnSpec((0.5, 0.5))
+    pdf.add_rows([("h", "h")], columns, style=Style(font="helvetica", font_size=12))
+    assert (pdf.pdf.font_family, pdf.pdf.font_size_pt) == ("helvetica", 12)
+    pdf.add_rows([("r", "r")], columns)
+    assert (pdf.pdf.font_family, pdf.pdf.font_size_pt) == ("times", 8)
+
+
+def test_style_fill_overrides_the_column_spec():
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_rows([("a", "b")], ColumnSpec((0.5, 0.5)), style=Style(fill=(0, 0, 255)))
+    assert "0 0 1 rg" in content(pdf)
+
+
+def test_style_fill_is_normalised_to_a_tuple():
+    style = Style(fill=[10, 20, 30])
+    assert style.fill == (10, 20, 30)
+    assert hash(style) == hash(Style(fill=(10, 20, 30)))
+    assert style._replace(align="L").fill == (10, 20, 30)
+
+
+@pytest.mark.parametrize("fill", [(1, 2), (0, 0, 256), (0.5, 0, 0), "red"])
+def test_invalid_style_fill_is_rejected(fill):
+    with pytest.raises(ValueError, match="three color codes"):
+        Style(fill=fill)
+
+
+def test_equal_layouts_share_styled_cells():
+    _styled_cells.cache_clear()
+    style = Style(fill=(1, 2, 3))
+    first = styled_cells(ColumnSpec((0.5, 0.5)), style)
+    assert styled_cells(ColumnSpec((0.5, 0.5)), Style(fill=[1, 2, 3])) is first
+    assert _styled_cells.cache_info().hits == 1
+    assert styled_cells(ColumnSpec((0.5, 0.5)), None)[1] is None
@@ -0,0 +1,61 @@
+"""
+    Tests of EzPDF.add_table and EzPDF.stream_table
+"""
+import pytest
+from ez_pdf.ez_pdf import ColumnSpec, EzPDF
+
+COLUMNS = ColumnSpec((0.3, 0.4, 0.3))
+LONG = " ".join(["wrapped"] * 40)
+
+
+def table_rows(count: int) -> list:
+    """Rows whose every fifth row wraps over several lines."""
+    return [(f"r{i}", LONG if i % 5 == 0 else "short", f"v{i}") for i in range(count)]
+
+
+def test_add_table_repeats_the_header_on_every_page(pages_with):
+    pdf = EzPDF()
+    pdf.add_page()
+    count = pdf.add_table(table_rows(200), COLUMNS, cell_height=0.2, header=("H1", "H2", "H3"))
+    assert count == 200
+    pages = len(pdf.pdf.pages)
+    assert pages > 2
+    assert pages_with(pdf, "H1") == list(range(1, pages + 1))
+
+
+def test_add_table_keeps_wrapped_rows_on_one_page(pages_with):
+    pdf = EzPDF()
+    pdf.add_page()
+    pdf.add_table(table_rows(200), COLUMNS, cell_height=0.2, header=("H1", "H2", "H3"))
+    for i in range(200):
+        page = pages_with(pdf, f"r{i}")
+        assert len(page) == 1
+        assert pages_with(pdf, f"v{i}") == page
+
+
+def test_stream_table_renders_like_add_table():
+    tables = []
+    for method in ("add_table", "stream_table"):
+        pdf = EzPDF()
+        pdf.add_page()
+        kwargs = {"chunk_size": 7} if method == "stream_table" else {}
+        count = getattr(pdf, method)(
+            iter(table_rows(60)), COLUMNS, cell_height=0.2, header=("H1", "H2", "H3"), **kwargs
+        )
+        assert count == 60
+        tables.append([bytes(page.contents) for page in pdf.pdf.pages.values()])
+    assert tables[0] == tables[1]
+
+
+def test_table_rejects_rows_of_the_wrong_length():
+    pdf = EzPDF()
+    pdf.add_page()
+    with pytest.raises(ValueError):
+        pdf.add_table([("a", "b")], COLUMNS)
+
+
+def test_stream_table_rejects_empty_chunks():
+    pdf = EzPDF()
+    pdf.add_page()
+    with pytest.raises(ValueError, match="Chunk size"):
+        pdf.stream_table([], COLUMNS, chunk_size=0)
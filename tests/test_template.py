@@ -0,0 +1,67 @@
+"""
+    Tests of DocumentTemplate
+"""
+import pytest
+from ez_pdf.ez_pdf import ColumnSpec
+from ez_pdf.template import DocumentTemplate, EmptyRowTemplate, RowTemplate, TableTemplate
+
+
+def test_render_formats_row_texts_and_tables(pages_with):
+    template = DocumentTemplate([
+        RowTemplate(["Client {name}", "{{literal}}"], [0.5, 0.5]),
+        EmptyRowTemplate(0.25),
+        TableTemplate("items", ColumnSpec((0.5, 0.5))),
+    ]).compile()
+    pdf = template.render({"name": "Ada", "items": [("pen", "2"), ("ink", "3")]})
+    for text in ("Client Ada", "{literal}", "pen", "ink"):
+        assert pages_with(pdf, text) == [1]
+
+
+def test_filled_rows_set_their_fill_color_once():
+    row = RowTemplate(["{n}"], [1.0], fills=[True], r=0, g=0, b=255)
+    pdf = DocumentTemplate([row, RowTemplate(["plain"], [1.0]), row]).compile().render({"n": 1})
+    stream = bytes(pdf.pdf.pages[1].contents).decode("latin1")
+    assert stream.count("0 0 1 rg") == 1
+
+
+def test_templated_rows_break_pages_between_rows(pages_with):
+    rows = [RowTemplate([f"a{i}", f"b{i}"], [0.5, 0.5], cell_height=0.3) for i in range(80)]
+    pdf = DocumentTemplate(rows).compile().render({})
+    assert len(pdf.pdf.pages) > 1
+    for i in range(80):
+        assert pages_with(pdf, f"a{i}") == pages_with(pdf, f"b{i}")
+
+
+def test_compile_rejects_texts_not_matching_widths():
+    with pytest.raises(ValueError, match="2 texts but 1 widths"):
+        DocumentTemplate([RowTemplate(["a", "b"], [1.0])]).compile()
+
+
+def test_compile_rejects_unknown_rows():
+    with pytest.raises(TypeError):
+        DocumentTemplate(["text"]).compile()
+
+
+@pytest.mark.parametrize("page_format, orientation, width", [
+    ("letter", "portrait", 8.5),
+    ("a4", "portrait", 210 / 25.4),
+    ("a4", "landscape", 297 / 25.4),
+    ((6.0, 9.0), "portrait", 6.0),
+])
+def test_rows_span_the_width_of_the_template_page(page_format, orientation, width):
+    template = DocumentTemplate(
+        [RowTemplate(["full width"], [1.0])], page_format=page_format, orientation=orientation
+    )
+    assert template.page_width() == pytest.approx(width, abs=0.01)
+    pdf = template.compile().render({})
+    pdf.pdf.set_compression(False)
+    right_edge = (pdf.pdf.l_margin + pdf.pdf.w - 2 * template.margin) * 72
+    assert pdf.pdf.w == pytest.approx(width, abs=0.01)
+    assert f" {right_edge:.2f} " in bytes(pdf.pdf.pages[1].contents).decode("latin1")
+
+
+def test_compile_rejects_unknown_page_formats_and_orientations():
+    with pytest.raises(ValueError, match="page format"):
+        DocumentTemplate([], page_format="b9").compile()
+    with pytest.raises(ValueError, match="Orientation"):
+        DocumentTemplate([], orientation="sideways").compile()
@@ -0,0 +1,55 @@
+"""
+    Tests of TextCache against uncached FPDF measurements
+"""
+import pytest
+from fpdf import FPDF
+from fpdf.enums import MethodReturnValue
+from ez_pdf.text_cache import TextCache
+
+TEXTS = ["", "Client", "A longer text that wraps over several lines of a narrow cell", "two\nlines"]
+FONTS = [("times", "", 8), ("helvetica", "B", 12), ("courier", "I", 8), ("times", "", 8)]
+
+
+def document() -> FPDF:
+    pdf = FPDF(unit="in", format="legal")
+    pdf.add_page()
+    return pdf
+
+
+@pytest.mark.parametrize("cell_width", [0.8, 2.5])
+def test_measurements_match_fpdf_across_font_changes(cell_width):
+    pdf, cache = document(), TextCache()
+    for family, style, size in FONTS:
+        pdf.set_font(family, style, size)
+        for text in TEXTS:
+            assert cache.string_width(pdf, text) == pdf.get_string_width(text)
+            expected = pdf.multi_cell(
+                w=cell_width, txt=text, dry_run=True, output=MethodReturnValue.LINES
+            )
+            assert cache.split_lines(pdf, text, cell_width) == tuple(expected)
+            assert cache.fits_one_line(pdf, text, cell_width) == (len(expected) <= 1)
+    # The last font repeats the first, so all of its measurements were hits
+    assert cache.hits >= 3 * len(TEXTS)
+
+
+def test_counters_and_eviction_at_max_size():
+    pdf, cache = document(), TextCache(max_size=2)
+    pdf.set_font("times", size=8)
+    for text in ("a", "b", "a", "c", "b"):
+        cache.string_width(pdf, text)
+    # a miss, b miss, a hit, c miss evicting b, b miss evicting a
+    assert cache.cache_info() == (1, 4, 2, 2)
+    cache.string_width(pdf, "c")
+    assert cache.cache_info().hits == 2
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_zero_max_size_disables_caching():
+    pdf, cache = document(), TextCache(max_size=0)
+    pdf.set_font("times", size=8)
+    cache.string_width(pdf, "a")
+    cache.string_width(pdf, "a")
+    assert cache.cache_info() == (0, 2, 0, 0)
+    with pytest.raises(ValueError, match="negative"):
+        TextCache(max_size=-1)